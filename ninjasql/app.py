@@ -1,28 +1,101 @@
 from pathlib import Path
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 import os
 import logging
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
-from pandas.io.sql import (
-    pandasSQL_builder,
-    SQLTable,
-    SQLDatabase,
-    SQLiteTable)
-from sqlalchemy.schema import CreateSchema
-from sqlalchemy import inspect
-from datetime import datetime
+from pandas.io.sql import pandasSQL_builder, SQLDatabase
+from sqlalchemy.schema import CreateSchema, CreateTable
+from sqlalchemy import inspect, Table
 import traceback
+from contextlib import contextmanager
 
-from ninjasql.errors import NoColumnsError, NoTableNameGivenError
+from ninjasql.errors import (
+    NoColumnsError,
+    NoTableNameGivenError,
+    SchemaDriftError,
+    MemoryBudgetError)
 from ninjasql.settings import Config
-from ninjasql.db.sqa_dml_extractor import SqaExtractor
+from ninjasql.db.sqa_dml_extractor import SqaExtractor, MATERIALIZED_VIEWS
 from ninjasql.db.sqa_table_loads import get_sqa_tableload
+from ninjasql.db.blueprint import (
+    CURRENT_SNAPSHOTS,
+    LOAD_MODES,
+    compile_blueprint,
+    load_steps,
+    dml_files,
+    dml_dependencies)
+from ninjasql.db.table_schema import TableSchema, ColumnSchema
+from ninjasql.db.dialects import resolve_dialect
+from ninjasql.db.narrow_types import HEADROOM
+from ninjasql.db.indexes import table_index, index_ddl
+from ninjasql.db.physical import physical_ddl
+from ninjasql.db.row_hash import ROW_HASH, has_row_hash
+from ninjasql.db.schema_diff import (
+    reflect_columns,
+    diff_table,
+    alter_statements)
 from ninjasql.dep.table_dependency import TableDep
+from ninjasql.infer.widening import (
+    infer_from_chunks,
+    iter_infer_chunks,
+    empty_frame)
+from ninjasql.infer.sampling import (
+    head_sample,
+    reservoir_sample,
+    stratified_sample,
+    sample_confidence)
+from ninjasql.infer.probe import (
+    probe_csv_columns,
+    probe_json_columns,
+    schema_drift)
+from ninjasql.infer.parallel import parallel_read_csv
+from ninjasql.infer.compression import detect_compression
+from ninjasql.infer.hints import (
+    CATEGORY_SAMPLE,
+    project,
+    downcast_numeric,
+    categorize,
+    category_dtypes)
+from ninjasql.infer.datetimes import (
+    DATE_SAMPLE,
+    infer_date_formats,
+    is_date_format,
+    parse_dates)
+from ninjasql.infer.stats import frame_stats, merge_frame_stats
+from ninjasql.infer.family import expand_files, union_schemas
+from ninjasql.infer.cache import (
+    SchemaCache,
+    options_key,
+    file_fingerprint,
+    layout_fingerprint)
+from ninjasql.infer.memory import (
+    ESTIMATE_ROWS,
+    PeakMemory,
+    family_memory_report,
+    parse_size,
+    row_bytes,
+    fitting_rows)
+from ninjasql.infer.columnar import (
+    COLUMNAR_TYPES,
+    read_schema,
+    count_rows,
+    schema_frame,
+    read_columnar)
 
 logging.basicConfig(level=logging.INFO,
                     format='[%(asctime)s %(name)s %(levelname)s:%(message)s]')
 log = logging.getLogger(__name__)
 
+# technical columns of the scd2 history table
+SCD2_COLUMNS = ['UPDATED_AT', 'BATCH_RUN_AT', 'VALID_FROM_DATE',
+                'VALID_TO_DATE']
+SCD2_DTYPE = np.dtype('datetime64[ns]')
+# table prefix of the current snapshot of the history table
+CURRENT_PREFIX = 'CUR'
+
 
 class FileInspector(object):
     """
@@ -33,14 +106,108 @@ class FileInspector(object):
         b. historization table
     4. There need to be an import folder
     5. Archive folder
-    :param file: filepath
+    :param file: filepath, glob pattern e.g. 'people_2026-10-*.csv' or list
+    of files. The schemas of a family of files are inferred one by one (in
+    worker processes if workers is given) and merged into one widened
+    superset schema. Columns missing in a file are nullable. Methods that
+    read rows use the first file
     :param seperator: file seperator for csv and txt files
     :param header: Is a header row with columns names given
-    :param type: File type {csv, json}
+    :param type: File type {csv, json, parquet, arrow, feather}. For
+    parquet and arrow ipc / feather files the schema is taken from the
+    file metadata without reading any rows. csv and json files may be
+    gzip, bz2, xz or zip compressed and are decompressed while streaming
     :param columns: Custom column names if no header is given
     :param orient: Json orientation
-    :param con: Sqlalchemy database connection
+    :param lines: Read the json file as json lines (one record per line).
+    Json lines support the chunked and sampling read modes
+    :param con: Sqlalchemy database connection. Only needed to create
+    tables in the database
+    :param dialect: Dialect name e.g. postgresql, mssql, snowflake or a
+    sqlalchemy dialect instance. DDL and DML are compiled for it without
+    any connection. Default the dialect of con
+    :param schema_cache: Path of a sqlite schema cache file or SchemaCache.
+    The inferred schema is cached under a fingerprint of the file (path,
+    size, mtime and a hash of the first and the last block) and the read
+    options. An unchanged file is not parsed again
+    :param cache_by_layout: Reuse the cached columns and dtypes of another
+    csv file with the same header and read options. Its statistics are
+    not taken and it is not used with narrow_types
+    :param narrow_types: Type columns with the narrowest safe SQL type of
+    their values e.g. VARCHAR(n), SMALLINT or DECIMAL(p,s) instead of TEXT,
+    BIGINT and FLOAT. The value statistics are computed on every row (chunk
+    by chunk for the chunked and reservoir read modes). Not applied to the
+    head and stratified samples and the chunked read mode with workers,
+    a warning is logged and the columns get wide types
+    :param headroom: Share of headroom on top of the observed string
+    lengths, integer ranges and decimal digits
+    :param read_mode: How the file is read
+    {full, parallel, chunked, head, reservoir, stratified}. parallel parses
+    byte ranges of an uncompressed csv file in worker processes. chunked
+    reads the file in chunks of chunksize rows and keeps only the merged
+    schema, json needs lines=True for it. head, reservoir and stratified
+    infer the schema from a sample of sample_size rows: the first rows, a
+    uniform sample over all chunks or rows read at random byte offsets
+    (the head for compressed files)
+    :param chunksize: Number of rows per chunk if read_mode is chunked
+    or reservoir
+    :param sample_size: Number of sampled rows for the sampling read modes
+    :param workers: Number of worker processes for the parallel read mode.
+    If given for the chunked read mode the schema is inferred in parallel.
+    For a family of files the files are inspected in parallel
+    :param usecols: Columns to read. All other columns are never parsed
+    and are not part of the staging and history tables
+    :param dtypes: dict of column name to pandas dtype used while reading
+    e.g. {'country': 'category', 'zip': 'str'}
+    :param category_ratio: Read string columns as categoricals if their
+    number of distinct values is at most category_ratio times the rows.
+    A full csv read parses the columns chosen on the first rows directly
+    as categoricals
+    :param downcast: Downcast integer columns of the frame in memory to
+    the smallest integer dtype and float columns to float32 where no
+    value changes. The schema and DDL keep the dtypes before the
+    downcast. Not applied to the head and stratified samples
+    :param max_memory: Memory budget of an inspection in bytes or as
+    string e.g. '512MB'. If a full or parallel read of a csv or json
+    lines file is estimated to exceed it, budget_read_mode is used with
+    chunks or samples that fit the budget. A json document that exceeds
+    it raises a MemoryBudgetError. The peak memory of every inspection
+    is reported by get_memory_report
+    :param budget_read_mode: Read mode used instead of a read that exceeds
+    max_memory {chunked, head, reservoir, stratified}
+    :param detect_dates: Detect string columns with dates or timestamps
+    on the first rows read and parse them with the inferred format. They
+    are typed DATE or TIMESTAMP in the staging and history tables. Off by
+    default, so date strings stay object columns typed as text
+    :param physical_design: Add the physical design of the dialect to the
+    staging and history DDL of a blueprint, derived from the logical
+    primary key and VALID_TO_DATE: redshift DISTKEY, SORTKEY and column
+    ENCODE, snowflake CLUSTER BY, postgresql list partitions of the
+    current and closed history rows, mssql clustered columnstore history
+    :param hash_diff: Add a ROW_HASH column to the staging and history
+    table. A first DML sets it to the sha256 hash of the source columns
+    and the scd2 DMLs detect changed records by comparing the hashes
+    instead of every column. sqlite has no hash function, its multi
+    dialect blueprint compares every column
+    :param load_mode: SCD2 DMLs of a blueprint {steps, merge}. steps are
+    the four scd2 statements. merge loads with one MERGE on mssql and
+    with a MERGE and the deleted update on snowflake and postgresql 15+
+    (only with the server version of a connection). All other dialects
+    insert the new records and versions, then close the changed and
+    deleted records
+    :param join_updates: The scd2 updates join the staging table with
+    UPDATE ... FROM (postgresql, mssql, mysql, snowflake, redshift) and
+    the deleted update with LEFT JOIN / IS NULL (mysql) instead of
+    correlated EXISTS subqueries. Other dialects keep the subqueries
+    :param tableload_row: With the database_table load strategy the DMLs
+    join one derived row of the table load dates instead of a scalar
+    subquery per date. Updates join it on dialects with UPDATE ... FROM
     """
+    ALLOWED_READ_MODES = ['full', 'parallel', 'chunked', 'head', 'reservoir',
+                          'stratified']
+    SAMPLE_READ_MODES = ['head', 'reservoir', 'stratified']
+    BUDGET_READ_MODES = ['chunked', 'head', 'reservoir', 'stratified']
+
     def __init__(self,
                  cfg_path: str,
                  file: str = None,
@@ -49,21 +216,91 @@ class FileInspector(object):
                  type: str = None,
                  columns: list = None,
                  orient: str = 'records',
-                 con=None
+                 lines: bool = False,
+                 con=None,
+                 read_mode: str = 'full',
+                 chunksize: int = 100000,
+                 sample_size: int = 10000,
+                 workers: int = None,
+                 usecols: list = None,
+                 dtypes: dict = None,
+                 category_ratio: float = None,
+                 downcast: bool = False,
+                 max_memory=None,
+                 budget_read_mode: str = 'chunked',
+                 detect_dates: bool = False,
+                 dialect=None,
+                 schema_cache=None,
+                 cache_by_layout: bool = False,
+                 narrow_types: bool = False,
+                 headroom: float = HEADROOM,
+                 physical_design: bool = False,
+                 hash_diff: bool = False,
+                 load_mode: str = 'steps',
+                 join_updates: bool = False,
+                 tableload_row: bool = False
                  ):
         self._cfg_path = cfg_path
-        self._file = file
+        self._files = expand_files(file)
+        self._file = self._files[0] if self._files else file
+        self._file_report = None
         self._seperator = seperator
         self._header = header
         self._type = type
         self._columns = columns
         self._orient = orient
+        self._lines = lines
         self._data = None
-        self._his_data = None
+        self._schema = None
+        self._his_schema = None
         self._con = con
+        self._dialect = resolve_dialect(con=con, dialect=dialect)
+        self._read_mode = read_mode
+        self._chunksize = chunksize
+        self._sample_size = sample_size
+        self._sample_report = None
+        self._workers = workers
+        self._usecols = usecols
+        self._dtypes = dtypes
+        self._category_ratio = category_ratio
+        self._downcast = downcast
+        self._schema_dtypes = None
+        self._max_memory = (parse_size(max_memory) if max_memory is not None
+                            else None)
+        self._budget_read_mode = budget_read_mode
+        self._memory_report = None
+        self._detect_dates = detect_dates
+        self._date_formats = None
+        if isinstance(schema_cache, (str, Path)):
+            schema_cache = SchemaCache(path=schema_cache)
+        self._schema_cache = schema_cache
+        self._cache_by_layout = cache_by_layout
+        self._narrow_types = narrow_types
+        self._headroom = headroom
+        self._value_stats = None
+        self._physical_design = physical_design
+        self._hash_diff = hash_diff
+        self._load_mode = load_mode
+        self._join_updates = join_updates
+        self._tableload_row = tableload_row
         self.config = Config()
         self._Dag = TableDep.Instance()
 
+        if self._read_mode not in self.__class__.ALLOWED_READ_MODES:
+            modes = ' ,'.join(self.__class__.ALLOWED_READ_MODES)
+            raise ValueError(f"Invalid read mode. Allowed are: '{modes}'")
+        if self._budget_read_mode not in self.__class__.BUDGET_READ_MODES:
+            modes = ' ,'.join(self.__class__.BUDGET_READ_MODES)
+            raise ValueError(f"Invalid budget read mode. Allowed are: "
+                             f"'{modes}'")
+        if self._load_mode not in LOAD_MODES:
+            modes = ' ,'.join(LOAD_MODES)
+            raise ValueError(f"Invalid load mode. Allowed are: '{modes}'")
+        if (self._type == 'json' and not self._lines and
+                self._read_mode == 'chunked'):
+            raise ValueError("Read mode 'chunked' needs json lines "
+                             "(lines=True), a json document is read at once")
+
         self.load_config(cfg_path=self._cfg_path)
 
     def _has_header(self) -> bool:
@@ -87,7 +324,8 @@ class FileInspector(object):
         change file
         """
         try:
-            self._file = Path(value)
+            self._files = expand_files(value)
+            self._file = self._files[0] if self._files else Path(value)
         except Exception as e:
             log.error(f"Please provide a valid path. Error: {e}")
 
@@ -102,12 +340,267 @@ class FileInspector(object):
         """
         Method that reads data and save it as a instance variable
         """
+        if self._files is not None:
+            self._read_file_family()
+            return
         if not self._is_file():
             log.error(f"Can't find the a file. Check file path!")
+        keys = self._cache_keys()
+        if self._load_cached_schema(keys):
+            return
+        if self._max_memory is None:
+            self._dispatch_reader()
+        else:
+            settings = self._guard_memory()
+            with self._read_settings(**settings), PeakMemory() as peak:
+                self._dispatch_reader()
+            self._memory_report['peak_bytes'] = peak.peak
+            log.info(f"Inspected {self._file} with read mode "
+                     f"'{self._memory_report['read_mode']}'. Peak memory "
+                     f"{peak.peak} bytes of {self._max_memory} bytes")
+        self._cache_schema(keys)
+
+    def _read_file_family(self) -> None:
+        """
+        Instance method that inspects every file of the family with the
+        options of this inspector and merges their schemas into one
+        widened superset schema
+        TODO: This method has side effects
+        """
+        options = self._member_options()
+        parallel = (self._workers and self._workers > 1 and
+                    len(self._files) > 1)
+        if parallel:
+            # the files are the unit of work, a file is not split again
+            options['workers'] = 1
+        inspect_file = partial(_inspect_member, options)
+        if parallel:
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                results = list(executor.map(inspect_file, self._files))
+        else:
+            results = [inspect_file(f) for f in self._files]
+        self._schema, self._file_report = union_schemas(
+            {f: schema for f, (schema, _, _) in zip(self._files, results)})
+        self._date_formats = {}
+        for _, formats, _ in results:
+            for col, fmt in (formats or {}).items():
+                self._date_formats.setdefault(col, fmt)
+        if self._max_memory is not None:
+            self._memory_report = family_memory_report(
+                max_memory=self._max_memory,
+                reports={str(f): report for f, (_, _, report)
+                         in zip(self._files, results)})
+        self._data = self._schema.empty_frame()
+        log.info(f"Merged the schemas of {len(self._files)} files into "
+                 f"{len(self._schema)} columns")
+
+    def _member_options(self) -> dict:
+        """
+        Instance method that returns the options of an inspector of
+        one file of the family
+        """
+        return {
+            'cfg_path': self._cfg_path,
+            'seperator': self._seperator,
+            'header': self._header,
+            'type': self._type,
+            'columns': self._columns,
+            'orient': self._orient,
+            'lines': self._lines,
+            'read_mode': self._read_mode,
+            'chunksize': self._chunksize,
+            'sample_size': self._sample_size,
+            'workers': self._workers,
+            'usecols': self._usecols,
+            'dtypes': self._dtypes,
+            'category_ratio': self._category_ratio,
+            'downcast': self._downcast,
+            'max_memory': self._max_memory,
+            'budget_read_mode': self._budget_read_mode,
+            'detect_dates': self._detect_dates,
+            'schema_cache': self._schema_cache,
+            'cache_by_layout': self._cache_by_layout,
+            'narrow_types': self._narrow_types,
+            'headroom': self._headroom
+        }
+
+    def get_file_report(self) -> dict:
+        """
+        Method that reports which files of a family contributed which
+        columns: {'files': {file: [columns]}, 'columns': {column: [files]}}.
+        Returns None for a single file
+        """
+        self._load_df_if_empty()
+        return self._file_report
+
+    def _cache_keys(self) -> tuple:
+        """
+        Instance method that returns the fingerprint and the layout key
+        of the file in the schema cache. The layout key is only built
+        for uncompressed csv files with a header and without narrow types,
+        which need the value statistics of the file itself. Returns None
+        without a cache
+        """
+        if self._schema_cache is None or not self._is_file():
+            return None
+        options = options_key({
+            'type': self._type,
+            'seperator': self._seperator,
+            'header': self._header,
+            'columns': self._columns,
+            'orient': self._orient,
+            'lines': self._lines,
+            'read_mode': self._read_mode,
+            'chunksize': self._chunksize,
+            'sample_size': self._sample_size,
+            'usecols': self._usecols,
+            'dtypes': self._dtypes,
+            'category_ratio': self._category_ratio,
+            'downcast': self._downcast,
+            'detect_dates': self._detect_dates,
+            'narrow_types': self._narrow_types
+        })
+        layout = None
+        if (self._cache_by_layout and not self._narrow_types and
+                self._type == 'csv' and self._header is not None and
+                not self._get_compression()):
+            layout = layout_fingerprint(path=self._file,
+                                        header_lines=self._header_rows(),
+                                        options=options)
+        return file_fingerprint(path=self._file, options=options), layout
+
+    def _load_cached_schema(self, keys: tuple) -> bool:
+        """
+        Instance method that takes the schema of the file from the
+        schema cache. Returns False if it is not cached. The schema of
+        another file with the same layout only gives the columns and
+        dtypes, its statistics and nullability are not taken
+        :param keys: fingerprint and layout key of the file
+        TODO: This method has side effects
+        """
+        if keys is None:
+            return False
+        key, layout = keys
+        value = self._schema_cache.get(key=key)
+        same_file = value is not None
+        if value is None and layout is not None:
+            value = self._schema_cache.get(key=key, layout=layout)
+        if value is None:
+            return False
+        self._schema = TableSchema.from_dict(value['schema'])
+        self._date_formats = value['date_formats']
+        self._sample_report = value['sample_report']
+        if not same_file:
+            self._schema = self._schema.layout()
+            self._sample_report = None
+        self._data = self._schema.empty_frame()
+        log.info(f"Schema of {self._file} taken from the schema cache")
+        return True
+
+    def _cache_schema(self, keys: tuple) -> None:
+        """
+        Instance method that saves the inferred schema, its stats and
+        the sample report in the schema cache
+        :param keys: fingerprint and layout key of the file
+        """
+        if keys is None or self._data is None:
+            return
+        key, layout = keys
+        self._schema_cache.put(key=key,
+                               layout=layout,
+                               path=self._file,
+                               value={
+                                   'schema': self.get_table_schema().to_dict(),
+                                   'date_formats': self._date_formats,
+                                   'sample_report': self.get_sample_report()
+                               })
+
+    def invalidate_schema_cache(self) -> int:
+        """
+        Method that deletes the cached schemas of the file. Returns
+        the number of deleted entries
+        """
+        if self._schema_cache is None:
+            return 0
+        return self._schema_cache.invalidate(path=self._file)
+
+    def _dispatch_reader(self) -> None:
+        """
+        Instance method that calls the reader of the file type
+        """
+        self._schema_dtypes = None
         if self._type == 'csv':
             self._csv_reader()
         elif self._type == 'json':
             self._json_reader()
+        elif self._type in COLUMNAR_TYPES:
+            self._columnar_reader()
+
+    @contextmanager
+    def _read_settings(self, **settings):
+        """
+        Instance method that sets read settings e.g. read_mode or
+        chunksize for one read and restores them afterwards
+        """
+        saved = {key: getattr(self, f"_{key}") for key in settings}
+        for key, value in settings.items():
+            setattr(self, f"_{key}", value)
+        try:
+            yield
+        finally:
+            for key, value in saved.items():
+                setattr(self, f"_{key}", value)
+
+    def _guard_memory(self) -> dict:
+        """
+        Instance method that estimates the memory of a full or parallel
+        read from a head sample and the file size. If the estimate exceeds
+        max_memory it returns the settings of the budget read mode with
+        chunks or samples that fit the budget. They are only used for
+        this read
+        TODO: This method has side effects
+        """
+        self._memory_report = {
+            'max_memory': self._max_memory,
+            'estimated_bytes': None,
+            'read_mode': self._read_mode,
+            'peak_bytes': None
+        }
+        if (self._read_mode not in ('full', 'parallel') or
+                self._type not in ('csv', 'json') or not self._is_file()):
+            return {}
+        self._build_header()
+        if self._type == 'json' and not self._lines:
+            # a json document is parsed at once, its text is a lower bound
+            estimated = os.path.getsize(self._file)
+            self._memory_report['estimated_bytes'] = estimated
+            if estimated > self._max_memory:
+                raise MemoryBudgetError(
+                    f"File {self._file} needs at least {estimated} bytes "
+                    f"but the memory budget is {self._max_memory} bytes")
+            return {}
+        sample, total = head_sample(read=self._reader(),
+                                    path=self._file,
+                                    size=ESTIMATE_ROWS,
+                                    header_rows=self._header_rows(),
+                                    compression=self._get_compression())
+        per_row = row_bytes(self._apply_hints(sample, narrow=False))
+        estimated = int(per_row * total)
+        self._memory_report['estimated_bytes'] = estimated
+        if estimated <= self._max_memory:
+            return {}
+        rows = fitting_rows(self._max_memory, per_row)
+        settings = {'read_mode': self._budget_read_mode}
+        if self._budget_read_mode == 'chunked':
+            settings['chunksize'] = min(self._chunksize, rows)
+        else:
+            settings['sample_size'] = min(self._sample_size, rows)
+        log.warning(f"Reading {self._file} needs ~{estimated} bytes but the "
+                    f"memory budget is {self._max_memory} bytes. Switch from "
+                    f"read mode '{self._read_mode}' to "
+                    f"'{self._budget_read_mode}'")
+        self._memory_report.update(settings)
+        return settings
 
     def _build_header(self) -> None:
         """
@@ -124,34 +617,392 @@ class FileInspector(object):
         """
         self._build_header()
         try:
-            self._data = pd.read_csv(
-                filepath_or_buffer=self._file,
-                sep=self._seperator,
-                header=self._header,
-                names=self._columns)
+            if self._read_mode == 'chunked':
+                self._data = self._chunked_reader()
+            elif self._read_mode in self.__class__.SAMPLE_READ_MODES:
+                self._data = self._sample_reader()
+            elif (self._read_mode == 'parallel' and
+                  not self._get_compression()):
+                self._data = self._apply_hints(parallel_read_csv(
+                    workers=self._workers,
+                    header_rows=self._header_rows(),
+                    **self._csv_options()))
+            else:
+                options = self._csv_options()
+                options['dtype'] = self._read_dtypes()
+                self._data = self._apply_hints(pd.read_csv(**options))
         except Exception:
             track = traceback.format_exc()
             log.error(f"Upps. Check file and location. Error: {track}")
 
+    def _csv_options(self) -> dict:
+        """
+        Instance method that returns the pandas csv reader options
+        """
+        return {
+            'filepath_or_buffer': self._file,
+            'sep': self._seperator,
+            'header': self._header,
+            'names': self._columns,
+            'usecols': self._usecols,
+            'dtype': self._dtypes,
+            'compression': self._get_compression()
+        }
+
+    def _read_dtypes(self) -> dict:
+        """
+        Instance method that returns the dtypes of a full csv read. With
+        a category ratio the string columns with few distinct values on
+        the first rows are parsed as categoricals. Date columns are kept
+        """
+        if self._category_ratio is None:
+            return self._dtypes
+        head = project(pd.read_csv(nrows=CATEGORY_SAMPLE,
+                                   **self._csv_options()),
+                       self._usecols)
+        dates = self._infer_date_formats(head) if self._detect_dates else {}
+        dtypes = category_dtypes(head=head,
+                                 ratio=self._category_ratio,
+                                 exclude=dates)
+        dtypes.update(self._dtypes or {})
+        return dtypes
+
+    def _apply_hints(self,
+                     frame: DataFrame,
+                     narrow: bool = True) -> DataFrame:
+        """
+        Instance method that projects a read frame on usecols, parses
+        its date columns and downcasts and categorizes its columns if
+        configured. The date formats are inferred on the first frame
+        :param narrow: Apply downcasting and categoricals
+        """
+        frame = project(frame, self._usecols)
+        if self._detect_dates:
+            if self._date_formats is None:
+                self._date_formats = self._infer_date_formats(frame)
+            frame = parse_dates(frame, self._date_formats)
+        if narrow:
+            frame = self._narrow(frame)
+        return frame
+
+    def _narrow(self, frame: DataFrame) -> DataFrame:
+        """
+        Instance method that downcasts and categorizes the columns of the
+        frame held in memory if configured. The dtypes before are kept
+        for the table schema, so the DDL is never narrowed by it
+        TODO: This method has side effects
+        """
+        self._schema_dtypes = frame.dtypes.to_dict()
+        if self._downcast:
+            frame = downcast_numeric(frame)
+        if self._category_ratio is not None:
+            frame = categorize(frame, ratio=self._category_ratio)
+        return frame
+
+    def _infer_date_formats(self, frame: DataFrame) -> dict:
+        """
+        Instance method that infers the date formats of a frame. Columns
+        with a dtype given by the user are not detected
+        """
+        return {col: fmt for col, fmt in infer_date_formats(frame).items()
+                if col not in (self._dtypes or {})}
+
+    def _get_compression(self) -> str:
+        """
+        Instance method that returns the compression of the file
+        """
+        return detect_compression(self._file)
+
+    def _reader(self) -> partial:
+        """
+        Instance method that returns the pandas reader function with
+        all options but the file
+        """
+        if self._type == 'json':
+            return partial(pd.read_json,
+                           orient=self._orient,
+                           lines=self._lines,
+                           dtype=self._dtypes,
+                           compression=self._get_compression())
+        options = self._csv_options()
+        del options['filepath_or_buffer']
+        return partial(pd.read_csv, **options)
+
+    def _iter_chunks(self):
+        """
+        Instance method that returns an iterator over chunks of
+        chunksize rows of a csv or json lines file
+        """
+        chunks = self._reader()(self._file, chunksize=self._chunksize)
+        chunks = (self._apply_hints(chunk, narrow=False) for chunk in chunks)
+        if self._narrow_types:
+            return self._collect_stats(chunks)
+        return chunks
+
+    def _collect_stats(self, chunks):
+        """
+        Instance method that merges the value statistics of every chunk
+        while the chunks are passed through
+        TODO: This method has side effects
+        """
+        self._value_stats = {}
+        for chunk in chunks:
+            self._value_stats = merge_frame_stats(self._value_stats,
+                                                  frame_stats(chunk))
+            yield chunk
+
+    def _chunked_reader(self) -> DataFrame:
+        """
+        Instance method that reads the file chunk by chunk and
+        returns a dataframe without rows that carries the widened
+        dtypes of all chunks. With more than one worker uncompressed csv
+        chunks are parsed in parallel processes
+        """
+        if (self._type == 'csv' and self._workers and self._workers > 1 and
+                not self._get_compression()):
+            frame = parallel_read_csv(workers=self._workers,
+                                      header_rows=self._header_rows(),
+                                      schema_only=True,
+                                      **self._csv_options())
+            if not self._detect_dates:
+                return frame
+            head = self._reader()(self._file, nrows=DATE_SAMPLE)
+            self._date_formats = self._infer_date_formats(head)
+            return frame.astype({col: 'datetime64[ns]' for col
+                                 in self._date_formats
+                                 if col in frame.columns})
+        return empty_frame(infer_from_chunks(self._iter_chunks()))
+
+    def iter_dtypes(self):
+        """
+        Method that reads a csv or json lines file chunk by chunk and
+        yields the widened column datatypes after every chunk. The first
+        schema is available before the file is fully read.
+        """
+        self._build_header()
+        return iter_infer_chunks(self._iter_chunks())
+
+    def iter_staging_ddl(self,
+                         table_name: str,
+                         schema: str = None,
+                         database: str = None,
+                         dtype=None):
+        """
+        Method that yields the staging ddl statement after every chunk
+        of a csv or json lines file
+        :table name: DDL table name
+        :schema: DDL schema name
+        :database: DDL database name
+        :dtype : dict of column name to SQL type, default None
+        """
+        qu_name = self._build_name(table=table_name,
+                                   db=database,
+                                   schema=schema,
+                                   table_type="staging")
+        for dtypes in self.iter_dtypes():
+            yield self._extract_ddl(
+                table_schema=self._with_row_hash(
+                    self._build_schema(empty_frame(dtypes))),
+                name=qu_name,
+                dtype=dtype)
+
+    def _header_rows(self) -> int:
+        """
+        Instance method that returns the number of lines in front
+        of the first data row
+        """
+        if self._type == 'json' or self._header is None:
+            return 0
+        return int(self._header) + 1
+
+    def _sample_reader(self) -> DataFrame:
+        """
+        Instance method that reads a sample of a csv or json lines file
+        and keeps a report how confident the sampled schema is
+        """
+        read = self._reader()
+        compression = self._get_compression()
+        if self._read_mode == 'reservoir':
+            frame, total = reservoir_sample(chunks=self._iter_chunks(),
+                                            size=self._sample_size)
+            exact = True
+        elif self._read_mode == 'head' or compression:
+            # a compressed stream can not seek, only its head is inflated
+            frame, total = head_sample(read=read,
+                                       path=self._file,
+                                       size=self._sample_size,
+                                       header_rows=self._header_rows(),
+                                       compression=compression)
+            exact = False
+        else:
+            csv_options = {}
+            if self._type == 'csv':
+                csv_options = {'quotechar': b'"',
+                               'delimiter': self._seperator.encode()}
+            frame, total = stratified_sample(read=read,
+                                             path=self._file,
+                                             size=self._sample_size,
+                                             header_rows=self._header_rows(),
+                                             **csv_options)
+            exact = False
+        if exact:
+            frame = self._narrow(frame)
+        else:
+            frame = self._apply_hints(frame, narrow=False)
+        self._sample_report = sample_confidence(frame=frame,
+                                                total_rows=total,
+                                                exact_dtypes=exact)
+        log.info(f"Sampled {len(frame)} of ~{total} rows with read mode "
+                 f"'{self._read_mode}'")
+        return frame
+
     def _json_reader(self):
         """
-        Instance method that implements a json reader
+        Instance method that implements a json reader. Json lines can
+        be read chunked or sampled
         """
         self._build_header()
         try:
-            self._data = pd.read_json(
-                path_or_buf=self._file,
-                orient=self._orient)
+            if self._lines and self._read_mode == 'chunked':
+                self._data = self._chunked_reader()
+            elif (self._lines and
+                  self._read_mode in self.__class__.SAMPLE_READ_MODES):
+                self._data = self._sample_reader()
+            else:
+                self._data = self._apply_hints(self._read_json())
+        except Exception:
+            track = traceback.format_exc()
+            log.error(f"Upps. Check file and location. Error: {track}")
+
+    def _read_json(self) -> DataFrame:
+        """
+        Instance method that reads a whole json file. Json lines with
+        usecols are read chunk by chunk and every chunk is projected, a
+        json document is parsed at once and projected afterwards
+        """
+        if not self._lines or self._usecols is None:
+            return self._reader()(self._file)
+        chunks = self._reader()(self._file, chunksize=self._chunksize)
+        return pd.concat([project(chunk, self._usecols) for chunk in chunks],
+                         ignore_index=True)
+
+    def _columnar_reader(self) -> None:
+        """
+        Instance method that reads only the schema of a parquet or
+        arrow file. The row count is taken from the metadata
+        """
+        try:
+            frame = project(schema_frame(path=self._file, type=self._type),
+                            self._usecols)
+            if self._dtypes:
+                frame = frame.astype({col: dt for col, dt
+                                      in self._dtypes.items()
+                                      if col in frame.columns})
+            self._data = frame
+            self._sample_report = sample_confidence(
+                frame=self._data,
+                total_rows=count_rows(path=self._file, type=self._type),
+                exact_dtypes=True)
         except Exception:
             track = traceback.format_exc()
             log.error(f"Upps. Check file and location. Error: {track}")
 
+    def read_rows(self,
+                  columns: list = None,
+                  nrows: int = None) -> DataFrame:
+        """
+        Method that reads rows of the file without keeping them. Only
+        the given columns are parsed (column projection).
+        :param columns: Columns to read. Default all columns
+        :param nrows: Number of rows to read. Default all rows
+        """
+        columns = columns or self._usecols
+        if self._type in COLUMNAR_TYPES:
+            return read_columnar(path=self._file,
+                                 type=self._type,
+                                 columns=columns,
+                                 nrows=nrows)
+        if self._type == 'csv':
+            self._build_header()
+            options = self._csv_options()
+            options['usecols'] = columns
+            return pd.read_csv(nrows=nrows, **options)
+        if self._lines and nrows is not None:
+            frame = self._reader()(self._file, nrows=nrows)
+        else:
+            frame = self._reader()(self._file)
+        frame = project(frame, columns)
+        return frame if nrows is None else frame.head(nrows)
+
     def show_columns(self) -> list:
         """
-        Method that shows all columns of a provided dataset
+        Method that shows all columns of a provided dataset. If the
+        data is not loaded yet only the header is probed
         """
-        self._load_df_if_empty()
-        return self._data.columns
+        if self._data is None:
+            return self.probe_columns()
+        return list(self._data.columns)
+
+    def probe_columns(self) -> list:
+        """
+        Method that returns the columns of the file by reading only
+        the header line or the first json record. Falls back to a
+        full read if the json orient can not be probed. The columns of a
+        family of files are the union of the columns of every file in
+        the order of their first appearance
+        """
+        if self._data is not None:
+            return list(self._data.columns)
+        if self._files is not None:
+            columns = []
+            for file in self._files:
+                member = FileInspector(file=file, **self._member_options())
+                columns += [c for c in member.probe_columns()
+                            if c not in columns]
+            return columns
+        if not self._is_file():
+            log.error("Can't find the a file. Check file path!")
+        self._build_header()
+        columns = None
+        if self._type == 'csv':
+            columns = probe_csv_columns(**self._csv_options())
+        elif self._type == 'json':
+            columns = probe_json_columns(path=self._file,
+                                         orient=self._orient,
+                                         lines=self._lines,
+                                         compression=self._get_compression())
+        elif self._type in COLUMNAR_TYPES:
+            columns = read_schema(path=self._file, type=self._type).names
+        if columns is None:
+            self._load_df_if_empty()
+            columns = list(self._data.columns)
+        if self._usecols is not None:
+            columns = [c for c in columns if c in self._usecols]
+        return columns
+
+    def check_schema_drift(self,
+                           expected,
+                           raise_on_drift: bool = False) -> dict:
+        """
+        Method that compares the header of the file with an expected
+        schema without parsing the file body. A family of files is
+        compared with the union of its headers
+        :param expected: FileInspector of a previously inspected file,
+        list of column names or dict of column name to dtype
+        :param raise_on_drift: Raise a SchemaDriftError on drift
+        """
+        if isinstance(expected, FileInspector):
+            expected = expected.show_columns()
+        drift = schema_drift(expected=expected,
+                             actual=self.probe_columns())
+        if drift['drift']:
+            log.warning(f"Schema drift in file {self._file}: "
+                        f"added {drift['added']}, removed "
+                        f"{drift['removed']}, reordered "
+                        f"{drift['reordered']}")
+            if raise_on_drift:
+                raise SchemaDriftError(f"Schema drift in file {self._file}")
+        return drift
 
     def get_dtypes(self) -> dict:
         """
@@ -164,12 +1015,39 @@ class FileInspector(object):
             raise NoColumnsError
         return self._data.dtypes.to_dict()
 
+    def get_sample_report(self) -> dict:
+        """
+        Method that reports how confident the inferred schema is. For
+        the sampling read modes it returns the sampled and (estimated)
+        total rows and a confidence between 0 and 1 per column. All other
+        read modes see every row and are always confident.
+        """
+        self._load_df_if_empty()
+        if self._sample_report is None:
+            return sample_confidence(frame=self._data,
+                                     total_rows=len(self._data),
+                                     exact_dtypes=True)
+        return self._sample_report
+
+    def get_memory_report(self) -> dict:
+        """
+        Method that reports the memory budget, the estimated memory of a
+        full read, the used read mode and the peak memory of the
+        inspection. If the budget read mode is used its chunksize or
+        sample_size is reported. A file family reports the highest peak
+        and the report of every file under 'files'. Returns None if no
+        max_memory is given
+        """
+        self._load_df_if_empty()
+        return self._memory_report
+
     def col_to_str(self) -> None:
         """
         Method that change all column data type to a string type
         """
         self._load_df_if_empty()
         self._data = self._data.astype(str)
+        self._schema = None
 
     def _is_file(self) -> bool:
         """
@@ -203,7 +1081,8 @@ class FileInspector(object):
                          table_name: str,
                          schema: str = None,
                          database: str = None,
-                         dtype=None) -> None:
+                         dtype=None,
+                         logical_pk: list = None) -> None:
         """
         Method that get the sql ddl statement and save it as a file
         in a target path
@@ -215,6 +1094,7 @@ class FileInspector(object):
         :dtype : dict of column name to SQL type, default None
         Optional specifying the datatype for columns. The SQL type should
         be a SQLAlchemy type, or a string for sqlite3 fallback connection.
+        :logical_pk: Logical primary key the physical design is derived of
         """
         self._load_df_if_empty()
         tpath = self._set_path(path=path)
@@ -227,9 +1107,11 @@ class FileInspector(object):
                 table_type="staging"
             )
             ddl = self._extract_ddl(
-                frame=self._data,
+                table_schema=self._get_typed_schema(table_type="staging"),
                 name=qu_name,
-                dtype=dtype
+                dtype=dtype,
+                logical_pk=logical_pk,
+                table_type="staging"
             )
             self._save_file(
                 path=tpath,
@@ -241,24 +1123,107 @@ class FileInspector(object):
             log.error(f"{e}")
 
     def _extract_ddl(self,
-                     frame: DataFrame,
+                     table_schema: TableSchema,
                      name: str,
-                     dtype: dict) -> str:
+                     dtype: dict,
+                     logical_pk: list = None,
+                     table_type: str = "staging") -> str:
+        """
+        Instance method that compiles the ddl statement of a table
+        schema for the dialect. Without a dialect the pandas sqlite
+        fallback is used. With physical_design and a logical primary key
+        the physical design of the dialect is added
+        """
+        if self._dialect is not None:
+            table = table_schema.to_table(name=name,
+                                          dtype=dtype,
+                                          headroom=self._narrow_headroom(),
+                                          dialect=self._dialect)
+            if self._physical_design and logical_pk:
+                return physical_ddl(table=table,
+                                    logical_pk=logical_pk,
+                                    table_type=table_type,
+                                    dialect=self._dialect)
+            return str(CreateTable(table).compile(dialect=self._dialect))
+        return pd.io.sql.get_schema(
+            frame=table_schema.empty_frame(),
+            name=name,
+            con=self._con,
+            dtype=table_schema.sqlite_types(dtype=dtype,
+                                            headroom=self._narrow_headroom()))
+
+    def _has_sqa_con(self) -> bool:
+        """
+        Instance method that checks if the connection is a sqlalchemy
+        connectable
+        """
+        return isinstance(pandasSQL_builder(con=self._con), SQLDatabase)
+
+    def _build_schema(self,
+                      frame: DataFrame,
+                      name: str = None,
+                      dtypes: dict = None) -> TableSchema:
+        """
+        Instance method that builds the table schema of a frame. Detected
+        date only columns are typed as dates. For narrow types the value
+        statistics of the chunks or of the frame are added. Without them
+        a warning is logged and the columns get wide types
+        :param dtypes: dtypes of the columns before a downcast
+        """
+        dates = [col for col, fmt in (self._date_formats or {}).items()
+                 if is_date_format(fmt)]
+        value_stats = None
+        if self._narrow_types:
+            if self._value_stats is not None:
+                value_stats = self._value_stats
+            elif (len(frame) and
+                  self._used_read_mode() not in ('head', 'stratified')):
+                value_stats = frame_stats(frame)
+            if value_stats is None:
+                log.warning(f"Narrow types are requested but read mode "
+                            f"'{self._used_read_mode()}' gives no value "
+                            f"statistics of {self._file}. The columns get "
+                            f"wide types")
+        return TableSchema.from_frame(frame=frame,
+                                      name=name,
+                                      date_columns=dates,
+                                      value_stats=value_stats,
+                                      dtypes=dtypes)
+
+    def _used_read_mode(self) -> str:
+        """
+        Instance method that returns the read mode the data was read
+        with. It differs from read_mode if the memory budget was exceeded
+        """
+        if self._memory_report is not None:
+            return self._memory_report.get('read_mode', self._read_mode)
+        return self._read_mode
+
+    def _narrow_headroom(self) -> float:
+        """
+        Instance method that returns the headroom of narrow types or
+        None if columns are not narrowed
+        """
+        return self._headroom if self._narrow_types else None
+
+    def get_table_schema(self) -> TableSchema:
         """
-        Instance method that extracts the ddl statement of the
-        pandals sql core module
+        Method that returns the compact schema of the file. It is built
+        once and carries the schema to the DDL and DML generation
         """
-        return pd.io.sql.get_schema(frame=frame,
-                                    name=name,
-                                    con=self._con,
-                                    dtype=dtype)
+        if self._schema is None:
+            self._load_df_if_empty()
+            self._schema = self._build_schema(self._data,
+                                              dtypes=self._schema_dtypes)
+        return self._schema
 
     def save_history_ddl(self,
                          path,
                          table_name: str,
                          schema: str = None,
                          database: str = None,
-                         dtype=None) -> None:
+                         dtype=None,
+                         logical_pk: list = None) -> None:
         """
         Method that get the sql history ddl statement and save it as a file
         in a target path
@@ -269,6 +1234,7 @@ class FileInspector(object):
         :dtype : dict of column name to SQL type, default None
         Optional specifying the datatype for columns. The SQL type should
         be a SQLAlchemy type, or a string for sqlite3 fallback connection.
+        :logical_pk: Logical primary key the physical design is derived of
         """
         self._load_df_if_empty()
         tpath = self._set_path(path=path)
@@ -280,9 +1246,11 @@ class FileInspector(object):
                                        schema=schema,
                                        table_type="history")
             ddl = self._extract_ddl(
-                frame=self._his_data,
+                table_schema=self._his_schema,
                 name=qu_name,
-                dtype=dtype
+                dtype=dtype,
+                logical_pk=logical_pk,
+                table_type="history"
             )
 
             self._save_file(
@@ -294,18 +1262,64 @@ class FileInspector(object):
         except ValueError as e:
             log.error(f"{e}")
 
-    def _add_scd2_attributes(self) -> None:
+    def save_index_ddl(self,
+                       path,
+                       table_name: str,
+                       logical_pk: list,
+                       schema: str = None,
+                       database: str = None) -> None:
         """
-        Instance method that add scd2 relevant attributes
+        Method that saves the index ddl of the staging table on the
+        logical primary key and of the history table on
+        (logical_pk..., VALID_TO_DATE) as INDEX_<table> files. The scd2
+        DMLs join and filter on these columns
+        :param path: Directory path where files should be saved
+        :table name: DDL table name
+        :param logical_pk: Logical primary key of the table as list
+        :schema: DDL schema name
+        :database: DDL database name
         """
         self._load_df_if_empty()
-        now = datetime.now()
-        now_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        self._his_data = self._data.copy()
-        self._his_data['UPDATED_AT'] = pd.Timestamp(now_str)
-        self._his_data['BATCH_RUN_AT'] = pd.Timestamp(now_str)
-        self._his_data['VALID_FROM_DATE'] = pd.Timestamp(now_str)
-        self._his_data['VALID_TO_DATE'] = pd.Timestamp(now_str)
+        tpath = self._set_path(path=path)
+        for table_type in ('staging', 'history'):
+            qu_name = self._build_name(table=table_name,
+                                       db=database,
+                                       schema=schema,
+                                       table_type=table_type)
+            table = self._get_typed_schema(table_type=table_type).to_table(
+                name=qu_name,
+                headroom=self._narrow_headroom(),
+                dialect=self._dialect)
+            index = table_index(table=table,
+                                logical_pk=logical_pk,
+                                table_type=table_type,
+                                dialect=self._dialect)
+            self._save_file(path=tpath,
+                            fname=f"INDEX_{qu_name}",
+                            content=index_ddl(index, self._dialect),
+                            subdir='DDL')
+
+    def _add_scd2_attributes(self) -> None:
+        """
+        Instance method that add scd2 relevant attributes to the schema
+        of the history table. No row data is copied
+        """
+        scd2 = [ColumnSchema(name=col,
+                             dtype=SCD2_DTYPE,
+                             kind='datetime',
+                             nullable=False)
+                for col in SCD2_COLUMNS]
+        self._his_schema = self._get_typed_schema(
+            table_type="staging").with_columns(scd2)
+
+    @property
+    def _his_data(self) -> DataFrame:
+        """
+        Dataframe without rows of the history table schema
+        """
+        if self._his_schema is None:
+            return None
+        return self._his_schema.empty_frame()
 
     def _build_name(self,
                     table: str,
@@ -323,6 +1337,11 @@ class FileInspector(object):
             sec = 'PersistentStaging'
             t_pre = self.config.config[sec]['table_prefix_name']
             schema = schema or self.config.config[sec]['schema_name']
+        elif table_type == 'current':
+            sec = 'PersistentStaging'
+            t_pre = (f"{CURRENT_PREFIX}_"
+                     f"{self.config.config[sec]['table_prefix_name']}")
+            schema = schema or self.config.config[sec]['schema_name']
 
         if table is None:
             log.error(f"No table name given but needed. Please specify name:")
@@ -370,114 +1389,479 @@ class FileInspector(object):
                         type: str,
                         schema: str = None,
                         if_exists: str = 'replace',
-                        dtype=None
+                        dtype=None,
+                        index_pk: list = None
                         ) -> None:
         """
         method that creates the database table without data
         :table_name path: target table name
         :schema : Target database schema name
         :if_exists: How to behave if the table already exists.
-        {‘fail’, ‘replace’, ‘append’}
+        {‘fail’, ‘replace’, ‘append’, ‘alter’}. alter adds the missing
+        columns and widens the column types of the existing table with
+        ALTER TABLE statements instead of rebuilding it
         :dtype : dict of column name to SQL type, default None
         Optional specifying the datatype for columns. The SQL type should
         be a SQLAlchemy type, or a string for sqlite3 fallback connection.
         :type : str {'staging', 'history'}. Determine if the staging or
         history table shall be created
+        :index_pk: Logical primary key. If given the staging table gets an
+        index on it and the history table on (index_pk..., VALID_TO_DATE)
         """
-        self._load_df_if_empty()
         if schema:
             insp = inspect(self._con)
             schemas = insp.get_schema_names()
             if schema not in schemas:
                 self._con.execute(CreateSchema(schema))
         try:
-            if type == "staging":
-                df = self._data[:0]
-            elif type == "history":
-                df = self._his_data[:0]
-            df.to_sql(
-                name=table_name,
-                schema=schema,
-                con=self._con,
-                if_exists=if_exists,
-                index=False,
-                dtype=dtype
-            )
+            table_schema = self._get_typed_schema(table_type=type)
+            if not self._has_sqa_con():
+                self._create_fallback_table(table_schema=table_schema,
+                                            table_name=table_name,
+                                            type=type,
+                                            schema=schema,
+                                            if_exists=if_exists,
+                                            dtype=dtype,
+                                            index_pk=index_pk)
+                return
+            if if_exists not in ('fail', 'replace', 'append', 'alter'):
+                raise ValueError(f"'{if_exists}' is not valid for if_exists")
+            table = table_schema.to_table(name=table_name,
+                                          schema=schema,
+                                          dtype=dtype,
+                                          headroom=self._narrow_headroom(),
+                                          dialect=self._dialect)
+            tables = inspect(self._con).get_table_names(schema=schema)
+            if table_name in tables:
+                self._update_existing_table(table=table, if_exists=if_exists)
+            else:
+                table.create(self._con)
+            self._create_missing_index(table=table,
+                                       type=type,
+                                       index_pk=index_pk)
         except Exception as e:
             log.error(f"Can't create db table. Error: {e}")
             raise e
 
+    def _update_existing_table(self, table: Table, if_exists: str) -> None:
+        """
+        Instance method that applies if_exists to the existing database table
+        :param if_exists: {'fail', 'replace', 'append', 'alter'}
+        """
+        if if_exists == 'fail':
+            raise ValueError(f"Table '{table.name}' already exists.")
+        if if_exists == 'alter':
+            for statement in self._migration_statements(
+                    table=table,
+                    table_name=table.name,
+                    schema=table.schema):
+                self._con.execute(statement)
+        elif if_exists == 'replace':
+            table.drop(self._con)
+            table.create(self._con)
+
+    def _create_fallback_table(self,
+                               table_schema,
+                               table_name: str,
+                               type: str,
+                               schema: str = None,
+                               if_exists: str = 'replace',
+                               dtype=None,
+                               index_pk: list = None) -> None:
+        """
+        Instance method that creates the table and its lookup index over
+        the sqlite3 fallback connection
+        """
+        table_schema.empty_frame().to_sql(
+            name=table_name,
+            schema=schema,
+            con=self._con,
+            if_exists=if_exists,
+            index=False,
+            dtype=table_schema.sqlite_types(
+                dtype=dtype,
+                headroom=self._narrow_headroom())
+        )
+        if index_pk:
+            table = table_schema.to_table(name=table_name, schema=schema)
+            index = table_index(table=table,
+                                logical_pk=index_pk,
+                                table_type=type)
+            self._con.execute(index_ddl(index, if_not_exists=True))
+
+    def _create_missing_index(self,
+                              table: Table,
+                              type: str,
+                              index_pk: list = None) -> None:
+        """
+        Instance method that creates the lookup index on the logical primary
+        key unless the database table already has an index of that name
+        :param index_pk: Logical primary key. No index is created without it
+        """
+        if not index_pk:
+            return
+        index = table_index(table=table,
+                            logical_pk=index_pk,
+                            table_type=type,
+                            dialect=self._dialect)
+        indexes = inspect(self._con).get_indexes(table.name,
+                                                 schema=table.schema)
+        if index.name not in [i['name'] for i in indexes]:
+            index.create(self._con)
+
     def create_file_elt_blueprint(self,
                                   path: str,
                                   table_name: str,
                                   logical_pk: list,
                                   load_strategy: str,
+                                  current_snapshot: str = None
                                   ):
-        self._load_df_if_empty()
-        self.save_staging_ddl(path=path, table_name=table_name)
-        self.save_history_ddl(path=path, table_name=table_name)
-        stg = self._get_sqa_table(
-            table_name=table_name,
-            table_type="staging")
-        his = self._get_sqa_table(
-            table_name=table_name,
-            table_type="history")
-        c = SqaExtractor(
+        """
+        Method that creates the staging, history and index DDL and the
+        scd2 DMLs of a table
+        :param path: Directory path where files should be saved
+        :param table_name: Table name
+        :param logical_pk: Logical primary key of the table as list
+        :param load_strategy: [jinja, database_table, bind]
+        :param current_snapshot: Also create a snapshot of the current
+        history records {None, table, view}. A table is maintained
+        incrementally by DMLs after the scd2 steps. A view is a
+        materialized view, if the dialect has none a table is created.
+        A snowflake view of the database_table strategy is a plain view
+        """
+        if current_snapshot not in [None] + CURRENT_SNAPSHOTS:
+            kinds = ' ,'.join(CURRENT_SNAPSHOTS)
+            raise ValueError(f"Invalid current snapshot. Allowed are: "
+                             f"'{kinds}'")
+        if current_snapshot == 'view' and \
+                getattr(self._dialect, 'name', None) not in MATERIALIZED_VIEWS:
+            log.warning(f"Dialect has no materialized views. The current "
+                        f"snapshot of {table_name} is created as table")
+            current_snapshot = 'table'
+        self.save_staging_ddl(path=path,
+                              table_name=table_name,
+                              logical_pk=logical_pk)
+        self.save_history_ddl(path=path,
+                              table_name=table_name,
+                              logical_pk=logical_pk)
+        self.save_index_ddl(path=path,
+                            table_name=table_name,
+                            logical_pk=logical_pk)
+        if current_snapshot is not None:
+            self._save_current_ddl(path=path,
+                                   table_name=table_name,
+                                   logical_pk=logical_pk,
+                                   load_strategy=load_strategy,
+                                   current_snapshot=current_snapshot)
+        self._save_dml_files(path=path,
+                             table_name=table_name,
+                             logical_pk=logical_pk,
+                             load_strategy=load_strategy,
+                             current_snapshot=current_snapshot)
+
+    def _get_extractor(self,
+                       table_name: str,
+                       logical_pk: list,
+                       load_strategy: str,
+                       current_snapshot: str = None,
+                       split_schema: bool = False) -> SqaExtractor:
+        """
+        Instance method that returns the DML extractor of the staging,
+        history and current snapshot table
+        :param split_schema: Address the tables as schema and table name
+        like the database tables instead of one qualified identifier
+        """
+        stg = self._get_typed_schema(table_type="staging").renamed(
+            self._build_name(table=table_name, table_type="staging"))
+        his = self._get_typed_schema(table_type="history").renamed(
+            self._build_name(table=table_name, table_type="history"))
+        cur = None
+        if current_snapshot is not None:
+            cur = his.renamed(self._build_name(table=table_name,
+                                               table_type="current"))
+        if split_schema:
+            stg, his = _schema_table(stg), _schema_table(his)
+            cur = cur if cur is None else _schema_table(cur)
+        return SqaExtractor(
             staging_table=stg,
             history_table=his,
             logical_pk=logical_pk,
             load_strategy=load_strategy,
-            con=self._con)
+            con=self._con,
+            dialect=self._dialect,
+            current_table=cur,
+            hash_diff=self._hash_diff,
+            join_updates=self._join_updates,
+            tableload_row=self._tableload_row)
 
-        base_name = c.get_hist_table_name()
-        self._save_file(
-                path=path,
-                fname=f"scd2_1_{base_name}",
-                content=c.scd2_new_insert(),
-                subdir='DML'
-        )
+    def _save_current_ddl(self,
+                          path: str,
+                          table_name: str,
+                          logical_pk: list,
+                          load_strategy: str,
+                          current_snapshot: str) -> None:
+        """
+        Instance method that saves the ddl of the current snapshot. A
+        table gets an index on the logical primary key
+        """
+        qu_name = self._build_name(table=table_name, table_type="current")
+        if current_snapshot == 'view':
+            c = self._get_extractor(table_name=table_name,
+                                    logical_pk=logical_pk,
+                                    load_strategy=load_strategy,
+                                    current_snapshot=current_snapshot)
+            self._save_file(path=path,
+                            fname=qu_name,
+                            content=c.current_view_ddl(),
+                            subdir='DDL')
+            return
+        schema = self._get_typed_schema(table_type="history")
+        self._save_file(path=path,
+                        fname=qu_name,
+                        content=self._extract_ddl(table_schema=schema,
+                                                  name=qu_name,
+                                                  dtype=None),
+                        subdir='DDL')
+        table = schema.to_table(name=qu_name,
+                                headroom=self._narrow_headroom(),
+                                dialect=self._dialect)
+        index = table_index(table=table,
+                            logical_pk=logical_pk,
+                            table_type="staging",
+                            dialect=self._dialect)
+        self._save_file(path=path,
+                        fname=f"INDEX_{qu_name}",
+                        content=index_ddl(index, self._dialect),
+                        subdir='DDL')
 
-        self._save_file(
-                path=path,
-                fname=f"scd2_2_{base_name}",
-                content=c.scd2_updated_insert(),
-                subdir='DML'
-        )
-        self._Dag.addTable(f"scd2_2_{base_name}.sql",
-                           f"scd2_1_{base_name}.sql")
-
-        self._save_file(
-                path=path,
-                fname=f"scd2_3_{base_name}",
-                content=c.scd2_updated_update(),
-                subdir='DML'
-        )
+    def get_bind_statements(self,
+                            table_name: str,
+                            logical_pk: list,
+                            current_snapshot: str = None) -> dict:
+        """
+        Method that returns the DMLs of a load with the load dates as
+        bind parameters. Returns a dict of DML file name to the SQL and
+        the parameter names in the order of their placeholders, in load
+        order. A runner prepares every statement once and executes it
+        each batch with the dates
+        :param table_name: Table name
+        :param logical_pk: Logical primary key of the table as list
+        :param current_snapshot: {None, table, view}
+        """
+        c = self._get_extractor(table_name=table_name,
+                                logical_pk=logical_pk,
+                                load_strategy='bind',
+                                current_snapshot=current_snapshot)
+        steps = load_steps(current_snapshot=current_snapshot,
+                           dialect=self._dialect,
+                           hash_diff=self._hash_diff,
+                           load_mode=self._load_mode)
+        base_name = c.get_hist_table_name()
+        return {f"{prefix}_{base_name}": c.bind_statement(method)
+                for prefix, method in steps}
 
-        self._Dag.addTable(f"scd2_3_{base_name}.sql",
-                           f"scd2_2_{base_name}.sql")
+    def _save_dml_files(self,
+                        path: str,
+                        table_name: str,
+                        logical_pk: list,
+                        load_strategy: str,
+                        current_snapshot: str = None,
+                        split_schema: bool = False) -> str:
+        """
+        Instance method that saves the scd2 DMLs, the maintenance DMLs
+        of the current snapshot and the table load files of the
+        blueprint. Returns the base name of the DMLs
+        :param split_schema: see _get_extractor
+        """
+        c = self._get_extractor(table_name=table_name,
+                                logical_pk=logical_pk,
+                                load_strategy=load_strategy,
+                                current_snapshot=current_snapshot,
+                                split_schema=split_schema)
+        steps = load_steps(current_snapshot=current_snapshot,
+                           dialect=self._dialect,
+                           hash_diff=self._hash_diff,
+                           load_mode=self._load_mode)
 
-        self._save_file(
-                path=path,
-                fname=f"scd2_4_{base_name}",
-                content=c.scd2_deleted_update(),
-                subdir='DML'
-        )
-        self._Dag.addTable(f"scd2_4_{base_name}.sql",
-                           f"scd2_3_{base_name}.sql")
+        for fname, subdir, content in dml_files(c, load_strategy, steps):
+            self._save_file(path=path,
+                            fname=fname,
+                            content=content,
+                            subdir=subdir)
+        for table, dependency in dml_dependencies(c.get_hist_table_name(),
+                                                  steps):
+            self._Dag.addTable(table, dependency)
         if load_strategy == 'database_table':
             self._save_file(
                     path=path,
                     fname="JOBTABLE_TABLELOAD",
-                    content=get_sqa_tableload(con=self._con),
+                    content=get_sqa_tableload(con=self._con,
+                                              dialect=self._dialect),
                     subdir='DDL'
             )
+        return c.get_hist_table_name()
 
-            self._save_file(
-                path=path,
-                fname=f"{base_name}_INSERT_TABLELOAD",
-                content=c.get_tableload_insert(),
-                subdir='DML'
-            )
+    def get_schema_diff(self,
+                        table_name: str,
+                        type: str,
+                        schema: str = None,
+                        dtype=None) -> list:
+        """
+        Method that reflects an existing database table and returns the
+        ALTER TABLE statements that add the missing columns and widen
+        the column types to the inferred schema. Columns of the table
+        that are not in the file are kept. Returns the CREATE TABLE
+        statement if the table does not exist
+        :table_name path: target table name
+        :schema : Target database schema name
+        :type : str {'staging', 'history'}
+        """
+        table = self._get_typed_schema(table_type=type).to_table(
+            name=table_name,
+            schema=schema,
+            dtype=dtype,
+            headroom=self._narrow_headroom(),
+            dialect=self._dialect)
+        return self._migration_statements(table=table,
+                                          table_name=table_name,
+                                          schema=schema)
+
+    def _migration_statements(self,
+                              table: Table,
+                              table_name: str,
+                              schema: str = None) -> list:
+        """
+        Instance method that returns the statements that migrate the
+        existing database table to the table
+        """
+        if not self._has_sqa_con():
+            raise ValueError("A schema diff needs a sqlalchemy connection")
+        existing = reflect_columns(con=self._con,
+                                   table_name=table_name,
+                                   schema=schema)
+        if existing is None:
+            return [str(CreateTable(table).compile(
+                dialect=self._dialect)).strip()]
+        return alter_statements(table=table,
+                                diff=diff_table(table, existing),
+                                dialect=self._dialect)
+
+    def create_file_elt_migration(self,
+                                  path: str,
+                                  table_name: str,
+                                  logical_pk: list,
+                                  load_strategy: str) -> dict:
+        """
+        Method that evolves the blueprint of an existing staging and
+        history table. The ALTER TABLE statements of both tables are
+        saved as ALTER_<table> files next to the DDL and the scd2 DMLs
+        are regenerated. The DMLs depend on the migration in the DAG.
+        The tables are looked up by the prefixed table name in the
+        configured schema and the regenerated DMLs address them the same
+        way, as schema and table name. Adding a nullable column only
+        changes the catalog, but a type change rewrites the table on most
+        dialects, e.g. on postgresql for all but a longer VARCHAR, and
+        locks it while it runs.
+        Returns a dict of qualified table name to its statements
+        :param path: Directory path where files should be saved
+        """
+        self._load_df_if_empty()
+        tpath = self._set_path(path=path)
+        migrations = {}
+        for table_type in ('staging', 'history'):
+            qu_name = self._build_name(table=table_name,
+                                       table_type=table_type)
+            schema, name = _split_name(qu_name)
+            migrations[qu_name] = self.get_schema_diff(table_name=name,
+                                                       type=table_type,
+                                                       schema=schema)
+        base_name = self._save_dml_files(path=tpath,
+                                         table_name=table_name,
+                                         logical_pk=logical_pk,
+                                         load_strategy=load_strategy,
+                                         split_schema=True)
+        first_step = load_steps(dialect=self._dialect,
+                                hash_diff=self._hash_diff,
+                                load_mode=self._load_mode)[0][0]
+        for qu_name, statements in migrations.items():
+            if not statements:
+                continue
+            fname = f"ALTER_{qu_name}"
+            self._save_file(path=tpath,
+                            fname=fname,
+                            content="\n".join(f"{s};" for s in statements),
+                            subdir='DDL')
+            self._Dag.addTable(f"{first_step}_{base_name}.sql",
+                               f"{fname.replace('.', '_')}.sql")
+        return migrations
+
+    def create_multi_dialect_blueprint(self,
+                                       path: str,
+                                       table_name: str,
+                                       logical_pk: list,
+                                       load_strategy: str,
+                                       dialects: list,
+                                       workers: int = None) -> dict:
+        """
+        Method that infers the schema once and creates the staging and
+        history DDL and all scd2 DMLs for every dialect in a subfolder
+        of path named after the dialect. Returns a dict of dialect
+        folder to the list of saved file names
+        :param path: Directory path where the dialect folders are saved
+        :param dialects: list of dialect names or sqlalchemy dialects
+        :param workers: Number of worker processes that compile the
+        dialects. Default None compiles them one after the other. Worker
+        processes need dialect names
+        """
+        self._load_df_if_empty()
+        tpath = self._set_path(path=path)
+        if not os.path.isdir(tpath):
+            log.error("Given Path is not a valid directory. Please check!")
+            raise FileNotFoundError
+        folders = [d if isinstance(d, str) else d.name for d in dialects]
+        if len(set(folders)) != len(folders):
+            raise ValueError(f"Dialects '{folders}' are not unique")
+
+        stg = self._get_typed_schema(table_type="staging").renamed(
+            self._build_name(table=table_name, table_type="staging"))
+        his = self._get_typed_schema(table_type="history").renamed(
+            self._build_name(table=table_name, table_type="history"))
+        compile_dialect = partial(compile_blueprint,
+                                  stg,
+                                  his,
+                                  logical_pk,
+                                  load_strategy,
+                                  headroom=self._narrow_headroom(),
+                                  physical_design=self._physical_design,
+                                  hash_diff=self._hash_diff,
+                                  load_mode=self._load_mode,
+                                  join_updates=self._join_updates,
+                                  tableload_row=self._tableload_row)
+        if workers and workers > 1 and len(dialects) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                compiled = list(executor.map(compile_dialect, dialects))
+        else:
+            compiled = [compile_dialect(d) for d in dialects]
+
+        saved = {}
+        for folder, files in zip(folders, compiled):
+            dpath = tpath / folder
+            dpath.mkdir(exist_ok=True)
+            for fname, subdir, content in files:
+                self._save_file(path=dpath,
+                                fname=fname,
+                                content=content,
+                                subdir=subdir)
+            saved[folder] = [fname for fname, _, _ in files]
+        for dialect in dialects:
+            dialect = resolve_dialect(dialect=dialect)
+            steps = load_steps(dialect=dialect,
+                               hash_diff=(self._hash_diff and
+                                          has_row_hash(dialect)),
+                               load_mode=self._load_mode)
+            for table, dependency in dml_dependencies(his.name, steps):
+                self._Dag.addTable(table, dependency)
+        return saved
 
     def _get_sqa_table(self,
                        table_name: str,
@@ -485,29 +1869,68 @@ class FileInspector(object):
                        schema: str = None,
                        database: str = None,
                        dtype=None
-                       ) -> None:
+                       ) -> Table:
         """
         Method that extracts sqa table object
         """
-        self._load_df_if_empty()
-        pandas_sql = pandasSQL_builder(con=self._con)
-
-        sqllite = False
-        if not isinstance(pandas_sql, SQLDatabase):
-            sqllite = True
-
-        pd_db = SQLDatabase(engine=self._con)
-        table_klass = SQLTable if not sqllite else SQLiteTable
-        target_frame = (self._data if table_type == "staging"
-                        else self._his_data)
         target_name = self._build_name(table=table_name, table_type=table_type)
-        table = table_klass(
+        return self._get_typed_schema(table_type=table_type).to_table(
             name=target_name,
-            pandas_sql_engine=pd_db,
-            index=False,
-            frame=target_frame
-        )
-        return table._create_table_setup()
+            dtype=dtype,
+            headroom=self._narrow_headroom(),
+            dialect=self._dialect)
+
+    def _get_typed_schema(self, table_type: str) -> TableSchema:
+        """
+        Instance method that returns the schema of the staging or
+        history table
+        :param table_type: {'staging', 'history'}
+        """
+        if table_type == "staging":
+            return self._with_row_hash(self.get_table_schema())
+        self._add_scd2_attributes()
+        return self._his_schema
+
+    def _with_row_hash(self, table_schema: TableSchema) -> TableSchema:
+        """
+        Instance method that adds the ROW_HASH column of the hash diff
+        mode to a staging table schema
+        """
+        if not self._hash_diff:
+            return table_schema
+        return table_schema.with_columns([ColumnSchema(name=ROW_HASH,
+                                                       dtype=np.dtype('O'),
+                                                       kind='hash',
+                                                       nullable=True)])
+
+
+def _split_name(qu_name: str) -> tuple:
+    """
+    function that splits a qualified table name into the schema, None
+    without one, and the table name
+    """
+    schema, _, name = qu_name.rpartition('.')
+    return schema or None, name
+
+
+def _schema_table(table_schema: TableSchema) -> Table:
+    """
+    function that returns the table of a schema named by a qualified
+    table name with the schema and table name set separately
+    """
+    schema, name = _split_name(table_schema.name)
+    return table_schema.to_table(name=name, schema=schema)
+
+
+def _inspect_member(options: dict, file) -> tuple:
+    """
+    function that inspects one file of a family. It runs in a worker
+    process and returns the table schema, the detected date formats and
+    the memory report
+    """
+    inspector = FileInspector(file=file, **options)
+    return (inspector.get_table_schema(), inspector._date_formats,
+            inspector._memory_report)
 
 
 if __name__ == "__main__":
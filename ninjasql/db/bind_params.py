@@ -0,0 +1,35 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.types import DateTime
+
+# dates of a load, the same names as the jinja placeholders
+DATE_PARAMS = ['batch_date', 'validfrom_date', 'validto_date',
+               'offset_validto_date']
+
+
+class DateParam(ColumnElement):
+    """
+    Named bind parameter of a load date. It is rendered as placeholder
+    of the dialect paramstyle even if all other values of the statement
+    are rendered as literals
+    """
+    type = DateTime()
+    # the name is no part of a cache key, so the statement cache of
+    # sqlalchemy 1.4 must not reuse the SQL of another date
+    inherit_cache = False
+
+    def __init__(self, name: str):
+        if name not in DATE_PARAMS:
+            params = ' ,'.join(DATE_PARAMS)
+            raise ValueError(f"Invalid date parameter. Allowed are: "
+                             f"'{params}'")
+        self.name = name
+
+
+@compiles(DateParam)
+def _date_param(element, compiler, **kw):
+    # the compiler keeps the names in the order of their placeholders
+    if not hasattr(compiler, 'date_params'):
+        compiler.date_params = []
+    compiler.date_params.append(element.name)
+    return compiler.bindtemplate % {'name': element.name}
@@ -0,0 +1,192 @@
+from sqlalchemy.schema import CreateTable
+
+from ninjasql.db.dialects import resolve_dialect
+from ninjasql.db.indexes import table_index, index_ddl
+from ninjasql.db.physical import physical_ddl
+from ninjasql.db.row_hash import ROW_HASH, has_row_hash
+from ninjasql.db.sqa_dml_extractor import (
+    SqaExtractor,
+    MATERIALIZED_VIEWS,
+    merge_by_source)
+from ninjasql.db.sqa_table_loads import get_sqa_tableload
+from ninjasql.db.table_schema import TableSchema
+
+# scd2 steps in load order: file prefix and SqaExtractor method
+SCD2_STEPS = [
+    ('scd2_1', 'scd2_new_insert'),
+    ('scd2_2', 'scd2_updated_insert'),
+    ('scd2_3', 'scd2_updated_update'),
+    ('scd2_4', 'scd2_deleted_update'),
+]
+# load modes: four scd2 steps or the fewest statements of the dialect
+LOAD_MODES = ['steps', 'merge']
+# merge mode steps of dialects with MERGE, with WHEN NOT MATCHED BY
+# SOURCE and of all other dialects
+MERGE_STEPS = [
+    ('scd2_1', 'scd2_merge'),
+    ('scd2_2', 'scd2_deleted_update'),
+]
+MERGE_BY_SOURCE_STEPS = [
+    ('scd2_1', 'scd2_merge'),
+]
+NO_MERGE_STEPS = [
+    ('scd2_1', 'scd2_missing_insert'),
+    ('scd2_2', 'scd2_updated_update'),
+    ('scd2_3', 'scd2_deleted_update'),
+]
+# hash diff step that hashes the staging records before the scd2 steps
+ROW_HASH_STEPS = [
+    ('scd2_0', 'scd2_row_hash'),
+]
+# current snapshot kinds and their maintenance steps after the scd2 steps
+CURRENT_SNAPSHOTS = ['table', 'view']
+CURRENT_TABLE_STEPS = [
+    ('scd2_5', 'scd2_current_delete'),
+    ('scd2_6', 'scd2_current_insert'),
+]
+CURRENT_VIEW_STEPS = [
+    ('scd2_5', 'scd2_current_refresh'),
+]
+
+
+def scd2_steps(load_mode: str = 'steps', dialect=None) -> list:
+    """
+    function that returns the scd2 steps of a load mode. The merge mode
+    loads with one MERGE where the dialect has one. postgresql needs the
+    server version of a connection, 15 or later. All other dialects insert
+    the new records and versions in one statement, then close the changed
+    and deleted records
+    """
+    if load_mode not in LOAD_MODES:
+        modes = ' ,'.join(LOAD_MODES)
+        raise ValueError(f"Invalid load mode. Allowed are: '{modes}'")
+    if load_mode == 'steps':
+        return SCD2_STEPS
+    by_source = merge_by_source(dialect)
+    if by_source is None:
+        return NO_MERGE_STEPS
+    return MERGE_BY_SOURCE_STEPS if by_source else MERGE_STEPS
+
+
+def load_steps(current_snapshot: str = None,
+               dialect=None,
+               hash_diff: bool = False,
+               load_mode: str = 'steps') -> list:
+    """
+    function that returns the DML steps of a load including the row
+    hash of the hash diff mode and the maintenance of the current
+    snapshot. A materialized view the database maintains itself needs
+    no step
+    """
+    steps = scd2_steps(load_mode=load_mode, dialect=dialect)
+    if hash_diff:
+        steps = ROW_HASH_STEPS + steps
+    if current_snapshot == 'table':
+        return steps + CURRENT_TABLE_STEPS
+    if current_snapshot == 'view' and \
+            MATERIALIZED_VIEWS.get(getattr(dialect, 'name', None)):
+        return steps + CURRENT_VIEW_STEPS
+    return steps
+
+
+def dml_files(extractor: SqaExtractor,
+              load_strategy: str,
+              steps: list = SCD2_STEPS) -> list:
+    """
+    function that returns the scd2 DML files of an extractor as list of
+    (file name, subdir, content) in load order. A current snapshot table
+    also gets the insert that fills it initially, it is run once
+    :param steps: DML steps of the load, see load_steps
+    """
+    base_name = extractor.get_hist_table_name()
+    files = [(f"{prefix}_{base_name}", 'DML', getattr(extractor, method)())
+             for prefix, method in steps]
+    if all(step in steps for step in CURRENT_TABLE_STEPS):
+        files.append((f"INITIAL_CURRENT_{base_name}", 'DML',
+                      extractor.scd2_current_initial_insert()))
+    if load_strategy == 'database_table':
+        files.append((f"{base_name}_INSERT_TABLELOAD", 'DML',
+                      extractor.get_tableload_insert()))
+    return files
+
+
+def dml_dependencies(base_name: str, steps: list = SCD2_STEPS) -> list:
+    """
+    function that returns the (file, depends on file) pairs of the
+    scd2 DML files
+    """
+    names = [f"{prefix}_{base_name}.sql" for prefix, _ in steps]
+    return list(zip(names[1:], names[:-1]))
+
+
+def compile_blueprint(staging: TableSchema,
+                      history: TableSchema,
+                      logical_pk: list,
+                      load_strategy: str,
+                      dialect,
+                      headroom: float = None,
+                      physical_design: bool = False,
+                      hash_diff: bool = False,
+                      load_mode: str = 'steps',
+                      join_updates: bool = False,
+                      tableload_row: bool = False) -> list:
+    """
+    function that compiles the staging and history DDL, their index DDL
+    and all scd2 DMLs of the table schemas for a dialect. It needs no
+    connection and only picklable arguments, so it can run in a worker
+    process.
+    Returns a list of (file name, subdir, content)
+    :param staging: Staging table schema, its name is the table name
+    :param history: History table schema, its name is the table name
+    :param dialect: Dialect name or sqlalchemy dialect instance
+    :param headroom: Headroom of narrow types or None for default types
+    :param physical_design: Add the physical design of the dialect to
+    the DDL, see ninjasql.db.physical
+    :param hash_diff: Detect changes by the ROW_HASH column of the
+    schemas, see ninjasql.db.row_hash. Dialects without a hash function
+    get tables without it and compare every column
+    :param load_mode: {steps, merge} see scd2_steps
+    :param join_updates: Join the staging table in the updates, see
+    SqaExtractor
+    :param tableload_row: Join the table load dates as one derived row,
+    see SqaExtractor
+    """
+    dialect = resolve_dialect(dialect=dialect)
+    if hash_diff and not has_row_hash(dialect):
+        staging = staging.without_columns([ROW_HASH])
+        history = history.without_columns([ROW_HASH])
+        hash_diff = False
+    files = []
+    for table_type, schema in (('staging', staging), ('history', history)):
+        table = schema.to_table(headroom=headroom, dialect=dialect)
+        if physical_design:
+            ddl = physical_ddl(table=table,
+                               logical_pk=logical_pk,
+                               table_type=table_type,
+                               dialect=dialect)
+        else:
+            ddl = str(CreateTable(table).compile(dialect=dialect))
+        files.append((schema.name, 'DDL', ddl))
+        index = table_index(table=table,
+                            logical_pk=logical_pk,
+                            table_type=table_type,
+                            dialect=dialect)
+        files.append((f"INDEX_{schema.name}", 'DDL',
+                      index_ddl(index, dialect)))
+    extractor = SqaExtractor(staging_table=staging,
+                             history_table=history,
+                             logical_pk=logical_pk,
+                             con=None,
+                             load_strategy=load_strategy,
+                             dialect=dialect,
+                             hash_diff=hash_diff,
+                             join_updates=join_updates,
+                             tableload_row=tableload_row)
+    files.extend(dml_files(extractor, load_strategy,
+                           load_steps(dialect=dialect,
+                                      hash_diff=hash_diff,
+                                      load_mode=load_mode)))
+    if load_strategy == 'database_table':
+        files.append(("JOBTABLE_TABLELOAD", 'DDL',
+                      get_sqa_tableload(dialect=dialect)))
+    return files
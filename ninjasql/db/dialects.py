@@ -0,0 +1,32 @@
+from sqlalchemy.engine import Dialect
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.exc import ArgumentError
+
+
+def load_dialect(name: str) -> Dialect:
+    """
+    function that returns a dialect instance of a dialect name like
+    postgresql, mysql+pymysql, mssql or snowflake without creating an
+    engine. The database driver does not need to be installed
+    """
+    try:
+        return make_url(f"{name}://").get_dialect()()
+    except ArgumentError as e:
+        raise ValueError(f"Unknown dialect: '{name}'. Error: {e}")
+
+
+def resolve_dialect(con=None, dialect=None) -> Dialect:
+    """
+    function that returns the dialect to compile statements with.
+    A given dialect wins over the dialect of the connection
+    :param con: Sqlalchemy engine or connection or a database url
+    :param dialect: Dialect name or sqlalchemy dialect instance
+    Returns None if neither is given
+    """
+    if dialect is not None:
+        if isinstance(dialect, Dialect):
+            return dialect
+        return load_dialect(dialect)
+    if isinstance(con, str):
+        return make_url(con).get_dialect()()
+    return getattr(con, 'dialect', None)
@@ -0,0 +1,81 @@
+import hashlib
+from sqlalchemy import Index
+from sqlalchemy.sql.schema import Table
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.dialects import sqlite
+
+# scd2 column every DML filters the current history rows on
+VALID_TO_COLUMN = 'VALID_TO_DATE'
+# identifier length of dialects that do not tell it
+MAX_NAME_LENGTH = 63
+
+
+def index_name(table_name: str, suffix: str, dialect=None) -> str:
+    """
+    function that returns the index name of a table. Names longer than
+    the dialect allows are cut and get a hash of the full name
+    """
+    name = f"ix_{table_name.replace('.', '_')}_{suffix}"
+    limit = getattr(dialect, 'max_identifier_length', None) or \
+        MAX_NAME_LENGTH
+    if len(name) > limit:
+        digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]
+        name = f"{name[:limit - 9]}_{digest}"
+    return name
+
+
+def _index(table: Table, columns: list, suffix: str, dialect=None) -> Index:
+    """
+    function that builds an index of the table columns. The index is
+    part of the table and is created with it
+    """
+    missing = [c for c in columns if c not in table.c]
+    if missing:
+        raise ValueError(f"Index columns {missing} are not in table "
+                         f"{table.name}")
+    return Index(index_name(table.name, suffix, dialect),
+                 *[table.c[c] for c in columns])
+
+
+def staging_index(table: Table, logical_pk: list, dialect=None) -> Index:
+    """
+    function that returns the index of the logical primary key of the
+    staging table. The scd2 DMLs join the history table on it
+    """
+    return _index(table, list(logical_pk), 'pk', dialect)
+
+
+def history_index(table: Table, logical_pk: list, dialect=None) -> Index:
+    """
+    function that returns the composite index (logical_pk..., VALID_TO_DATE)
+    of the history table. The scd2 DMLs look up the current rows of a
+    key with it
+    """
+    return _index(table, list(logical_pk) + [VALID_TO_COLUMN], 'pk_valid_to',
+                  dialect)
+
+
+def table_index(table: Table,
+                logical_pk: list,
+                table_type: str,
+                dialect=None) -> Index:
+    """
+    function that returns the index of the staging or history table
+    :param table_type: {'staging', 'history'}
+    """
+    if table_type == 'history':
+        return history_index(table, logical_pk, dialect)
+    return staging_index(table, logical_pk, dialect)
+
+
+def index_ddl(index: Index, dialect=None, if_not_exists: bool = False) -> str:
+    """
+    function that compiles the CREATE INDEX statement. Without a dialect
+    it is compiled for sqlite like the pandas fallback DDL
+    :param if_not_exists: Skip an existing index (sqlite and postgresql)
+    """
+    dialect = dialect or sqlite.dialect()
+    ddl = str(CreateIndex(index).compile(dialect=dialect))
+    if if_not_exists:
+        ddl = ddl.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1)
+    return ddl
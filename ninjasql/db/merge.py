@@ -0,0 +1,75 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Merge(Executable, ClauseElement):
+    """
+    MERGE of a source alias into a target table. Matched target rows
+    with the matched condition get the update values, source rows
+    without a target row are inserted. With a by source condition the
+    target rows without a source row get the by source values
+    :param target: Sqa Table of the MERGE INTO
+    :param source: Alias of the select of the USING
+    :param on: Condition of the ON
+    :param matched: Condition of WHEN MATCHED AND
+    :param update: dict of target column name and value of the update
+    :param insert: dict of target column name and value of the insert
+    :param by_source: Condition of WHEN NOT MATCHED BY SOURCE AND
+    :param by_source_update: dict of target column name and value of the
+    update of the target rows without a source row
+    """
+    # the statement is built for every compile, so it is never cached
+    inherit_cache = False
+
+    def __init__(self,
+                 target,
+                 source,
+                 on,
+                 matched,
+                 update: dict,
+                 insert: dict,
+                 by_source=None,
+                 by_source_update: dict = None):
+        self.target = target
+        self.source = source
+        self.on = on
+        self.matched = matched
+        self.update = update
+        self.insert = insert
+        self.by_source = by_source
+        self.by_source_update = by_source_update
+
+
+def _assignments(values: dict, compiler, **kw) -> str:
+    return ', '.join(f"{compiler.preparer.quote(name)}="
+                     f"{compiler.process(value, **kw)}"
+                     for name, value in values.items())
+
+
+@compiles(Merge)
+def _merge(element, compiler, **kw):
+    preparer = compiler.preparer
+    columns = ', '.join(preparer.quote(name) for name in element.insert)
+    values = ', '.join(compiler.process(value, **kw)
+                       for value in element.insert.values())
+    stmt = (f"MERGE INTO {preparer.format_table(element.target)} USING (\n"
+            f"{compiler.process(element.source.element, **kw)}\n) AS "
+            f"{preparer.format_alias(element.source)}\n"
+            f"ON {compiler.process(element.on, **kw)}\n"
+            f"WHEN MATCHED AND {compiler.process(element.matched, **kw)} "
+            f"THEN\n"
+            f"UPDATE SET {_assignments(element.update, compiler, **kw)}\n"
+            f"WHEN NOT MATCHED THEN\n"
+            f"INSERT ({columns}) VALUES ({values})")
+    if element.by_source is not None:
+        stmt += (f"\nWHEN NOT MATCHED BY SOURCE AND "
+                 f"{compiler.process(element.by_source, **kw)} THEN\n"
+                 f"UPDATE SET "
+                 f"{_assignments(element.by_source_update, compiler, **kw)}")
+    return stmt
+
+
+@compiles(Merge, 'mssql')
+def _merge_mssql(element, compiler, **kw):
+    # a MERGE must be terminated by a semicolon
+    return f"{_merge(element, compiler, **kw)};"
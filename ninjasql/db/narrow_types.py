@@ -0,0 +1,100 @@
+import math
+import numpy as np
+from sqlalchemy.types import (
+    VARCHAR,
+    SmallInteger,
+    Integer,
+    BigInteger,
+    Numeric)
+
+# share of headroom on top of the observed string lengths, integer
+# ranges and integer digits of decimals
+HEADROOM = 0.2
+# largest decimal precision most dialects support
+MAX_PRECISION = 38
+# longest VARCHAR of a dialect. Longer strings stay TEXT
+VARCHAR_LIMITS = {
+    'mssql': 8000,
+    'oracle': 4000,
+    'mysql': 16383,
+    'redshift': 65535,
+    'snowflake': 16777216,
+}
+
+_INT_RANGES = [
+    (np.iinfo(np.int16), SmallInteger),
+    (np.iinfo(np.int32), Integer),
+    (np.iinfo(np.int64), BigInteger),
+]
+
+
+def _grow(value, headroom: float):
+    """
+    function that adds the headroom to a value away from zero
+    """
+    return value * (1 + headroom)
+
+
+def integer_type(low: int, high: int, headroom: float = HEADROOM):
+    """
+    function that returns the smallest integer type that holds the
+    range with headroom. Returns None if it does not fit into 64 bit
+    """
+    low, high = _grow(low, headroom), _grow(high, headroom)
+    for info, type_ in _INT_RANGES:
+        if info.min <= low and high <= info.max:
+            return type_()
+    return None
+
+
+def string_type(max_bytes: int, headroom: float = HEADROOM, dialect=None):
+    """
+    function that returns a VARCHAR that holds the longest string with
+    headroom. The byte length is an upper bound of the characters.
+    Returns None if it is longer than the dialect allows
+    """
+    length = max(1, math.ceil(max_bytes * (1 + headroom)))
+    limit = VARCHAR_LIMITS.get(getattr(dialect, 'name', None))
+    if limit is not None and length > limit:
+        return None
+    return VARCHAR(length)
+
+
+def decimal_type(low: float,
+                 high: float,
+                 scale: int,
+                 headroom: float = HEADROOM):
+    """
+    function that returns a DECIMAL(p, s) that holds all values with
+    headroom on the integer digits. Returns None if the precision is
+    larger than MAX_PRECISION
+    """
+    largest = int(max(abs(low), abs(high)))
+    digits = len(str(largest)) if largest else 1
+    digits += math.ceil(digits * headroom)
+    if digits + scale > MAX_PRECISION:
+        return None
+    return Numeric(precision=digits + scale, scale=scale)
+
+
+def narrow_type(stats: dict, headroom: float = HEADROOM, dialect=None):
+    """
+    function that returns the narrowest safe SQL type of a column from
+    its value statistics (see ninjasql.infer.stats). Float columns that
+    only hold whole numbers get an integer type. Returns None if the
+    statistics do not allow a narrow type
+    :param stats: value statistics of the column
+    :param headroom: Share of headroom on top of the observed values
+    :param dialect: Target sqlalchemy dialect
+    """
+    kind = stats.get('kind')
+    if kind == 'string' and 'max_bytes' in stats:
+        return string_type(stats['max_bytes'], headroom, dialect)
+    if kind not in ('integer', 'floating') or 'min' not in stats:
+        return None
+    if stats.get('scale') == 0:
+        return integer_type(stats['min'], stats['max'], headroom)
+    if stats.get('scale') is None:
+        return None
+    return decimal_type(stats['min'], stats['max'], stats['scale'],
+                        headroom)
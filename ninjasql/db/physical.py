@@ -0,0 +1,215 @@
+from sqlalchemy import MetaData, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.schema import Table
+from sqlalchemy.schema import CreateTable, CreateColumn
+from sqlalchemy.types import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    LargeBinary,
+    Numeric,
+    String)
+
+from ninjasql.db.indexes import VALID_TO_COLUMN, index_name
+from ninjasql.db.sqa_table_loads import HIGH_DATE, LiteralDateTime
+
+# info keys of the compression encoding of a column and of the clause
+# after the column list of a table
+ENCODE_INFO = 'ninjasql_encode'
+SUFFIX_INFO = 'ninjasql_suffix'
+# first mssql server version with columnstore indexes over VARCHAR(max)
+MSSQL_CCI_MAX_VERSION = (14,)
+
+
+@compiles(CreateColumn)
+def _create_column(element, compiler, **kw):
+    text = compiler.visit_create_column(element, **kw)
+    encode = element.element.info.get(ENCODE_INFO)
+    if text is None or encode is None:
+        return text
+    return f"{text} ENCODE {encode}"
+
+
+@compiles(CreateTable)
+def _create_table_suffix(element, compiler, **kw):
+    text = compiler.visit_create_table(element, **kw)
+    suffix = element.element.info.get(SUFFIX_INFO)
+    if not suffix:
+        return text
+    body = text.rstrip()
+    return f"{body}{suffix}{text[len(body):]}"
+
+
+def column_encoding(type_) -> str:
+    """
+    function that returns the redshift compression encoding of a column
+    type. AZ64 supports integers, decimals, dates and timestamps
+    """
+    if isinstance(type_, Boolean):
+        return 'RAW'
+    if isinstance(type_, Float):
+        return 'ZSTD'
+    if isinstance(type_, (Integer, Numeric, Date, DateTime)):
+        return 'AZ64'
+    if isinstance(type_, String):
+        return 'ZSTD'
+    return 'RAW'
+
+
+def sort_columns(logical_pk: list, table_type: str) -> list:
+    """
+    function that returns the columns the scd2 DMLs look up rows on
+    """
+    if table_type == 'history':
+        return list(logical_pk) + [VALID_TO_COLUMN]
+    return list(logical_pk)
+
+
+def _column_list(columns: list, dialect) -> str:
+    """
+    function that returns the quoted and comma separated columns
+    """
+    preparer = dialect.identifier_preparer
+    return ', '.join(preparer.quote(c) for c in columns)
+
+
+def _copy_table(table: Table) -> Table:
+    """
+    function that copies a table, so the physical design options never
+    change the table of the caller
+    """
+    # to_metadata is the sqlalchemy 1.4 name of tometadata
+    copy = getattr(table, 'to_metadata', None) or table.tometadata
+    return copy(MetaData())
+
+
+def _create_table(table: Table, dialect, encodings: dict = None,
+                  suffix: str = '') -> str:
+    """
+    function that compiles the CREATE TABLE statement with a compression
+    encoding per column and a clause after the column list
+    """
+    table = _copy_table(table)
+    for column in table.c:
+        if encodings:
+            column.info[ENCODE_INFO] = encodings[column.name]
+    table.info[SUFFIX_INFO] = suffix
+    return str(CreateTable(table).compile(dialect=dialect))
+
+
+def _high_date(dialect) -> str:
+    """
+    function that returns the literal of the VALID_TO_DATE of the current
+    rows, the date the table load writes
+    """
+    return str(literal(HIGH_DATE, LiteralDateTime()).compile(
+        dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _redshift(table, logical_pk, table_type, dialect) -> list:
+    """
+    function that distributes the table on the first key column and sorts
+    it on the lookup columns. The leading sort column is not compressed
+    """
+    columns = sort_columns(logical_pk, table_type)
+    encodings = {c.name: column_encoding(c.type) for c in table.c}
+    encodings[columns[0]] = 'RAW'
+    suffix = (f"\nDISTKEY ({_column_list(columns[:1], dialect)})"
+              f"\nSORTKEY ({_column_list(columns, dialect)})")
+    return [_create_table(table, dialect, encodings, suffix)]
+
+
+def _snowflake(table, logical_pk, table_type, dialect) -> list:
+    """
+    function that clusters the history table on VALID_TO_DATE first, it
+    has few distinct values, then on the key columns
+    """
+    if table_type != 'history':
+        return [_create_table(table, dialect)]
+    columns = [VALID_TO_COLUMN] + list(logical_pk)
+    suffix = f"\nCLUSTER BY ({_column_list(columns, dialect)})"
+    return [_create_table(table, dialect, suffix=suffix)]
+
+
+def _postgresql(table, logical_pk, table_type, dialect) -> list:
+    """
+    function that list partitions the history table on VALID_TO_DATE in
+    a small partition of the current rows and one of the closed rows
+    """
+    if table_type != 'history':
+        return [_create_table(table, dialect)]
+    preparer = dialect.identifier_preparer
+    column = preparer.quote(VALID_TO_COLUMN)
+    name = preparer.format_table(table)
+    current = preparer.quote(f"{table.name}_current")
+    closed = preparer.quote(f"{table.name}_closed")
+    partitioned = _copy_table(table)
+    partitioned.dialect_options['postgresql']['partition_by'] = \
+        f"LIST ({column})"
+    return [str(CreateTable(partitioned).compile(dialect=dialect)),
+            f"CREATE TABLE {current} PARTITION OF {name} "
+            f"FOR VALUES IN ({_high_date(dialect)})",
+            f"CREATE TABLE {closed} PARTITION OF {name} DEFAULT"]
+
+
+def _has_max_columns(table: Table) -> bool:
+    """
+    function that returns True if a column is VARCHAR(max) or
+    VARBINARY(max) on mssql
+    """
+    return any(isinstance(c.type, (String, LargeBinary)) and
+               getattr(c.type, 'length', None) is None for c in table.c)
+
+
+def _mssql(table, logical_pk, table_type, dialect) -> list:
+    """
+    function that stores the history table as clustered columnstore.
+    Columnstore indexes over VARCHAR(max) columns need SQL Server 2017,
+    without the server version of a connection such a table gets none
+    """
+    if table_type != 'history':
+        return [_create_table(table, dialect)]
+    version = getattr(dialect, 'server_version_info', None)
+    if _has_max_columns(table) and \
+            (not version or tuple(version) < MSSQL_CCI_MAX_VERSION):
+        return [_create_table(table, dialect)]
+    preparer = dialect.identifier_preparer
+    name = preparer.quote(index_name(table.name, 'cci', dialect))
+    return [_create_table(table, dialect),
+            f"CREATE CLUSTERED COLUMNSTORE INDEX {name} "
+            f"ON {preparer.format_table(table)}"]
+
+
+_DESIGNS = {
+    'redshift': _redshift,
+    'snowflake': _snowflake,
+    'postgresql': _postgresql,
+    'mssql': _mssql,
+}
+
+
+def physical_ddl(table: Table,
+                 logical_pk: list,
+                 table_type: str,
+                 dialect) -> str:
+    """
+    function that compiles the CREATE TABLE statement with the physical
+    design of the dialect derived from the logical primary key and the
+    scd2 columns. Statements after the CREATE TABLE are separated by
+    semicolons. Dialects without a physical design or without a logical
+    primary key get the plain DDL
+    :param table_type: {'staging', 'history'}
+    """
+    design = _DESIGNS.get(dialect.name)
+    if design is None or not logical_pk:
+        return str(CreateTable(table).compile(dialect=dialect))
+    missing = [c for c in sort_columns(logical_pk, table_type)
+               if c not in table.c]
+    if missing:
+        raise ValueError(f"Columns {missing} are not in table {table.name}")
+    statements = design(table, logical_pk, table_type, dialect)
+    if len(statements) == 1:
+        return statements[0]
+    return ';\n\n'.join(s.strip() for s in statements) + ';'
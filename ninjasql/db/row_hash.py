@@ -0,0 +1,118 @@
+from sqlalchemy import String, CHAR, case, literal
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# column of the row hash in the staging and history table
+ROW_HASH = 'ROW_HASH'
+# hex digits of a sha256 hash
+HASH_LENGTH = 64
+# separator of the column texts in the hash input
+SEPARATOR = '|'
+# text of NULL and prefix of all other values in the hash input, so NULL
+# and an empty text get different hashes
+NULL_MARKER = 'N'
+VALUE_MARKER = 'V'
+# dialects without a hash function. Their loads compare every column
+NO_HASH_DIALECTS = ['sqlite']
+
+
+class HashText(FunctionElement):
+    """
+    Text of a column value in the hash input. Every dialect renders
+    numbers and timestamps with all digits
+    """
+    type = String()
+    name = 'hash_text'
+    inherit_cache = True
+
+
+class RowHash(FunctionElement):
+    """
+    sha256 hex digest of a text expression
+    """
+    type = CHAR(HASH_LENGTH)
+    name = 'row_hash'
+    inherit_cache = True
+
+
+@compiles(HashText)
+def _hash_text(element, compiler, **kw):
+    return f"CAST({compiler.process(element.clauses, **kw)} AS VARCHAR)"
+
+
+@compiles(HashText, 'mysql')
+def _hash_text_mysql(element, compiler, **kw):
+    return f"CAST({compiler.process(element.clauses, **kw)} AS CHAR)"
+
+
+@compiles(HashText, 'mssql')
+def _hash_text_mssql(element, compiler, **kw):
+    # style 126 keeps the fractional seconds of timestamps and all
+    # digits of floats, it is ignored for all other types
+    return (f"CONVERT(NVARCHAR(MAX), "
+            f"{compiler.process(element.clauses, **kw)}, 126)")
+
+
+@compiles(HashText, 'oracle')
+def _hash_text_oracle(element, compiler, **kw):
+    return f"TO_CHAR({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(RowHash)
+def _row_hash(element, compiler, **kw):
+    return f"SHA2({compiler.process(element.clauses, **kw)}, 256)"
+
+
+@compiles(RowHash, 'postgresql')
+def _row_hash_postgresql(element, compiler, **kw):
+    return (f"encode(sha256(convert_to("
+            f"{compiler.process(element.clauses, **kw)}, 'UTF8')), 'hex')")
+
+
+@compiles(RowHash, 'mssql')
+def _row_hash_mssql(element, compiler, **kw):
+    return (f"CONVERT(CHAR({HASH_LENGTH}), HASHBYTES('SHA2_256', "
+            f"{compiler.process(element.clauses, **kw)}), 2)")
+
+
+@compiles(RowHash, 'oracle')
+def _row_hash_oracle(element, compiler, **kw):
+    return (f"LOWER(RAWTOHEX(STANDARD_HASH("
+            f"{compiler.process(element.clauses, **kw)}, 'SHA256')))")
+
+
+@compiles(RowHash, 'sqlite')
+def _row_hash_sqlite(element, compiler, **kw):
+    raise CompileError("sqlite has no hash function for the row hash")
+
+
+def has_row_hash(dialect) -> bool:
+    """
+    function that returns True if the dialect can compile the row hash
+    """
+    return getattr(dialect, 'name', dialect) not in NO_HASH_DIALECTS
+
+
+def _hash_part(column):
+    """
+    function that returns the text of a column in the hash input, the
+    NULL marker or the value marker and the value
+    """
+    return case([(column.is_(None), literal(NULL_MARKER))],
+                else_=literal(VALUE_MARKER) + HashText(column))
+
+
+def row_hash(columns: list):
+    """
+    function that returns the sha256 hash expression of the columns.
+    The texts of the values are joined with a separator, NULL and an
+    empty text are told apart by a marker
+    """
+    if not columns:
+        raise ValueError("A row hash needs at least one column")
+    parts = [_hash_part(c) for c in columns]
+    expr = parts[0]
+    for part in parts[1:]:
+        expr = expr + literal(SEPARATOR) + part
+    return RowHash(expr)
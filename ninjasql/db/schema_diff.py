@@ -0,0 +1,182 @@
+import logging
+from sqlalchemy import inspect
+from sqlalchemy.sql.schema import Table
+from sqlalchemy.types import (
+    Integer,
+    SmallInteger,
+    BigInteger,
+    String,
+    Text,
+    Numeric,
+    Float,
+    Date,
+    DateTime)
+
+log = logging.getLogger(__name__)
+
+# ALTER TABLE clauses of dialects that differ from the SQL standard
+ADD_COLUMN = {
+    'mssql': 'ADD {column}',
+    'oracle': 'ADD ({column})',
+}
+ALTER_TYPE = {
+    'mssql': 'ALTER COLUMN {column} {type}',
+    'mysql': 'MODIFY COLUMN {column} {type}',
+    'oracle': 'MODIFY ({column} {type})',
+}
+DEFAULT_ADD_COLUMN = 'ADD COLUMN {column}'
+DEFAULT_ALTER_TYPE = 'ALTER COLUMN {column} TYPE {type}'
+# dialects that can not change the type of a column. Their column
+# types are only advisory, every value fits into every column
+NO_ALTER_TYPE = ['sqlite']
+
+# decimal digits of the integer types
+_INT_DIGITS = [(SmallInteger, 5), (BigInteger, 19), (Integer, 10)]
+
+
+def reflect_columns(con, table_name: str, schema: str = None) -> dict:
+    """
+    function that reflects the columns of an existing table as dict of
+    column name to sqlalchemy type. Returns None if the table does not
+    exist
+    """
+    insp = inspect(con)
+    if table_name not in insp.get_table_names(schema=schema):
+        return None
+    return {c['name']: c['type'] for c in insp.get_columns(table_name,
+                                                           schema=schema)}
+
+
+def _int_digits(type_) -> int:
+    """
+    function that returns the decimal digits an integer type holds
+    """
+    for cls, digits in _INT_DIGITS:
+        if isinstance(type_, cls):
+            return digits
+    return 10
+
+
+def _widened_text(new, old):
+    """
+    function that widens a column where old or new is a text type
+    """
+    if not isinstance(old, String):
+        return new
+    if not isinstance(new, String) or old.length is None:
+        return None
+    if new.length is None or new.length > old.length:
+        return new
+    return None
+
+
+def _decimal_digits(type_) -> tuple:
+    """
+    function that returns the integer digits and the scale of a numeric
+    type
+    """
+    if isinstance(type_, Integer):
+        return _int_digits(type_), 0
+    scale = type_.scale or 0
+    return (type_.precision or 0) - scale, scale
+
+
+def _widened_number(new, old):
+    """
+    function that widens a numeric column. Floats hold every number,
+    integers and decimals widen to the decimal that holds the digits
+    and the scale of both
+    """
+    if isinstance(old, Integer) and isinstance(new, Integer):
+        return new if _int_digits(new) > _int_digits(old) else None
+    if isinstance(old, Float):
+        return None
+    if isinstance(new, Float):
+        return new
+    old_digits, old_scale = _decimal_digits(old)
+    new_digits, new_scale = _decimal_digits(new)
+    digits = max(old_digits, new_digits)
+    scale = max(old_scale, new_scale)
+    if digits == old_digits and scale == old_scale:
+        return None
+    return Numeric(precision=digits + scale, scale=scale)
+
+
+def _widened_temporal(new, old):
+    """
+    function that widens a date column to a timestamp column
+    """
+    if isinstance(old, Date) and isinstance(new, DateTime):
+        return new
+    return None
+
+
+# old types, new types and the function that widens them
+_WIDENINGS = [
+    ((Integer, Numeric), (Integer, Numeric), _widened_number),
+    ((Date, DateTime), (Date, DateTime), _widened_temporal),
+]
+
+
+def widened_type(new, old):
+    """
+    function that returns the type an existing column of type old needs
+    to hold the values of the new type. Returns None if old already
+    holds them. Types are only widened, never narrowed
+    """
+    if isinstance(old, String) or isinstance(new, String):
+        return _widened_text(new, old)
+    for old_types, new_types, widen in _WIDENINGS:
+        if isinstance(old, old_types) and isinstance(new, new_types):
+            return widen(new, old)
+    if old._type_affinity is new._type_affinity:
+        return None
+    # unrelated types, only a text column holds both
+    return Text()
+
+
+def diff_table(table: Table, existing: dict) -> dict:
+    """
+    function that compares a table with the reflected columns of the
+    existing table. Columns of the existing table that are missing in
+    table are kept. Returns {'add': [Column], 'alter': [(Column, type)]}
+    :param existing: dict of column name to type, see reflect_columns
+    """
+    lower = {name.lower(): type_ for name, type_ in existing.items()}
+    diff = {'add': [], 'alter': []}
+    for column in table.c:
+        old = existing.get(column.name, lower.get(column.name.lower()))
+        if old is None:
+            diff['add'].append(column)
+            continue
+        new = widened_type(column.type, old)
+        if new is not None:
+            diff['alter'].append((column, new))
+    return diff
+
+
+def alter_statements(table: Table, diff: dict, dialect) -> list:
+    """
+    function that compiles the ALTER TABLE statements of a table diff
+    for the dialect. Type changes on dialects without typed columns
+    are skipped
+    """
+    preparer = dialect.identifier_preparer
+    ddl_compiler = dialect.ddl_compiler(dialect, None)
+    table_name = preparer.format_table(table)
+    statements = []
+    for column in diff['add']:
+        clause = ADD_COLUMN.get(dialect.name, DEFAULT_ADD_COLUMN)
+        spec = ddl_compiler.get_column_specification(column)
+        statements.append(f"ALTER TABLE {table_name} "
+                          f"{clause.format(column=spec)}")
+    for column, type_ in diff['alter']:
+        if dialect.name in NO_ALTER_TYPE:
+            log.warning(f"Dialect {dialect.name} can not change the type "
+                        f"of column {column.name} of {table.name}")
+            continue
+        clause = ALTER_TYPE.get(dialect.name, DEFAULT_ALTER_TYPE)
+        statements.append(f"ALTER TABLE {table_name} " + clause.format(
+            column=preparer.format_column(column),
+            type=dialect.type_compiler.process(type_)))
+    return statements
@@ -1,19 +1,86 @@
 from sqlalchemy.sql.schema import Table
-from sqlalchemy.sql import exists, and_, select, func, or_, insert
+from sqlalchemy.sql import exists, and_, select, func, or_, insert, update
 from sqlalchemy.sql.functions import now
-from sqlalchemy.sql.expression import literal_column
+from sqlalchemy.sql.expression import literal_column, union_all, cast, null
 from datetime import datetime
 
-from ninjasql.db.sqa_table_loads import TableLoad
+from ninjasql.db.sqa_table_loads import TableLoad, HIGH_DATE
+from ninjasql.db.table_schema import TableSchema
+from ninjasql.db.dialects import resolve_dialect
+from ninjasql.db.row_hash import ROW_HASH, row_hash
+from ninjasql.db.bind_params import DateParam
+from ninjasql.db.merge import Merge
+
+# dialects with materialized views and the statement that refreshes
+# them. None if the database maintains the view itself
+MATERIALIZED_VIEWS = {
+    'postgresql': 'REFRESH MATERIALIZED VIEW {view}',
+    'snowflake': None,
+}
+# dialects whose materialized views can only query a single table. With
+# the dates of the table load table they get a plain view
+SINGLE_TABLE_VIEWS = ['snowflake']
+# dialects with MERGE and if they support WHEN NOT MATCHED BY SOURCE to
+# close the deleted records in the same statement
+MERGE_DIALECTS = {
+    'mssql': True,
+    'postgresql': False,
+    'snowflake': False,
+}
+# first server version with MERGE of the dialects that added it late
+MERGE_VERSIONS = {
+    'postgresql': (15,),
+}
+# dialects with UPDATE ... FROM joins and with UPDATE of a LEFT JOIN for
+# anti-joins. The others plan NOT EXISTS as anti-join themselves
+JOIN_UPDATE_DIALECTS = ['postgresql', 'mssql', 'mysql', 'snowflake',
+                        'redshift']
+ANTI_JOIN_UPDATE_DIALECTS = ['mysql']
+# columns of set_metadata_colums in the history table
+METADATA_COLUMNS = ['UPDATED_AT', 'BATCH_RUN_AT', 'VALID_FROM_DATE',
+                    'VALID_TO_DATE']
+# source column of the MERGE with the offset validto date
+OFFSET_COLUMN = 'OFFSET_VALID_TO_DATE'
+
+
+def merge_by_source(dialect) -> bool:
+    """
+    function that returns if the MERGE of the dialect closes the deleted
+    records with WHEN NOT MATCHED BY SOURCE, or None if the dialect has
+    no MERGE. A dialect that added MERGE late needs the server version
+    of a connection, else it gets no MERGE either
+    """
+    name = getattr(dialect, 'name', None)
+    if name not in MERGE_DIALECTS:
+        return None
+    if name in MERGE_VERSIONS:
+        version = getattr(dialect, 'server_version_info', None)
+        if not version or tuple(version) < MERGE_VERSIONS[name]:
+            return None
+    return MERGE_DIALECTS[name]
 
 
 class SqaExtractor(object):
     """
-    :param staging_table: Sqa Table class object
-    :param history_table: Sqa Table class object
+    :param staging_table: Sqa Table class object or TableSchema
+    :param history_table: Sqa Table class object or TableSchema
     :param logical_pk: Logical primary key of the target table as list
-    :param con: Sqlalchemy database connection
-    :param load_strategy: [jinja, database_table]
+    :param con: Sqlalchemy database connection. Only its dialect is used
+    :param load_strategy: [jinja, database_table, bind]. bind renders
+    the load dates as named bind parameters, see bind_statement
+    :param dialect: Dialect name e.g. postgresql or sqlalchemy dialect
+    instance to compile the statements with instead of the connection
+    :param current_table: Sqa Table class object or TableSchema of the
+    current snapshot of the history table
+    :param hash_diff: Detect changed records by the ROW_HASH column of
+    the staging and history table instead of comparing every column
+    :param join_updates: Join the staging table in the updates with
+    UPDATE ... FROM and LEFT JOIN / IS NULL where the dialect supports
+    it instead of correlated EXISTS subqueries
+    :param tableload_row: With the database_table strategy every
+    statement joins one derived row of the table load dates instead of
+    a scalar subquery per date. Updates join it where the dialect has
+    UPDATE ... FROM
     """
 
     def __init__(self,
@@ -22,20 +89,65 @@ class SqaExtractor(object):
                  logical_pk: list,
                  con,
                  load_strategy: str,
+                 dialect=None,
+                 current_table: Table = None,
+                 hash_diff: bool = False,
+                 join_updates: bool = False,
+                 tableload_row: bool = False
                  ):
+        if isinstance(staging_table, TableSchema):
+            staging_table = staging_table.to_table()
+        if isinstance(history_table, TableSchema):
+            history_table = history_table.to_table()
+        if isinstance(current_table, TableSchema):
+            current_table = current_table.to_table()
         self._staging_table = staging_table
         self._history_table = history_table
+        self._current_table = current_table
         self._logical_pk = logical_pk
         self._con = con
         self._load_strategy = load_strategy
+        self._dialect = resolve_dialect(con=con, dialect=dialect)
+        self._hash_diff = hash_diff
+        self._join_updates = join_updates
+        self._tableload_row = tableload_row
+        self._tableload = None
+        self._bind_names = []
 
-        ALLOWED_STRATEGIES = ['jinja', 'database_table']
+        ALLOWED_STRATEGIES = ['jinja', 'database_table', 'bind']
 
         if not isinstance(self._staging_table, Table):
             raise TypeError("Must be a SQA Table class instance")
         if self._load_strategy not in ALLOWED_STRATEGIES:
             stra = ' ,'.join(ALLOWED_STRATEGIES)
             raise ValueError(f"Invalid load stragey. Allowed are: '{stra}'")
+        if self._hash_diff and (ROW_HASH not in self._staging_table.c or
+                                ROW_HASH not in self._history_table.c):
+            raise ValueError(f"Hash diff needs a {ROW_HASH} column in the "
+                             f"staging and history table")
+
+    def _compile(self, stmt) -> str:
+        """
+        method that compiles a statement for the dialect with all values
+        as literals. The names of the date bind parameters are collected
+        """
+        compiled = stmt.compile(dialect=self._dialect,
+                                compile_kwargs={"literal_binds": True})
+        self._bind_names.extend(getattr(compiled, 'date_params', []))
+        return str(compiled)
+
+    def bind_statement(self, method: str) -> tuple:
+        """
+        method that returns the SQL of a statement method e.g.
+        'scd2_new_insert' with the load dates as bind parameters and the
+        parameter names in the order of their placeholders. The
+        statement can be prepared once and executed every batch
+        """
+        if self._load_strategy != "bind":
+            raise ValueError("Bind parameters need the load strategy bind")
+        self._bind_names = []
+        sql = getattr(self, method)()
+        return sql, list(self._bind_names)
 
     def get_col_names(self) -> list:
         """
@@ -67,7 +179,7 @@ class SqaExtractor(object):
         COLUMN class has:
         {'key': X, 'name': Y, 'table': T}
         """
-        return [c.table.name for c in self._staging_table.c][0]
+        return [c.table.fullname for c in self._staging_table.c][0]
 
     def get_hist_table_name(self) -> str:
         """
@@ -75,7 +187,7 @@ class SqaExtractor(object):
         COLUMN class has:
         {'key': X, 'name': Y, 'table': T}
         """
-        return [c.table.name for c in self._history_table.c][0]
+        return [c.table.fullname for c in self._history_table.c][0]
 
     def get_staging_columns(self) -> list:
         """
@@ -84,79 +196,158 @@ class SqaExtractor(object):
         return [getattr(self._staging_table.c, c) for
                 c in self.get_col_names()]
 
-    def set_batch_date(self) -> str:
+    def get_tableload_row(self):
+        """
+        method that returns the derived row with all table load dates of
+        the history table
+        """
+        if self._tableload is None:
+            self._tableload = select([
+                TableLoad.BatchDate,
+                TableLoad.ValidToDate,
+                TableLoad.ValidFromDate,
+                TableLoad.OffsetValidToDate]).where(
+                    TableLoad.name == self.get_hist_table_name()).alias('tl')
+        return self._tableload
+
+    def _update_row(self) -> bool:
+        """
+        method that checks if the updates join the derived table load
+        row. Without UPDATE ... FROM they keep the subqueries
+        """
+        return self._tableload_row and \
+            getattr(self._dialect, 'name', None) in JOIN_UPDATE_DIALECTS
+
+    def set_batch_date(self, row: bool = True) -> str:
         """
         Set the correct batch date either table load
         or jinja expression
+        :param row: Take it from the derived table load row if
+        tableload_row is set
         """
         if self._load_strategy == "jinja":
             return select([func.date(
                 literal_column(
                     r"{{ batch_date }}")).label("BATCH_RUN_AT")]).as_scalar()
+        elif self._load_strategy == "bind":
+            return DateParam("batch_date")
         elif self._load_strategy == "database_table":
+            if row and self._tableload_row:
+                return self.get_tableload_row().c.BatchDate
             table = self.get_hist_table_name()
             return select([TableLoad.BatchDate]).where(
                 TableLoad.name == table).as_scalar()
 
-    def set_validto_date(self) -> str:
+    def set_validto_date(self, row: bool = True) -> str:
         """
         Set the correct batch date either table load
         or jinja expression
+        :param row: Take it from the derived table load row if
+        tableload_row is set
         """
         if self._load_strategy == "jinja":
             return select([func.date(
                 literal_column(
                     r"{{ validto_date }}")).label(
                         "VALID_TO_DATE")]).as_scalar()
+        elif self._load_strategy == "bind":
+            return DateParam("validto_date")
         elif self._load_strategy == "database_table":
+            if row and self._tableload_row:
+                return self.get_tableload_row().c.ValidToDate
             table = self.get_hist_table_name()
             return select([TableLoad.ValidToDate]).where(
                 TableLoad.name == table).as_scalar()
 
-    def set_subquery_validto_date(self) -> str:
+    def set_subquery_validto_date(self, row: bool = True) -> str:
         """
         Set the correct validto date either table load
         or jinja expression in a subquery
+        :param row: Take it from the derived table load row if
+        tableload_row is set
         """
         if self._load_strategy == "jinja":
             return func.date(literal_column(r"{{ validto_date }}"))
+        elif self._load_strategy == "bind":
+            return DateParam("validto_date")
         elif self._load_strategy == "database_table":
+            if row and self._tableload_row:
+                return self.get_tableload_row().c.ValidToDate
             return select([TableLoad.ValidToDate]).where(
                 TableLoad.name == self.get_hist_table_name())
 
-    def set_subquery_batch_date(self) -> str:
+    def set_subquery_batch_date(self, row: bool = True) -> str:
         """
         Set the correct batch date either table load
         or jinja expression in a subquery
+        :param row: Take it from the derived table load row if
+        tableload_row is set
         """
         if self._load_strategy == "jinja":
             return func.date(literal_column(r"{{ batch_date }}"))
+        elif self._load_strategy == "bind":
+            return DateParam("batch_date")
         elif self._load_strategy == "database_table":
+            if row and self._tableload_row:
+                return self.get_tableload_row().c.BatchDate
             return select([TableLoad.BatchDate]).where(
                 TableLoad.name == self.get_hist_table_name())
 
-    def set_subquery_offsetvalidto_date(self) -> str:
+    def set_subquery_offsetvalidto_date(self, row: bool = True) -> str:
         """
         Set the correct offset validto date either table load
         or jinja expression in a subquery
+        :param row: Take it from the derived table load row if
+        tableload_row is set
         """
         if self._load_strategy == "jinja":
             return func.date(literal_column(r"{{ offset_validto_date }}"))
+        elif self._load_strategy == "bind":
+            return DateParam("offset_validto_date")
         elif self._load_strategy == "database_table":
+            if row and self._tableload_row:
+                return self.get_tableload_row().c.OffsetValidToDate
             return select([TableLoad.OffsetValidToDate]).where(
                 TableLoad.name == self.get_hist_table_name())
 
-    def set_validfrom_date(self) -> str:
+    def set_offsetvalidto_date(self, row: bool = True) -> str:
+        """
+        Set the correct offset validto date either table load
+        or jinja expression
+        :param row: Take it from the derived table load row if
+        tableload_row is set
+        """
+        if self._load_strategy == "jinja":
+            return select([func.date(
+                literal_column(
+                    r"{{ offset_validto_date }}")).label(
+                        OFFSET_COLUMN)]).as_scalar()
+        elif self._load_strategy == "bind":
+            return DateParam("offset_validto_date")
+        elif self._load_strategy == "database_table":
+            if row and self._tableload_row:
+                return self.get_tableload_row().c.OffsetValidToDate
+            table = self.get_hist_table_name()
+            return select([TableLoad.OffsetValidToDate]).where(
+                TableLoad.name == table).as_scalar()
+
+    def set_validfrom_date(self, row: bool = True) -> str:
         """
         Set the correct batch date either table load
         or jinja expression
+        :param row: Take it from the derived table load row if
+        tableload_row is set
         """
         if self._load_strategy == "jinja":
             return select([func.date(
                 literal_column(
                     r"{{ validfrom_date }}")).label(
                         "VALID_FROM_DATE")]).as_scalar()
+        elif self._load_strategy == "bind":
+            return DateParam("validfrom_date")
         elif self._load_strategy == "database_table":
+            if row and self._tableload_row:
+                return self.get_tableload_row().c.ValidFromDate
             table = self.get_hist_table_name()
             return select([TableLoad.ValidFromDate]).where(
                 TableLoad.name == table).as_scalar()
@@ -194,18 +385,32 @@ class SqaExtractor(object):
             )
         return pk_cols
 
-    def get_compare_columns(self) -> list:
+    def get_compare_columns(self, source=None) -> list:
         """
-        method that returns all compare columns
+        method that returns all compare columns. With hash diff it is
+        the single compare of the row hashes
+        :param source: Table or alias with the staging columns compared
+        to the history table. Default the staging table
         """
+        source = self._staging_table if source is None else source
+        if self._hash_diff:
+            return [getattr(source.c, ROW_HASH) !=
+                    getattr(self._history_table.c, ROW_HASH)]
         compare_columns = []
         for col in self.get_source_col_names():
             compare_columns.append(
-                getattr(self._staging_table.c, col) !=
+                getattr(source.c, col) !=
                 getattr(self._history_table.c, col)
             )
         return compare_columns
 
+    def _joins_updates(self, dialects: list) -> bool:
+        """
+        method that checks if the updates join the staging table
+        """
+        return self._join_updates and \
+            getattr(self._dialect, 'name', None) in dialects
+
     def get_staging_table_pk_col(self) -> list:
         """
         method that gets all pk columns from staging table
@@ -217,7 +422,7 @@ class SqaExtractor(object):
         method that generate the default INSERT of the persistent staging table
         for the table load table if strategy == database_table
         """
-        valid_to_dt = datetime(9999, 12, 31)  # "'9999-12-31'"
+        valid_to_dt = HIGH_DATE  # "'9999-12-31'"
         valid_from_dt = datetime(2020, 1, 31)  # "'2020-01-31'"
         batch_dt = datetime(2020, 2, 1)  # "'2020-02-01'"
         offsetvalid_to_dt = datetime(2020, 1, 30)
@@ -228,8 +433,18 @@ class SqaExtractor(object):
             ValidFromDate=valid_from_dt,
             OffsetValidToDate=offsetvalid_to_dt)
 
-        return str(ins.compile(bind=self._con,
-                               compile_kwargs={"literal_binds": True}))
+        return self._compile(ins)
+
+    def scd2_row_hash(self) -> str:
+        """
+        hash diff command that sets the ROW_HASH of all staging records
+        to the hash of their source columns before the scd2 steps
+        """
+        columns = [c for c in self.get_staging_columns()
+                   if c.name != ROW_HASH]
+        upd = self._staging_table.update().values(
+            {ROW_HASH: row_hash(columns)})
+        return self._compile(upd)
 
     def scd2_new_insert(self) -> str:
         """
@@ -247,8 +462,7 @@ class SqaExtractor(object):
                     ~exists(exist_stat).where(and_(
                         *filters)))
                         ))
-        return str(stmt.compile(bind=self._con,
-                                compile_kwargs={"literal_binds": True}))
+        return self._compile(stmt)
 
     def scd2_updated_insert(self) -> str:
         """
@@ -275,8 +489,7 @@ class SqaExtractor(object):
 
         stmt = (self._history_table.insert().
                 from_select(self.get_his_col_names(), sel))
-        return str(stmt.compile(bind=self._con,
-                                compile_kwargs={"literal_binds": True}))
+        return self._compile(stmt)
 
     def scd2_updated_update(self) -> str:
         """
@@ -289,11 +502,40 @@ class SqaExtractor(object):
         exist_stat = self.get_staging_table_pk_col()
         filters = self.def_equal_pk_col()
 
-        to_dt = self.set_subquery_validto_date()  # "'9999-12-31'"
-        batch_dt = self.set_subquery_batch_date()  # "'2020-02-01'"
-        offset_validto = self.set_subquery_offsetvalidto_date()
+        row = self._update_row()
+        to_dt = self.set_subquery_validto_date(row=row)  # "'9999-12-31'"
+        batch_dt = self.set_subquery_batch_date(row=row)  # "'2020-02-01'"
+        offset_validto = self.set_subquery_offsetvalidto_date(row=row)
         # from_dt = "'2020-01-31'"
 
+        if self._joins_updates(JOIN_UPDATE_DIALECTS):
+            upd = (self._history_table.update()
+                   .values(
+                        VALID_TO_DATE=offset_validto,
+                        UPDATED_AT=now()).where(
+                            and_(*filters)).where(
+                                or_(*compare_columns)).where(
+                                    and_(self._history_table.c.VALID_TO_DATE
+                                         == to_dt,
+                                         self._history_table.c.BATCH_RUN_AT
+                                         < batch_dt)))
+            return self._compile(upd)
+        if row and self._load_strategy == "database_table":
+            # the dates are compared outside of the EXISTS to join the
+            # derived table load row in the UPDATE
+            upd = (self._history_table.update()
+                   .values(
+                        VALID_TO_DATE=offset_validto,
+                        UPDATED_AT=now()).where(
+                            and_(self._history_table.c.VALID_TO_DATE
+                                 == to_dt,
+                                 self._history_table.c.BATCH_RUN_AT
+                                 < batch_dt)).where(
+                                     exists(exist_stat).where(
+                                         and_(*filters)).where(
+                                             or_(*compare_columns))))
+            return self._compile(upd)
+
         upd = (self._history_table.update()
                .values(
                     VALID_TO_DATE=offset_validto,
@@ -306,8 +548,7 @@ class SqaExtractor(object):
                                          self._history_table.c.BATCH_RUN_AT
                                          < batch_dt
                                          ))))
-        return str(upd.compile(bind=self._con,
-                               compile_kwargs={"literal_binds": True}))
+        return self._compile(upd)
 
     def scd2_deleted_update(self) -> str:
         """
@@ -315,13 +556,25 @@ class SqaExtractor(object):
         in the source system. Set current latest record VALID_TO_DATE to
         current batch date
         """
-        to_dt = self.set_subquery_validto_date()  # "'9999-12-31'"
+        row = self._update_row()
+        to_dt = self.set_subquery_validto_date(row=row)  # "'9999-12-31'"
         # batch_dt = self.set_subquery_batch_date()  # "'2020-02-01'"
-        offset_validto = self.set_subquery_offsetvalidto_date()
+        offset_validto = self.set_subquery_offsetvalidto_date(row=row)
 
         no_exist = self.get_staging_table_pk_col()
         filters = self.def_equal_pk_col()
 
+        if self._joins_updates(ANTI_JOIN_UPDATE_DIALECTS):
+            upd = (update(self._history_table.outerjoin(
+                       self._staging_table, and_(*filters)))
+                   .values({
+                       self._history_table.c.VALID_TO_DATE: offset_validto,
+                       self._history_table.c.UPDATED_AT: now()}).where(
+                           and_(*[c.is_(None) for c in no_exist],
+                                self._history_table.c.VALID_TO_DATE
+                                == to_dt)))
+            return self._compile(upd)
+
         upd = (self._history_table.update()
                .values(
                     VALID_TO_DATE=offset_validto,
@@ -330,5 +583,207 @@ class SqaExtractor(object):
                             and_(*filters)),
                              self._history_table.c.VALID_TO_DATE
                              == to_dt)))
-        return str(upd.compile(bind=self._con,
-                               compile_kwargs={"literal_binds": True}))
+        return self._compile(upd)
+
+    def scd2_missing_insert(self) -> str:
+        """
+        scd2 command that inserts all staging records the new and the
+        updated insert would: records without any history record and the
+        new version of changed records. Deleted records that come back stay
+        deleted like with the steps. It replaces both inserts where the
+        dialect has no MERGE and runs before the updates close the changed
+        records
+        """
+        all_stg_columns = self.get_staging_columns()
+        all_stg_columns.extend(self.set_metadata_colums())
+
+        stmt = (self._history_table.insert().
+                from_select(self.get_his_col_names(),
+                select(all_stg_columns).where(
+                    or_(~self._history_exists(),
+                        self._history_exists(current=True).where(
+                            or_(*self.get_compare_columns()))))))
+        return self._compile(stmt)
+
+    def _history_exists(self, current: bool = False):
+        """
+        method that returns the EXISTS of a history record of a staging
+        record
+        :param current: Only the current history record
+        """
+        his_pk = [getattr(self._history_table.c, pk)
+                  for pk in self._logical_pk]
+        stmt = exists(his_pk).where(and_(*self.def_equal_pk_col()))
+        if current:
+            stmt = stmt.where(self._history_table.c.VALID_TO_DATE
+                              == self.set_subquery_validto_date())
+        return stmt
+
+    def _merge_source(self):
+        """
+        method that returns the source of the scd2 MERGE. All staging
+        records with their logical primary key as merge key close the
+        current history record if changed or are inserted if new. Records
+        with only closed history records are left out like the steps do. The
+        changed records again without a merge key are never matched and
+        inserted as new version
+        """
+        columns = self.get_staging_columns()
+        columns.extend(v.label(name) for name, v in
+                       zip(METADATA_COLUMNS, self.set_metadata_colums()))
+        columns.append(self.set_offsetvalidto_date().label(OFFSET_COLUMN))
+        pk_cols = self.get_staging_table_pk_col()
+        keys = [c.label(f"MERGE_KEY_{c.name}") for c in pk_cols]
+        no_keys = [cast(null(), c.type).label(f"MERGE_KEY_{c.name}")
+                   for c in pk_cols]
+
+        changed = (select(columns + no_keys).
+                   select_from(self._history_table.join(
+                       self._staging_table,
+                       and_(*self.def_equal_pk_col()))).where(
+                           or_(*self.get_compare_columns())).where(
+                               self._history_table.c.VALID_TO_DATE
+                               == self.set_subquery_validto_date()))
+        # deleted records that come back have history records but no
+        # current one. The steps never insert them again
+        keyed = select(columns + keys).where(
+            or_(~self._history_exists(),
+                self._history_exists(current=True)))
+        return union_all(keyed, changed).alias('src')
+
+    def scd2_merge(self) -> str:
+        """
+        scd2 command that inserts new records, closes changed records
+        and inserts their new version in one MERGE. Dialects with WHEN
+        NOT MATCHED BY SOURCE also close the deleted records, all other
+        need the deleted update after it
+        """
+        if merge_by_source(self._dialect) is None:
+            raise ValueError(f"Dialect {self._dialect.name} has no MERGE")
+        his = self._history_table
+        src = self._merge_source()
+        by_source = by_source_update = None
+        if merge_by_source(self._dialect):
+            by_source = his.c.VALID_TO_DATE == \
+                self.set_subquery_validto_date(row=False)
+            by_source_update = {
+                'VALID_TO_DATE': self.set_offsetvalidto_date(row=False),
+                'UPDATED_AT': now()}
+        stmt = Merge(
+            target=his,
+            source=src,
+            on=and_(*[getattr(his.c, pk) == src.c[f"MERGE_KEY_{pk}"]
+                      for pk in self._logical_pk],
+                    his.c.VALID_TO_DATE == src.c.VALID_TO_DATE),
+            matched=and_(his.c.BATCH_RUN_AT < src.c.BATCH_RUN_AT,
+                         or_(*self.get_compare_columns(source=src))),
+            update={'VALID_TO_DATE': src.c[OFFSET_COLUMN],
+                    'UPDATED_AT': src.c.UPDATED_AT},
+            insert={c: src.c[c]
+                    for c in self.get_col_names() + METADATA_COLUMNS},
+            by_source=by_source,
+            by_source_update=by_source_update)
+        return self._compile(stmt)
+
+    def _current_rows(self):
+        """
+        method that returns the select of the current rows of the
+        history table with the columns of the current snapshot
+        """
+        columns = [getattr(self._history_table.c, c.name)
+                   for c in self._current_table.c]
+        return select(columns).where(
+            self._history_table.c.VALID_TO_DATE
+            == self.set_subquery_validto_date())
+
+    def scd2_current_delete(self) -> str:
+        """
+        current snapshot command that deletes all records the scd2 steps
+        closed in this batch, they are updated or deleted in the source
+        """
+        his_pk = [getattr(self._history_table.c, pk)
+                  for pk in self._logical_pk]
+        filters = [getattr(self._history_table.c, pk) ==
+                   getattr(self._current_table.c, pk)
+                   for pk in self._logical_pk]
+        offset_validto = self.set_subquery_offsetvalidto_date()
+
+        stmt = self._current_table.delete().where(
+            exists(his_pk).where(and_(*filters)).where(
+                self._history_table.c.VALID_TO_DATE == offset_validto))
+        return self._compile(stmt)
+
+    def _current_missing(self):
+        """
+        method that returns the select of the current rows of the
+        history table that are not in the current snapshot
+        """
+        cur_pk = [getattr(self._current_table.c, pk)
+                  for pk in self._logical_pk]
+        filters = [getattr(self._current_table.c, pk) ==
+                   getattr(self._history_table.c, pk)
+                   for pk in self._logical_pk]
+        return self._current_rows().where(
+            ~exists(cur_pk).where(and_(*filters)))
+
+    def _current_insert(self, sel) -> str:
+        """
+        method that returns the insert of a select into the current
+        snapshot
+        """
+        stmt = (self._current_table.insert().
+                from_select([c.name for c in self._current_table.c], sel))
+        return self._compile(stmt)
+
+    def scd2_current_insert(self) -> str:
+        """
+        current snapshot command that inserts all current records the
+        scd2 steps inserted in this batch
+        """
+        batch_dt = self.set_subquery_batch_date()
+        return self._current_insert(self._current_missing().where(
+            self._history_table.c.BATCH_RUN_AT == batch_dt))
+
+    def scd2_current_initial_insert(self) -> str:
+        """
+        current snapshot command that inserts all current records of the
+        history table. Run it once to fill a new current snapshot of a
+        loaded history table, the scd2 steps only maintain the records of
+        their batch
+        """
+        return self._current_insert(self._current_missing())
+
+    def _materialized_view(self) -> bool:
+        """
+        method that returns True if the current snapshot is a
+        materialized view. Views of single table dialects that query the
+        table load table are plain views
+        """
+        return not (self._dialect.name in SINGLE_TABLE_VIEWS and
+                    self._load_strategy == 'database_table')
+
+    def current_view_ddl(self) -> str:
+        """
+        method that returns the ddl of the current snapshot as
+        materialized view of the current history records
+        """
+        if self._dialect.name not in MATERIALIZED_VIEWS:
+            raise ValueError(f"Dialect {self._dialect.name} has no "
+                             f"materialized views")
+        view = self._dialect.identifier_preparer.format_table(
+            self._current_table)
+        sel = self._compile(self._current_rows())
+        if not self._materialized_view():
+            return f"CREATE VIEW {view} AS\n{sel}"
+        return f"CREATE MATERIALIZED VIEW {view} AS\n{sel}"
+
+    def scd2_current_refresh(self) -> str:
+        """
+        current snapshot command that refreshes the materialized view.
+        Returns None if the database maintains the view itself
+        """
+        refresh = MATERIALIZED_VIEWS.get(self._dialect.name)
+        if refresh is None or not self._materialized_view():
+            return None
+        return refresh.format(view=self._dialect.identifier_preparer.
+                              format_table(self._current_table))
@@ -1,22 +1,47 @@
+from datetime import datetime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import Column, String, DateTime
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.schema import CreateTable
 
+from ninjasql.db.dialects import resolve_dialect
+
 Base = declarative_base()
 
+# ValidToDate of the current history rows written by the table load
+HIGH_DATE = datetime(9999, 12, 31)
+
+
+class LiteralDateTime(TypeDecorator):
+    """
+    DateTime that can be rendered as literal on every dialect. Dialects
+    without an own literal renderer (e.g. postgresql) get an ISO string
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_literal_param(self, value, dialect):
+        if value is None or \
+                self.impl.literal_processor(dialect) is not None:
+            return value
+        return f"'{value.isoformat(sep=' ')}'"
+
 
 class TableLoad(Base):
     __tablename__ = 'tableloads'
 
     name = Column(String, primary_key=True)
-    BatchDate = Column(DateTime)
-    ValidToDate = Column(DateTime)
-    OffsetValidToDate = Column(DateTime)
-    ValidFromDate = Column(DateTime)
+    BatchDate = Column(LiteralDateTime)
+    ValidToDate = Column(LiteralDateTime)
+    OffsetValidToDate = Column(LiteralDateTime)
+    ValidFromDate = Column(LiteralDateTime)
 
 
-def get_sqa_tableload(con):
+def get_sqa_tableload(con=None, dialect=None):
     """
     param con: sqa database engine
+    param dialect: Dialect name or sqa dialect instance used instead of
+    the engine
     """
-    return str(CreateTable(TableLoad.__table__).compile(con))
+    return str(CreateTable(TableLoad.__table__).compile(
+        dialect=resolve_dialect(con=con, dialect=dialect)))
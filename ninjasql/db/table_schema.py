@@ -0,0 +1,367 @@
+from pandas import DataFrame
+from pandas.api.types import (
+    pandas_dtype,
+    infer_dtype,
+    is_bool_dtype,
+    is_categorical_dtype,
+    is_datetime64_any_dtype,
+    is_datetime64tz_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_timedelta64_dtype)
+from sqlalchemy import (
+    MetaData,
+    Table,
+    Column,
+    BigInteger,
+    Boolean,
+    CHAR,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    SmallInteger,
+    Text,
+    Time)
+from sqlalchemy.dialects import sqlite
+
+from ninjasql.infer.widening import empty_frame
+from ninjasql.db.narrow_types import narrow_type
+from ninjasql.db.row_hash import HASH_LENGTH
+
+# sqlalchemy types of the kinds that do not depend on the dtype
+_KIND_TYPES = {
+    'timedelta': BigInteger,
+    'boolean': Boolean,
+    'date': Date,
+    'time': Time,
+    'hash': CHAR(HASH_LENGTH),
+}
+# sqlalchemy types of the integer dtypes narrower than BigInteger
+_INTEGER_TYPES = {
+    'int8': SmallInteger,
+    'uint8': SmallInteger,
+    'int16': SmallInteger,
+    'uint16': Integer,
+    'int32': Integer,
+}
+# infer_dtype results of object columns and the kind they are typed as
+_OBJECT_KINDS = {
+    'datetime64': 'datetime',
+    'datetime': 'datetime',
+    'date': 'date',
+    'time': 'time',
+    'timedelta64': 'timedelta',
+    'timedelta': 'timedelta',
+    'floating': 'floating',
+    'integer': 'integer',
+    'boolean': 'boolean',
+    'complex': 'complex',
+}
+
+_SQLITE_DIALECT = sqlite.dialect()
+
+# column types of the pandas sqlite fallback without sqlalchemy
+SQLITE_TYPES = {
+    'string': 'TEXT',
+    'floating': 'REAL',
+    'integer': 'INTEGER',
+    'datetime': 'TIMESTAMP',
+    'date': 'DATE',
+    'time': 'TIME',
+    'boolean': 'INTEGER',
+    'timedelta': 'INTEGER',
+    'hash': 'TEXT',
+}
+
+
+def column_kind(values) -> str:
+    """
+    function that returns the SQL relevant kind of a column
+    {string, floating, integer, datetime, date, time, boolean, timedelta,
+    complex}. Only object columns are inspected value by value
+    """
+    dt = values.dtype
+    if is_categorical_dtype(dt):
+        return column_kind(values.cat.categories)
+    if is_datetime64_any_dtype(dt):
+        return 'datetime'
+    if is_timedelta64_dtype(dt):
+        return 'timedelta'
+    if is_bool_dtype(dt):
+        return 'boolean'
+    if is_integer_dtype(dt):
+        return 'integer'
+    if is_float_dtype(dt):
+        return 'floating'
+    if not len(values):
+        return 'string'
+    return _OBJECT_KINDS.get(infer_dtype(values, skipna=True), 'string')
+
+
+def _integer_type(name: str):
+    """
+    function that returns the sqlalchemy type of an integer dtype name
+    """
+    if name == 'uint64':
+        raise ValueError("Unsigned 64 bit integer datatype is not "
+                         "supported")
+    return _INTEGER_TYPES.get(name, BigInteger)
+
+
+class ColumnSchema(object):
+    """
+    Compact description of one column
+    :param name: Column name
+    :param dtype: pandas dtype of the column
+    :param kind: SQL relevant kind of the column, see column_kind. The
+    row hash column of the hash diff mode has the kind 'hash'
+    :param nullable: Column has or may have missing values
+    :param stats: dict of column statistics e.g. {'count': 10, 'nulls': 0}.
+    The value statistics for narrow types are kept under 'values'
+    """
+    __slots__ = ('name', 'dtype', 'kind', 'nullable', 'stats')
+
+    def __init__(self,
+                 name: str,
+                 dtype,
+                 kind: str,
+                 nullable: bool = True,
+                 stats: dict = None):
+        self.name = name
+        self.dtype = dtype
+        self.kind = kind
+        self.nullable = nullable
+        self.stats = stats or {}
+
+    def __repr__(self):
+        return (f"ColumnSchema(name={self.name!r}, dtype={self.dtype}, "
+                f"kind={self.kind!r}, nullable={self.nullable})")
+
+    def sqa_type(self, headroom: float = None, dialect=None):
+        """
+        method that returns the sqlalchemy type of the column. The
+        mapping is the one pandas uses for to_sql
+        :param headroom: If given the narrowest type of the value
+        statistics with this share of headroom is returned
+        :param dialect: Target sqlalchemy dialect of the narrow type
+        """
+        if headroom is not None and self.stats.get('values'):
+            narrow = narrow_type(self.stats['values'], headroom, dialect)
+            if narrow is not None:
+                return narrow
+        name = getattr(self.dtype, 'name', str(self.dtype)).lower()
+        if self.kind == 'datetime':
+            return DateTime(timezone=is_datetime64tz_dtype(self.dtype))
+        if self.kind == 'floating':
+            return Float(precision=23 if name == 'float32' else 53)
+        if self.kind == 'integer':
+            return _integer_type(name)
+        if self.kind == 'complex':
+            raise ValueError("Complex datatypes not supported")
+        return _KIND_TYPES.get(self.kind, Text)
+
+    def to_dict(self) -> dict:
+        """
+        method that returns the column as json serializable dict
+        """
+        return {'name': self.name,
+                'dtype': str(self.dtype),
+                'kind': self.kind,
+                'nullable': self.nullable,
+                'stats': self.stats}
+
+    @classmethod
+    def from_dict(cls, value: dict):
+        """
+        method that builds a column of a dict created by to_dict
+        """
+        return cls(name=value['name'],
+                   dtype=pandas_dtype(value['dtype']),
+                   kind=value['kind'],
+                   nullable=value['nullable'],
+                   stats=value['stats'])
+
+    def sqlite_type(self, headroom: float = None) -> str:
+        """
+        method that returns the column type of the pandas sqlite fallback
+        :param headroom: If given the narrowest type of the value
+        statistics with this share of headroom is returned
+        """
+        if headroom is not None and self.stats.get('values'):
+            narrow = narrow_type(self.stats['values'], headroom)
+            if narrow is not None:
+                return str(narrow.compile(dialect=_SQLITE_DIALECT))
+        if self.kind == 'complex':
+            raise ValueError("Complex datatypes not supported")
+        return SQLITE_TYPES.get(self.kind, 'TEXT')
+
+
+class TableSchema(object):
+    """
+    Compact description of a table. It carries the schema of an
+    inspected file to the DDL and DML generation without any row data
+    :param name: Table name
+    :param columns: list of ColumnSchema
+    """
+    __slots__ = ('name', 'columns')
+
+    def __init__(self, name: str = None, columns: list = None):
+        self.name = name
+        self.columns = list(columns or [])
+
+    def __repr__(self):
+        return f"TableSchema(name={self.name!r}, columns={self.columns!r})"
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    @classmethod
+    def from_frame(cls,
+                   frame: DataFrame,
+                   name: str = None,
+                   date_columns: list = None,
+                   value_stats: dict = None,
+                   dtypes: dict = None):
+        """
+        method that builds the schema of a dataframe. Statistics and
+        nullability are only known for frames with rows
+        :param date_columns: datetime columns that only hold dates
+        :param value_stats: dict of column name to value statistics
+        :param dtypes: dict of column name to the dtype the column is
+        typed with instead of its frame dtype e.g. before a downcast
+        """
+        date_columns = date_columns or []
+        value_stats = value_stats or {}
+        dtypes = dtypes or {}
+        columns = []
+        rows = len(frame)
+        for col in frame.columns:
+            values = frame[col]
+            kind = column_kind(values)
+            if kind == 'datetime' and col in date_columns:
+                kind = 'date'
+            stats = {}
+            nullable = True
+            if rows:
+                nulls = int(values.isna().sum())
+                stats = {'count': rows - nulls, 'nulls': nulls}
+                nullable = nulls > 0
+            if value_stats.get(col):
+                stats['values'] = value_stats[col]
+            columns.append(ColumnSchema(name=col,
+                                        dtype=dtypes.get(col, values.dtype),
+                                        kind=kind,
+                                        nullable=nullable,
+                                        stats=stats))
+        return cls(name=name, columns=columns)
+
+    @property
+    def names(self) -> list:
+        """
+        All column names
+        """
+        return [c.name for c in self.columns]
+
+    def dtypes(self) -> dict:
+        """
+        method that returns the pandas dtypes as dict
+        """
+        return {c.name: c.dtype for c in self.columns}
+
+    def with_columns(self, columns: list, name: str = None):
+        """
+        method that returns a new schema with additional columns. The
+        column objects are shared, not copied
+        """
+        return self.__class__(name=name or self.name,
+                              columns=self.columns + list(columns))
+
+    def without_columns(self, names: list):
+        """
+        method that returns a new schema without the named columns
+        """
+        return self.__class__(name=self.name,
+                              columns=[c for c in self.columns
+                                       if c.name not in names])
+
+    def layout(self):
+        """
+        method that returns the same columns with their dtypes but
+        without statistics. Every column is nullable
+        """
+        return self.__class__(name=self.name,
+                              columns=[ColumnSchema(name=c.name,
+                                                    dtype=c.dtype,
+                                                    kind=c.kind)
+                                       for c in self.columns])
+
+    def renamed(self, name: str):
+        """
+        method that returns the same schema with another table name
+        """
+        return self.__class__(name=name, columns=self.columns)
+
+    def to_dict(self) -> dict:
+        """
+        method that returns the schema as json serializable dict
+        """
+        return {'name': self.name,
+                'columns': [c.to_dict() for c in self.columns]}
+
+    @classmethod
+    def from_dict(cls, value: dict):
+        """
+        method that builds a schema of a dict created by to_dict
+        """
+        return cls(name=value['name'],
+                   columns=[ColumnSchema.from_dict(c)
+                            for c in value['columns']])
+
+    def empty_frame(self) -> DataFrame:
+        """
+        method that returns a dataframe without rows of the schema
+        """
+        return empty_frame(self.dtypes())
+
+    def sqlite_types(self,
+                     dtype: dict = None,
+                     headroom: float = None) -> dict:
+        """
+        method that returns the pandas sqlite fallback type of every
+        column. Types given in dtype win
+        :param headroom: Use narrow types with this share of headroom
+        """
+        types = {c.name: c.sqlite_type(headroom) for c in self.columns}
+        types.update(dtype or {})
+        return types
+
+    def to_table(self,
+                 metadata: MetaData = None,
+                 name: str = None,
+                 schema: str = None,
+                 dtype: dict = None,
+                 headroom: float = None,
+                 dialect=None) -> Table:
+        """
+        method that builds a sqlalchemy table of the schema
+        :param metadata: sqlalchemy metadata, default a new one
+        :param name: Table name, default the name of the schema
+        :param schema: Database schema of the table
+        :param dtype: dict of column name to SQL type that replaces the
+        inferred type
+        :param headroom: Use narrow types with this share of headroom
+        :param dialect: Target sqlalchemy dialect of the narrow types
+        """
+        dtype = dtype or {}
+        columns = [Column(c.name,
+                          dtype[c.name] if c.name in dtype
+                          else c.sqa_type(headroom, dialect))
+                   for c in self.columns]
+        return Table(name or self.name,
+                     metadata if metadata is not None else MetaData(),
+                     *columns,
+                     schema=schema)
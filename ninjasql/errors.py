@@ -10,3 +10,17 @@ class NoTableNameGivenError(ValueError):
     Raised if no header are specified
     """
     pass
+
+
+class SchemaDriftError(ValueError):
+    """
+    Raised if the columns of a file differ from the expected schema
+    """
+    pass
+
+
+class MemoryBudgetError(MemoryError):
+    """
+    Raised if a file can not be inspected within the memory budget
+    """
+    pass
@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from contextlib import closing
+
+# bytes of the start and the end of a file that are hashed
+FINGERPRINT_BLOCK = 65536
+# default limits of the cache
+MAX_ENTRIES = 10000
+MAX_BYTES = 64 << 20
+
+_CREATE = """
+CREATE TABLE IF NOT EXISTS schema_cache (
+    key TEXT PRIMARY KEY,
+    layout TEXT,
+    path TEXT,
+    value TEXT,
+    nbytes INTEGER,
+    accessed REAL
+)
+"""
+_CREATE_LAYOUT_INDEX = """
+CREATE INDEX IF NOT EXISTS schema_cache_layout ON schema_cache (layout)
+"""
+
+
+def _hash(*parts) -> str:
+    """
+    function that returns the sha1 hex digest of the given parts
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = str(part).encode('utf-8')
+        digest.update(part)
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def options_key(options: dict) -> str:
+    """
+    function that hashes the read options that change the inferred schema
+    """
+    return _hash(json.dumps(options, sort_keys=True, default=str))
+
+
+def file_fingerprint(path, options: str = '') -> str:
+    """
+    function that returns a cheap fingerprint of a file: path, size,
+    mtime and a hash of the first and the last block. The first block
+    holds the header. Only 2 blocks are read whatever the file size is
+    :param options: options key of the read
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        first = f.read(FINGERPRINT_BLOCK)
+        last = b''
+        if stat.st_size > FINGERPRINT_BLOCK:
+            f.seek(max(FINGERPRINT_BLOCK, stat.st_size - FINGERPRINT_BLOCK))
+            last = f.read(FINGERPRINT_BLOCK)
+    return _hash(path, stat.st_size, stat.st_mtime_ns, first, last, options)
+
+
+def layout_fingerprint(path, header_lines: int, options: str = '') -> str:
+    """
+    function that returns a fingerprint of the header lines of a file.
+    Files with the same header and read options share it
+    """
+    lines = []
+    with open(path, 'rb') as f:
+        for line in f:
+            if len(lines) == header_lines:
+                break
+            lines.append(line.rstrip(b'\r\n'))
+    return _hash(b'\n'.join(lines), options)
+
+
+class SchemaCache(object):
+    """
+    Persistent schema cache in a local sqlite file. Entries are keyed
+    by the file fingerprint and optional by the layout of the file. The
+    least recently used entries are evicted if the cache grows beyond
+    max_entries or max_bytes
+    :param path: Path of the sqlite cache file
+    :param max_entries: Maximum number of cached schemas
+    :param max_bytes: Maximum size of all cached schemas
+    """
+
+    def __init__(self,
+                 path: str,
+                 max_entries: int = MAX_ENTRIES,
+                 max_bytes: int = MAX_BYTES):
+        self._path = str(path)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        with self._connect() as db:
+            db.execute(_CREATE)
+            db.execute(_CREATE_LAYOUT_INDEX)
+
+    def _connect(self):
+        """
+        Instance method that opens the cache file. The connection is
+        committed and closed after every use
+        """
+        return _Connection(self._path)
+
+    def get(self, key: str, layout: str = None) -> dict:
+        """
+        method that returns a cached value of the file fingerprint or,
+        if given, of the newest entry with the same layout.
+        Returns None if nothing is cached
+        """
+        with self._connect() as db:
+            row = db.execute("SELECT key, value FROM schema_cache "
+                             "WHERE key = ?", (key,)).fetchone()
+            if row is None and layout is not None:
+                row = db.execute("SELECT key, value FROM schema_cache "
+                                 "WHERE layout = ? ORDER BY accessed DESC",
+                                 (layout,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE schema_cache SET accessed = ? WHERE key = ?",
+                       (time.time(), row[0]))
+        return json.loads(row[1])
+
+    def put(self,
+            key: str,
+            value: dict,
+            path: str = None,
+            layout: str = None) -> None:
+        """
+        method that caches a json serializable value and evicts the
+        least recently used entries beyond the limits
+        """
+        text = json.dumps(value, default=_to_json)
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO schema_cache "
+                       "(key, layout, path, value, nbytes, accessed) "
+                       "VALUES (?, ?, ?, ?, ?, ?)",
+                       (key, layout, path and os.path.abspath(path), text,
+                        len(text), time.time()))
+            self._evict(db)
+
+    def _evict(self, db) -> None:
+        """
+        Instance method that deletes the least recently used entries
+        until the cache fits max_entries and max_bytes
+        """
+        rows = db.execute("SELECT key, nbytes FROM schema_cache "
+                          "ORDER BY accessed DESC").fetchall()
+        total = 0
+        drop = []
+        for n, (key, nbytes) in enumerate(rows):
+            total += nbytes
+            if n >= self._max_entries or total > self._max_bytes:
+                drop.append((key,))
+        db.executemany("DELETE FROM schema_cache WHERE key = ?", drop)
+
+    def invalidate(self, path: str = None) -> int:
+        """
+        method that deletes the cached schemas of a file or, without
+        a path, all cached schemas. Returns the number of deleted entries
+        """
+        with self._connect() as db:
+            if path is None:
+                cursor = db.execute("DELETE FROM schema_cache")
+            else:
+                cursor = db.execute("DELETE FROM schema_cache WHERE path = ?",
+                                    (os.path.abspath(path),))
+            return cursor.rowcount
+
+    def __len__(self):
+        with self._connect() as db:
+            row = db.execute("SELECT COUNT(*) FROM schema_cache").fetchone()
+        return row[0]
+
+
+class _Connection(object):
+    """
+    Context manager that commits and closes a sqlite connection
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+
+    def __enter__(self):
+        self._db = sqlite3.connect(self._path)
+        return self._db
+
+    def __exit__(self, exc_type, *exc):
+        with closing(self._db):
+            if exc_type is None:
+                self._db.commit()
+        return False
+
+
+def _to_json(value):
+    """
+    function that converts numpy scalars for json
+    """
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
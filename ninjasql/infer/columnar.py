@@ -0,0 +1,150 @@
+import logging
+from pandas import DataFrame
+
+log = logging.getLogger(__name__)
+
+COLUMNAR_TYPES = ['parquet', 'arrow', 'feather']
+# magic bytes of a feather v1 file, v2 files are arrow ipc files
+FEATHER_V1_MAGIC = b'FEA1'
+
+
+def _import_pyarrow():
+    """
+    function that imports pyarrow, which is only needed for
+    parquet and arrow files
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.feather
+    except ImportError as e:
+        log.error("pyarrow is needed for parquet and arrow files. "
+                  f"Please install it. Error: {e}")
+        raise e
+    return pyarrow
+
+
+def _is_feather_v1(path) -> bool:
+    """
+    function that returns True if the file is a feather v1 file, which
+    can not be opened as arrow ipc file
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(FEATHER_V1_MAGIC)) == FEATHER_V1_MAGIC
+
+
+def read_schema(path, type: str):
+    """
+    function that reads the arrow schema of a parquet file from its
+    footer or of an arrow ipc / feather file from its header. No row
+    data is read.
+    :param path: file path
+    :param type: File type {parquet, arrow, feather}
+    """
+    pa = _import_pyarrow()
+    if type == 'parquet':
+        return pa.parquet.read_schema(path)
+    if _is_feather_v1(path):
+        return pa.feather.read_table(path, memory_map=True).schema
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def count_rows(path, type: str) -> int:
+    """
+    function that returns the number of rows of a columnar file from
+    its metadata
+    """
+    pa = _import_pyarrow()
+    if type == 'parquet':
+        return pa.parquet.ParquetFile(path).metadata.num_rows
+    if _is_feather_v1(path):
+        return pa.feather.read_table(path, memory_map=True).num_rows
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        return sum(reader.get_batch(n).num_rows
+                   for n in range(reader.num_record_batches))
+
+
+def schema_frame(path, type: str) -> DataFrame:
+    """
+    function that returns a dataframe without rows that carries the
+    dtypes of the columnar file schema
+    """
+    return read_schema(path=path, type=type).empty_table().to_pandas()
+
+
+def read_columnar(path,
+                  type: str,
+                  columns: list = None,
+                  nrows: int = None) -> DataFrame:
+    """
+    function that reads rows of a columnar file. Only the given
+    columns are read from disk (column projection) and with nrows only
+    the first record batches are decoded. Feather v1 files have no
+    record batches and are read memory mapped.
+    :param path: file path
+    :param type: File type {parquet, arrow, feather}
+    :param columns: Columns to read. Default all columns
+    :param nrows: Number of rows to read. Default all rows
+    """
+    pa = _import_pyarrow()
+    if nrows is None:
+        if type == 'parquet':
+            table = pa.parquet.read_table(path, columns=columns)
+        else:
+            table = pa.feather.read_table(path, columns=columns)
+        return table.to_pandas()
+
+    if type == 'parquet':
+        return _read_parquet_head(pa, path, columns, nrows)
+    if _is_feather_v1(path):
+        table = pa.feather.read_table(path, columns=columns, memory_map=True)
+        return table.slice(0, nrows).to_pandas()
+    return _read_ipc_head(pa, path, columns, nrows)
+
+
+def _read_parquet_head(pa, path, columns: list, nrows: int) -> DataFrame:
+    """
+    function that decodes the record batches of a parquet file until
+    nrows rows are read
+    """
+    # a batch never spans two row groups, so the first batch can
+    # hold less than nrows rows
+    batches = []
+    rows = 0
+    for batch in pa.parquet.ParquetFile(path).iter_batches(
+            batch_size=nrows,
+            columns=columns):
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= nrows:
+            break
+    if batches:
+        table = pa.Table.from_batches(batches)
+        return table.slice(0, nrows).to_pandas()
+    frame = schema_frame(path=path, type='parquet')
+    return frame if columns is None else frame[columns]
+
+
+def _read_ipc_head(pa, path, columns: list, nrows: int) -> DataFrame:
+    """
+    function that reads the record batches of a memory mapped arrow ipc
+    file until nrows rows are read
+    """
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        batches = []
+        rows = 0
+        for n in range(reader.num_record_batches):
+            if rows >= nrows:
+                break
+            batch = reader.get_batch(n)
+            if columns is not None:
+                batch = batch.select(columns)
+            batches.append(batch)
+            rows += batch.num_rows
+        schema = (reader.schema if columns is None
+                  else pa.schema([reader.schema.field(c) for c in columns]))
+        table = pa.Table.from_batches(batches, schema=schema)
+        return table.slice(0, nrows).to_pandas()
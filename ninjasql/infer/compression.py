@@ -0,0 +1,94 @@
+import io
+import os
+import bz2
+import gzip
+import lzma
+import zipfile
+
+# magic numbers of the supported compressions and the matching pandas
+# compression name
+MAGIC_NUMBERS = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'PK\x03\x04', 'zip'),
+]
+_BZ2_MAGIC = b'BZh'
+
+
+def detect_compression(path) -> str:
+    """
+    function that detects the compression of a file from its magic
+    number. Returns the pandas compression name {gzip, bz2, xz, zip}
+    or None for an uncompressed file
+    """
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(6)
+    except (OSError, TypeError):
+        return None
+    for number, compression in MAGIC_NUMBERS:
+        if magic.startswith(number):
+            return compression
+    if magic.startswith(_BZ2_MAGIC) and magic[3:4].isdigit():
+        return 'bz2'
+    return None
+
+
+def decompress(fileobj, compression: str = None):
+    """
+    function that wraps an opened binary file into a stream that
+    decompresses on the fly. Only the read bytes are inflated.
+    For zip archives the first member is read.
+    """
+    if compression is None:
+        return fileobj
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=fileobj, mode='rb')
+    if compression == 'bz2':
+        return bz2.BZ2File(fileobj, mode='rb')
+    if compression == 'xz':
+        return lzma.LZMAFile(fileobj, mode='rb')
+    if compression == 'zip':
+        archive = zipfile.ZipFile(fileobj)
+        return archive.open(archive.namelist()[0])
+    raise ValueError(f"Unknown compression: '{compression}'")
+
+
+def open_binary(path, compression: str = None):
+    """
+    function that opens a (compressed) file as binary stream that
+    decompresses on the fly
+    """
+    if compression == 'gzip':
+        return gzip.open(path, 'rb')
+    if compression == 'bz2':
+        return bz2.open(path, 'rb')
+    if compression == 'xz':
+        return lzma.open(path, 'rb')
+    if compression == 'zip':
+        # the member keeps the archive file open until it is closed
+        with zipfile.ZipFile(path) as archive:
+            return archive.open(archive.namelist()[0])
+    return open(path, 'rb')
+
+
+def open_text(path, compression: str = None, encoding: str = 'utf-8'):
+    """
+    function that opens a (compressed) file as text stream
+    """
+    return io.TextIOWrapper(open_binary(path, compression),
+                            encoding=encoding)
+
+
+def uncompressed_size(path, compression: str = None) -> int:
+    """
+    function that returns the uncompressed size of a file if it is
+    known without inflating it. Returns None for streams (gzip, bz2, xz)
+    whose size is not stored reliably.
+    """
+    if compression is None:
+        return os.path.getsize(path)
+    if compression == 'zip':
+        with zipfile.ZipFile(path) as archive:
+            return archive.infolist()[0].file_size
+    return None
@@ -0,0 +1,69 @@
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import is_object_dtype, infer_dtype
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# non null values per column the datetime formats are inferred from
+DATE_SAMPLE = 1000
+
+_TIME_DIRECTIVES = ('%H', '%I', '%M', '%S', '%f', '%p', '%z', '%Z')
+_MONTH_DIRECTIVES = ('%m', '%b', '%B')
+
+
+def _is_full_date(fmt: str) -> bool:
+    """
+    function that checks if a format has a day and a month. Formats
+    like %Y alone would type plain numbers as dates
+    """
+    return '%d' in fmt and any(d in fmt for d in _MONTH_DIRECTIVES)
+
+
+def is_date_format(fmt: str) -> bool:
+    """
+    function that checks if a datetime format has no time part
+    """
+    return not any(d in fmt for d in _TIME_DIRECTIVES)
+
+
+def infer_date_formats(frame: DataFrame, size: int = DATE_SAMPLE) -> dict:
+    """
+    function that detects string columns holding dates or timestamps.
+    The format is guessed from the first value and checked with one
+    vectorized parse of the first n non null values.
+    Returns a dict of column name to datetime format
+    """
+    formats = {}
+    for col in frame.columns:
+        if not is_object_dtype(frame[col].dtype):
+            continue
+        values = frame[col].dropna().iloc[:size]
+        if not len(values) or infer_dtype(values, skipna=True) != 'string':
+            continue
+        fmt = guess_datetime_format(values.iloc[0])
+        if fmt is None or not _is_full_date(fmt):
+            continue
+        parsed = pd.to_datetime(values, format=fmt, errors='coerce')
+        if parsed.notna().all():
+            formats[col] = fmt
+    return formats
+
+
+def parse_dates(frame: DataFrame, formats: dict) -> DataFrame:
+    """
+    function that converts the columns of the given formats to
+    datetimes. A column with a value that does not match its format
+    is kept as it is
+    """
+    frame = frame.copy(deep=False)
+    for col, fmt in formats.items():
+        if col not in frame.columns or \
+                not is_object_dtype(frame[col].dtype):
+            continue
+        parsed = pd.to_datetime(frame[col], format=fmt, errors='coerce')
+        if parsed.isna().sum() == frame[col].isna().sum():
+            frame[col] = parsed
+    return frame
@@ -0,0 +1,136 @@
+import os
+import glob
+from pathlib import Path
+from pandas.api.types import is_integer_dtype
+
+from ninjasql.db.table_schema import ColumnSchema, TableSchema
+from ninjasql.infer.widening import UNKNOWN, OBJECT, widen
+from ninjasql.infer.stats import merge_stats
+
+_GLOB_CHARS = ('*', '?', '[')
+# kinds of two files that widen to a common kind, all other mixed kinds
+# widen to strings
+_KIND_UNIONS = {
+    frozenset(('date', 'datetime')): 'datetime',
+    frozenset(('integer', 'floating')): 'floating',
+}
+
+
+def expand_files(file) -> list:
+    """
+    function that returns the sorted files of a glob pattern or the
+    given list of files. Returns None for a single file path. An existing
+    file is never taken as pattern, even if its name has glob chars
+    e.g. data[1].csv
+    """
+    if isinstance(file, (list, tuple)):
+        return [Path(f) for f in file]
+    if file is None or not any(c in str(file) for c in _GLOB_CHARS):
+        return None
+    if os.path.exists(file):
+        return None
+    files = sorted(glob.glob(str(file)))
+    if not files:
+        raise FileNotFoundError(f"No file matches the pattern {file}")
+    return [Path(f) for f in files]
+
+
+def _known_dtype(column: ColumnSchema):
+    """
+    function that returns the dtype of a column or UNKNOWN if the
+    inspected file had rows but no value in it
+    """
+    if column.stats.get('count') == 0:
+        return UNKNOWN
+    return column.dtype
+
+
+def _unknown_union(left: ColumnSchema, right: ColumnSchema) -> tuple:
+    """
+    function that returns the dtype and kind of a column without any
+    value in one of the files. The kind of the other file is kept unless
+    the missing values widen its dtype
+    """
+    ldtype, rdtype = _known_dtype(left), _known_dtype(right)
+    known = right if ldtype is UNKNOWN else left
+    dtype = widen(ldtype, rdtype)
+    if dtype is UNKNOWN:
+        return left.dtype, left.kind
+    if dtype == OBJECT and known.dtype != OBJECT:
+        return dtype, 'string'
+    if is_integer_dtype(known.dtype) and not is_integer_dtype(dtype):
+        return dtype, 'floating'
+    return dtype, known.kind
+
+
+def _union_stats(left: ColumnSchema, right: ColumnSchema) -> dict:
+    """
+    function that adds the counts and merges the value statistics of a
+    column of two files
+    """
+    stats = {}
+    for key in ('count', 'nulls'):
+        if key in left.stats and key in right.stats:
+            stats[key] = left.stats[key] + right.stats[key]
+    values = merge_stats(left.stats.get('values', {}),
+                         right.stats.get('values', {}))
+    if values:
+        stats['values'] = values
+    return stats
+
+
+def union_column(left: ColumnSchema, right: ColumnSchema) -> ColumnSchema:
+    """
+    function that merges the schema of a column of two files into the
+    widened column both fit in. The dtypes widen like chunks of one
+    file, dates and timestamps widen to timestamps and all other mixed
+    kinds widen to strings
+    """
+    ldtype, rdtype = _known_dtype(left), _known_dtype(right)
+    if ldtype is UNKNOWN or rdtype is UNKNOWN:
+        dtype, kind = _unknown_union(left, right)
+    elif left.kind == right.kind:
+        dtype, kind = widen(ldtype, rdtype), left.kind
+    else:
+        dtype = widen(ldtype, rdtype)
+        kind = _KIND_UNIONS.get(frozenset((left.kind, right.kind)),
+                                'string')
+    if kind == 'string':
+        dtype = OBJECT
+    return ColumnSchema(name=left.name,
+                        dtype=dtype,
+                        kind=kind,
+                        nullable=left.nullable or right.nullable,
+                        stats=_union_stats(left, right))
+
+
+def union_schemas(schemas: dict) -> tuple:
+    """
+    function that merges the schemas of a family of files into one
+    widened superset schema. A column that is missing in a file is
+    nullable. The column order of the first appearance is kept.
+    Returns the schema and a report which files contributed which
+    columns: {'files': {file: [columns]}, 'columns': {column: [files]}}
+    :param schemas: dict of file to its TableSchema
+    """
+    merged = {}
+    report = {'files': {}, 'columns': {}}
+    for file, schema in schemas.items():
+        file = str(file)
+        report['files'][file] = schema.names
+        for column in schema:
+            report['columns'].setdefault(column.name, []).append(file)
+            if column.name in merged:
+                merged[column.name] = union_column(merged[column.name],
+                                                   column)
+            else:
+                merged[column.name] = column
+    for name, files in report['columns'].items():
+        if len(files) < len(schemas) and not merged[name].nullable:
+            column = merged[name]
+            merged[name] = ColumnSchema(name=column.name,
+                                        dtype=column.dtype,
+                                        kind=column.kind,
+                                        nullable=True,
+                                        stats=column.stats)
+    return TableSchema(columns=list(merged.values())), report
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import (
+    is_integer_dtype,
+    is_float_dtype,
+    is_object_dtype)
+
+# rows of the head the categorical columns of a read are chosen on
+CATEGORY_SAMPLE = 1000
+
+
+def project(frame: DataFrame, usecols: list = None) -> DataFrame:
+    """
+    function that keeps only the given columns of a frame in file order
+    """
+    if usecols is None:
+        return frame
+    return frame[[c for c in frame.columns if c in usecols]]
+
+
+def downcast_numeric(frame: DataFrame) -> DataFrame:
+    """
+    function that downcasts integer columns to the smallest integer
+    dtype that holds all values and float columns to float32 if no
+    value changes by it
+    """
+    frame = frame.copy(deep=False)
+    for col in frame.columns:
+        dt = frame[col].dtype
+        if is_integer_dtype(dt):
+            frame[col] = pd.to_numeric(frame[col], downcast='integer')
+        elif is_float_dtype(dt) and dt != np.float32:
+            values = frame[col].to_numpy()
+            narrow = values.astype(np.float32)
+            with np.errstate(over='ignore', invalid='ignore'):
+                same = (narrow.astype(dt) == values) | np.isnan(values)
+            if same.all():
+                frame[col] = narrow
+    return frame
+
+
+def categorize(frame: DataFrame, ratio: float) -> DataFrame:
+    """
+    function that converts string columns with few distinct values to
+    categoricals. A column is converted if its number of distinct values
+    is at most ratio times its number of rows
+    """
+    rows = len(frame)
+    if not rows:
+        return frame
+    frame = frame.copy(deep=False)
+    for col in frame.columns:
+        if is_object_dtype(frame[col].dtype) and \
+                frame[col].nunique() <= ratio * rows:
+            frame[col] = frame[col].astype('category')
+    return frame
+
+
+def category_dtypes(head: DataFrame, ratio: float, exclude=()) -> dict:
+    """
+    function that returns the read dtypes of the string columns that
+    are categorized on the head of a file, so they are parsed as
+    categoricals and never held as strings
+    :param exclude: columns that are not categorized e.g. date columns
+    """
+    head = categorize(head, ratio=ratio)
+    return {col: 'category' for col in head.columns
+            if col not in exclude and head[col].dtype.name == 'category'}
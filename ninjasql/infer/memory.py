@@ -0,0 +1,159 @@
+import os
+import re
+import threading
+from pandas import DataFrame
+
+# rows of the head sample used to estimate the parsed size of a file
+ESTIMATE_ROWS = 1000
+# pandas needs about twice the size of a chunk while parsing it
+PARSE_OVERHEAD = 2
+# seconds between two resident memory samples where the peak of the
+# process can not be reset
+SAMPLE_INTERVAL = 0.01
+
+_UNITS = {'': 1, 'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30,
+          'TB': 1 << 40}
+_SIZE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?B?)\s*$', re.IGNORECASE)
+
+
+def parse_size(value) -> int:
+    """
+    function that converts a memory size like 512MB or 2GB into bytes.
+    Integers are taken as bytes
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _SIZE.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid memory size: '{value}'")
+    number, unit = match.groups()
+    unit = unit.upper()
+    if unit and not unit.endswith('B'):
+        unit += 'B'
+    return int(float(number) * _UNITS[unit])
+
+
+def row_bytes(sample: DataFrame) -> float:
+    """
+    function that returns the average in memory bytes of a parsed row
+    """
+    if not len(sample):
+        return 0.0
+    return sample.memory_usage(deep=True, index=True).sum() / len(sample)
+
+
+def fitting_rows(budget: int, bytes_per_row: float) -> int:
+    """
+    function that returns how many rows can be parsed at once within
+    a memory budget
+    """
+    if bytes_per_row <= 0:
+        return None
+    return max(1, int(budget / (bytes_per_row * PARSE_OVERHEAD)))
+
+
+def current_rss():
+    """
+    function that returns the resident memory of the process in bytes.
+    Returns None if the platform does not report it
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def family_memory_report(max_memory: int, reports: dict) -> dict:
+    """
+    function that merges the memory reports of the files of a family.
+    The peak is the highest peak of a file, the files are inspected one
+    after the other or in separate processes
+    :param reports: dict of file path to its memory report or None
+    """
+    peaks = [r['peak_bytes'] for r in reports.values()
+             if r and r['peak_bytes'] is not None]
+    return {
+        'max_memory': max_memory,
+        'peak_bytes': max(peaks) if peaks else None,
+        'files': reports
+    }
+
+
+def reset_peak_rss() -> bool:
+    """
+    function that resets the peak resident memory (VmHWM) of the process
+    to the current resident memory. Returns False if the platform does
+    not support it (linux 4.0+ only)
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """
+    function that returns the peak resident memory (VmHWM) of the process
+    in bytes. Returns None if the platform does not report it
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class PeakMemory(object):
+    """
+    Context manager that measures the peak resident memory of the
+    process while the block runs above the resident memory before it.
+    On linux the peak of the process is reset when the block starts, so
+    every block reports its own peak. Where it can not be reset the
+    resident memory is sampled every SAMPLE_INTERVAL seconds in a
+    background thread. Nothing is traced, so the block runs at full
+    speed. None if the platform does not report the resident memory
+    (no /proc, e.g. macos and windows)
+    """
+
+    def __init__(self):
+        self.peak = None
+        self._base = None
+        self._reset = False
+        self._sampled = None
+        self._stop = None
+        self._thread = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self._sampled = max(self._sampled, current_rss() or 0)
+
+    def __enter__(self):
+        self._base = current_rss()
+        if self._base is None:
+            return self
+        self._reset = reset_peak_rss()
+        if not self._reset:
+            self._sampled = self._base
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._base is None:
+            return False
+        if self._reset:
+            peak = peak_rss()
+        else:
+            self._stop.set()
+            self._thread.join()
+            peak = max(self._sampled, current_rss() or 0)
+        if peak is not None:
+            self.peak = max(0, peak - self._base)
+        return False
@@ -0,0 +1,203 @@
+import io
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import is_bool_dtype
+
+from ninjasql.infer.widening import (
+    OBJECT,
+    frame_dtypes,
+    merge_dtypes,
+    resolve_dtypes,
+    empty_frame)
+
+# block size used to scan the file for record boundaries
+SCAN_BLOCK = 1 << 20
+# upper bound of bytes one worker parses at once
+RANGE_BYTES = 64 << 20
+
+
+def _count_quotes(block: bytes, quotechar: bytes, start=0, end=None) -> int:
+    """
+    function that returns the parity of quote chars in a block
+    """
+    end = len(block) if end is None else end
+    return block.count(quotechar, start, end) & 1
+
+
+def record_boundaries(path,
+                      start: int,
+                      targets: list,
+                      quotechar: bytes = b'"') -> list:
+    """
+    function that moves every target byte offset to the start of the
+    next record. A line break only ends a record if the number of quote
+    chars in front of it is even, so quoted line breaks never split a
+    record. Doubled quotes ("") keep the parity. The file is scanned
+    once with bytes.count, nothing is parsed.
+    :param path: csv file path
+    :param start: offset of the first data record
+    :param targets: ascending byte offsets where the file shall be split
+    :param quotechar: quote char of the csv dialect
+    """
+    boundaries = []
+    parity = 0
+    pos = start
+    with open(path, 'rb') as f:
+        f.seek(start)
+        for target in targets:
+            if target <= pos:
+                continue
+            while pos < target:
+                block = f.read(min(SCAN_BLOCK, target - pos))
+                if not block:
+                    return boundaries
+                parity ^= _count_quotes(block, quotechar)
+                pos += len(block)
+            boundary = None
+            while boundary is None:
+                block = f.read(SCAN_BLOCK)
+                if not block:
+                    return boundaries
+                i = 0
+                while True:
+                    nl = block.find(b'\n', i)
+                    if nl == -1:
+                        parity ^= _count_quotes(block, quotechar, i)
+                        pos += len(block)
+                        break
+                    parity ^= _count_quotes(block, quotechar, i, nl)
+                    if parity == 0:
+                        boundary = pos + nl + 1
+                        break
+                    i = nl + 1
+            boundaries.append(boundary)
+            pos = boundary
+            f.seek(boundary)
+    return boundaries
+
+
+def split_ranges(path,
+                 parts: int,
+                 header_rows: int = 0,
+                 quotechar: bytes = b'"') -> tuple:
+    """
+    function that splits a csv file in byte ranges of whole records.
+    Returns the header bytes and a list of (begin, end) offsets
+    """
+    fsize = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        head = b''.join(f.readline() for _ in range(header_rows))
+        start = f.tell()
+    parts = max(1, parts)
+    span = fsize - start
+    targets = [start + span * n // parts for n in range(1, parts)]
+    bounds = [start] + record_boundaries(path=path,
+                                         start=start,
+                                         targets=targets,
+                                         quotechar=quotechar) + [fsize]
+    ranges = [(b, e) for b, e in zip(bounds[:-1], bounds[1:]) if e > b]
+    return head, ranges
+
+
+def _parse_range(byte_range: tuple,
+                 path,
+                 head: bytes,
+                 schema_only: bool,
+                 read_options: dict):
+    """
+    function that parses one byte range of a csv file in a worker
+    process. Returns the frame or only its dtypes
+    """
+    begin, end = byte_range
+    with open(path, 'rb') as f:
+        f.seek(begin)
+        body = f.read(end - begin)
+    frame = pd.read_csv(io.BytesIO(head + body), **read_options)
+    if schema_only:
+        return frame_dtypes(frame)
+    return frame
+
+
+def _has_text(frame: DataFrame, col) -> bool:
+    """
+    function that returns True if a column of a frame has values that
+    are not bools
+    """
+    if col not in frame.columns:
+        return False
+    values = frame[col].dropna()
+    return len(values) > 0 and not is_bool_dtype(values.infer_objects())
+
+
+def _cast_ranges(frames: list) -> list:
+    """
+    function that casts the frames of all ranges to their widened
+    dtypes. A column that is a text column in one range is a text
+    column of the whole file, so its numeric values of other ranges are
+    converted to str. Columns of bools and NaN stay bools
+    """
+    dtypes = {}
+    for frame in frames:
+        dtypes = merge_dtypes(dtypes, frame_dtypes(frame))
+    dtypes = resolve_dtypes(dtypes)
+    text = [col for col, dt in dtypes.items() if dt == OBJECT and
+            any(_has_text(frame, col) for frame in frames)]
+    cast = []
+    for frame in frames:
+        frame = frame.astype({col: dt for col, dt in dtypes.items()
+                              if col not in text})
+        for col in text:
+            values = frame[col]
+            frame[col] = values.where(values.isna(),
+                                      values.astype(str)).astype(OBJECT)
+        cast.append(frame)
+    return cast
+
+
+def parallel_read_csv(workers: int = None,
+                      header_rows: int = 0,
+                      schema_only: bool = False,
+                      range_bytes: int = RANGE_BYTES,
+                      **read_options) -> DataFrame:
+    """
+    function that parses a csv file in byte ranges across a process
+    pool. The ranges are combined into the same frame a single
+    pd.read_csv returns. With schema_only the workers only return their
+    dtypes, which are widened to one schema and an empty frame carrying
+    it is returned.
+    :param workers: Number of worker processes (default cpu count)
+    :param header_rows: Number of lines in front of the first data row
+    :param schema_only: Only infer the dtypes
+    :param range_bytes: Upper bound of bytes per parsed range
+    :param read_options: pandas read_csv options
+    """
+    path = read_options.pop('filepath_or_buffer')
+    if read_options.pop('compression', None):
+        raise ValueError("A compressed file can not be split in byte ranges")
+    quotechar = read_options.get('quotechar', '"').encode()
+    workers = workers or os.cpu_count() or 1
+    parts = max(workers, -(-os.path.getsize(path) // range_bytes))
+    head, ranges = split_ranges(path=path,
+                                parts=parts,
+                                header_rows=header_rows,
+                                quotechar=quotechar)
+    if not ranges:
+        return pd.read_csv(io.BytesIO(head), **read_options)
+
+    parse = partial(_parse_range,
+                    path=path,
+                    head=head,
+                    schema_only=schema_only,
+                    read_options=read_options)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(parse, ranges))
+
+    if schema_only:
+        dtypes = {}
+        for res in results:
+            dtypes = merge_dtypes(dtypes, res)
+        return empty_frame(resolve_dtypes(dtypes))
+    return pd.concat(_cast_ranges(results), ignore_index=True)
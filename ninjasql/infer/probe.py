@@ -0,0 +1,102 @@
+import re
+import json
+import pandas as pd
+
+from ninjasql.infer.compression import open_text
+
+# first block size of a json header probe, doubled until a record is found
+PROBE_BLOCK = 65536
+
+_JSON_DECODER = json.JSONDecoder()
+_FIRST_KEY = re.compile(r'\s*\{\s*"(?:[^"\\]|\\.)*"\s*:\s*')
+_SPLIT_COLUMNS = re.compile(r'"columns"\s*:\s*')
+
+
+def probe_csv_columns(**read_options) -> list:
+    """
+    function that returns the columns of a csv file by parsing
+    only the header
+    :param read_options: pandas read_csv options
+    """
+    return list(pd.read_csv(nrows=0, **read_options).columns)
+
+
+def _json_prefix_columns(text: str, orient: str) -> list:
+    """
+    function that tries to get the columns from the beginning of
+    a json document. Returns None if the prefix is not long enough
+    """
+    try:
+        if orient == 'records':
+            start = text.index('{')
+            record, _ = _JSON_DECODER.raw_decode(text, start)
+            return list(record.keys())
+        if orient == 'index':
+            match = _FIRST_KEY.match(text)
+            if not match:
+                return None
+            record, _ = _JSON_DECODER.raw_decode(text, match.end())
+            return list(record.keys())
+        if orient == 'split':
+            match = _SPLIT_COLUMNS.search(text)
+            if not match:
+                return None
+            columns, _ = _JSON_DECODER.raw_decode(text, match.end())
+            return list(columns)
+    except ValueError:
+        return None
+    return None
+
+
+def probe_json_columns(path,
+                       orient: str,
+                       lines: bool = False,
+                       compression: str = None) -> list:
+    """
+    function that returns the columns of a json file by decoding
+    only the first record. Supported orients are records, index and
+    split. For json lines the first line is decoded. A compressed file
+    is only inflated as far as needed. Returns None if the orient is
+    not supported or no record can be found
+    """
+    if lines:
+        with open_text(path, compression) as f:
+            for line in f:
+                if line.strip():
+                    return list(json.loads(line).keys())
+        return None
+    if orient not in ('records', 'index', 'split'):
+        return None
+    size = PROBE_BLOCK
+    text = ''
+    with open_text(path, compression) as f:
+        while True:
+            block = f.read(size)
+            if not block:
+                return None
+            text += block
+            columns = _json_prefix_columns(text, orient)
+            if columns is not None:
+                return columns
+            size *= 2
+
+
+def schema_drift(expected, actual: list) -> dict:
+    """
+    function that compares the columns of a file with expected columns
+    :param expected: list of column names or dict of column name to dtype
+    :param actual: list of column names of the new file
+    """
+    expected = list(expected)
+    actual = list(actual)
+    added = [c for c in actual if c not in expected]
+    removed = [c for c in expected if c not in actual]
+    common_exp = [c for c in expected if c in actual]
+    common_act = [c for c in actual if c in expected]
+    reordered = common_exp != common_act
+    return {
+        'drift': bool(added or removed or reordered),
+        'added': added,
+        'removed': removed,
+        'reordered': reordered
+    }
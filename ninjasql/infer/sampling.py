@@ -0,0 +1,339 @@
+import io
+import os
+import random
+from typing import Iterable, Callable
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from ninjasql.infer.compression import decompress, uncompressed_size
+from ninjasql.infer.widening import (
+    UNKNOWN,
+    OBJECT,
+    frame_dtypes,
+    merge_dtypes,
+    resolve_dtypes)
+
+# number of byte offsets the stratified sampler seeks to
+STRATA = 100
+# bytes after a byte offset searched for the start of a csv record and
+# number of records that must parse to accept it
+ALIGN_WINDOW = 1 << 16
+ALIGN_BLOCK = 1 << 12
+ALIGN_RECORDS = 2
+
+
+def _count_bytes(path, lines: int, compression: str = None) -> tuple:
+    """
+    function that returns the number of (uncompressed) bytes and lines
+    of the first n lines of a file and the number of file bytes read
+    for them
+    """
+    nbytes = 0
+    nlines = 0
+    with open(path, 'rb') as raw:
+        f = decompress(raw, compression)
+        for line in f:
+            if nlines == lines:
+                break
+            nbytes += len(line)
+            nlines += 1
+        consumed = raw.tell()
+    return nbytes, nlines, consumed
+
+
+def head_sample(read: Callable,
+                path,
+                size: int,
+                header_rows: int,
+                compression: str = None) -> tuple:
+    """
+    function that reads the first n rows of a file. A compressed file
+    is only inflated as far as the sample reaches.
+    Returns the sample and the estimated number of rows of the file
+    :param read: pandas reader function e.g. a partial of pd.read_csv
+    :param path: file path
+    :param size: Number of rows in the sample
+    :param header_rows: Number of lines in front of the first data row
+    :param compression: pandas compression name of the file
+    """
+    frame = read(path, nrows=size)
+    if len(frame) < size:
+        return frame, len(frame)
+    nbytes, nlines, consumed = _count_bytes(path,
+                                            lines=header_rows + len(frame),
+                                            compression=compression)
+    row_bytes = max(nbytes, 1) / max(nlines, 1)
+    total_bytes = uncompressed_size(path, compression)
+    if total_bytes is None:
+        # scale the inflated bytes by the share of the file read so far
+        total_bytes = os.path.getsize(path) * nbytes / max(consumed, 1)
+    return frame, max(len(frame), int(total_bytes / row_bytes) - header_rows)
+
+
+def reservoir_sample(chunks: Iterable[DataFrame],
+                     size: int,
+                     seed: int = None) -> tuple:
+    """
+    function that draws a uniform sample of n rows out of a chunked
+    dataset. Every row gets a random key and the rows with the n
+    smallest keys are kept, so at most one chunk plus the sample is
+    held in memory. Because every chunk is seen the dtypes of the
+    returned sample are the widened dtypes of the whole file.
+    Returns the sample and the number of rows of the file
+    """
+    rng = np.random.default_rng(seed)
+    sample = None
+    keys = np.empty(0)
+    dtypes = {}
+    total = 0
+    for chunk in chunks:
+        dtypes = merge_dtypes(dtypes, frame_dtypes(chunk))
+        total += len(chunk)
+        chunk_keys = rng.random(len(chunk))
+        if sample is None:
+            sample = chunk.iloc[:0]
+        sample = pd.concat([sample, chunk], ignore_index=True)
+        keys = np.concatenate([keys, chunk_keys])
+        if len(sample) > size:
+            keep = np.argpartition(keys, size)[:size]
+            keep.sort()
+            sample = sample.iloc[keep].reset_index(drop=True)
+            keys = keys[keep]
+    if sample is None:
+        return DataFrame(), 0
+    return sample.astype(resolve_dtypes(dtypes)), total
+
+
+def _line_starts(path, targets: list) -> list:
+    """
+    function that moves every target byte offset to the start of the
+    next line
+    """
+    starts = []
+    with open(path, 'rb') as f:
+        for target in targets:
+            f.seek(target)
+            f.readline()
+            if f.tell() >= os.path.getsize(path):
+                break
+            starts.append(f.tell())
+    return starts
+
+
+def _read_records(f, count: int, quotechar: bytes = None) -> list:
+    """
+    function that reads the next n records of a file. With a quote char
+    a line break only ends a record if the number of quote chars in the
+    record is even, so quoted line breaks stay in the record
+    """
+    records = []
+    record = b''
+    parity = 0
+    while len(records) < count:
+        line = f.readline()
+        if not line:
+            break
+        record += line
+        if quotechar:
+            parity ^= line.count(quotechar) & 1
+        if parity == 0:
+            records.append(record)
+            record = b''
+    return [r if r.endswith(b'\n') else r + b'\n' for r in records]
+
+
+def _field_count(record: bytes, delimiter: bytes, quotechar: bytes) -> int:
+    """
+    function that returns the number of fields of a csv record. Only
+    delimiters outside of quotes separate fields, doubled quotes ("")
+    keep the quote state
+    """
+    outside = record.split(quotechar)[::2]
+    return 1 + sum(part.count(delimiter) for part in outside)
+
+
+def _window_records(block: bytes, begin: int, quotechar: bytes) -> list:
+    """
+    function that splits a block from position begin in up to
+    ALIGN_RECORDS records. A line break only ends a record if the
+    number of quote chars in the record is even
+    """
+    records = []
+    record_start = pos = begin
+    parity = 0
+    while len(records) < ALIGN_RECORDS:
+        nl = block.find(b'\n', pos)
+        if nl == -1:
+            break
+        parity ^= block.count(quotechar, pos, nl) & 1
+        pos = nl + 1
+        if parity == 0:
+            records.append(block[record_start:pos])
+            record_start = pos
+    return records
+
+
+def _first_record_start(block: bytes,
+                        at_end: bool,
+                        quotechar: bytes,
+                        delimiter: bytes,
+                        fields: int) -> int:
+    """
+    function that returns the position after the first line break of a
+    block where the next records parse to the number of fields, or None
+    """
+    nl = block.find(b'\n')
+    while nl != -1 and nl + 1 < len(block):
+        records = _window_records(block, nl + 1, quotechar)
+        if (len(records) == ALIGN_RECORDS or (at_end and records)) and \
+                all(_field_count(r, delimiter, quotechar) == fields
+                    for r in records):
+            return nl + 1
+        nl = block.find(b'\n', nl + 1)
+    return None
+
+
+def _record_starts(path,
+                   start: int,
+                   targets: list,
+                   quotechar: bytes,
+                   delimiter: bytes) -> list:
+    """
+    function that moves every target byte offset to the start of the
+    next csv record. The quote state at an offset is unknown, so every
+    line break within ALIGN_WINDOW bytes after it is a candidate and the
+    first candidate whose next records parse to the field count of the
+    first record of the file is taken. Only the window of each offset is
+    read, not the file in front of it. Offsets without a candidate are
+    dropped
+    """
+    starts = []
+    with open(path, 'rb') as f:
+        f.seek(start)
+        first = _read_records(f, 1, quotechar)
+        if not first:
+            return starts
+        fields = _field_count(first[0], delimiter, quotechar)
+        for target in targets:
+            f.seek(target)
+            block = b''
+            found = None
+            while found is None and len(block) < ALIGN_WINDOW:
+                more = f.read(min(ALIGN_BLOCK, ALIGN_WINDOW - len(block)))
+                block += more
+                found = _first_record_start(block=block,
+                                            at_end=not more,
+                                            quotechar=quotechar,
+                                            delimiter=delimiter,
+                                            fields=fields)
+                if not more:
+                    break
+            if found is not None:
+                starts.append(target + found)
+    return starts
+
+
+def stratified_sample(read: Callable,
+                      path,
+                      size: int,
+                      header_rows: int,
+                      strata: int = STRATA,
+                      seed: int = None,
+                      quotechar: bytes = None,
+                      delimiter: bytes = b',') -> tuple:
+    """
+    function that samples a line based file (csv, json lines) by
+    seeking to random byte offsets.
+    The file is split in strata of equal byte size. In every stratum a
+    random offset is taken, aligned to the next record start and the
+    following records are read. Only the sampled records are parsed.
+    With a quote char the offsets are aligned with _record_starts, which
+    checks the quote state by parsing the records after a line break, so
+    csv records with quoted line breaks are never split. The bytes read
+    do not grow with the file size.
+    Returns the sample and the estimated number of rows of the file
+    :param read: pandas reader function that parses a bytes buffer
+    :param quotechar: quote char of a csv file, None for json lines
+    :param delimiter: field delimiter of a csv file
+    """
+    fsize = os.path.getsize(path)
+    rand = random.Random(seed)
+    strata = max(1, min(strata, size))
+    rows_per_stratum = max(1, size // strata)
+
+    with open(path, 'rb') as f:
+        head = b''.join(f.readline() for _ in range(header_rows))
+    start = len(head)
+    span = max(fsize - start, 1)
+    offsets = []
+    for n in range(strata):
+        low = start + span * n // strata
+        high = start + span * (n + 1) // strata
+        offset = rand.randint(low, max(low, high - 1))
+        if offset >= fsize:
+            break
+        offsets.append(offset)
+    # step back one byte so an offset on a record start is not skipped
+    targets = [o - 1 for o in offsets if o > start]
+    if quotechar:
+        starts = _record_starts(path=path,
+                                start=start,
+                                targets=targets,
+                                quotechar=quotechar,
+                                delimiter=delimiter)
+    else:
+        starts = _line_starts(path, targets)
+    if len(targets) < len(offsets):
+        starts = [start] + starts
+
+    lines = []
+    nbytes = 0
+    last_end = start
+    with open(path, 'rb') as f:
+        for offset in starts:
+            f.seek(max(offset, last_end))
+            for record in _read_records(f, rows_per_stratum, quotechar):
+                lines.append(record)
+                nbytes += len(record)
+            last_end = f.tell()
+
+    if not lines:
+        return read(io.BytesIO(head)), 0
+    frame = read(io.BytesIO(head + b''.join(lines)))
+    row_bytes = nbytes / len(lines)
+    return frame, max(len(frame), int(span / row_bytes))
+
+
+def sample_confidence(frame: DataFrame,
+                      total_rows: int,
+                      exact_dtypes: bool = False) -> dict:
+    """
+    function that reports how confident the schema of a sample is.
+    If the sample has n rows and no row shows a wider type, the share
+    of rows with a wider type in the file is below 3/n with 95%
+    confidence (rule of three). The column confidence is one minus
+    this bound. object columns can not be widened any further and
+    columns without any value in the sample have no confidence.
+    :param frame: Sample dataframe
+    :param total_rows: Number of rows in the whole file (estimated)
+    :param exact_dtypes: True if the dtypes are known to be exact
+    """
+    rows = len(frame)
+    complete = exact_dtypes or rows >= total_rows
+    bound = 0.0 if complete else min(1.0, 3 / max(rows, 1))
+    columns = {}
+    for col, dt in frame_dtypes(frame).items():
+        if dt is UNKNOWN and not complete:
+            columns[col] = 0.0
+        elif complete or dt == OBJECT:
+            columns[col] = 1.0
+        else:
+            columns[col] = round(1.0 - bound, 6)
+    return {
+        'sample_rows': rows,
+        'total_rows': total_rows,
+        'fraction': (min(1.0, rows / total_rows) if total_rows else 1.0),
+        'max_unseen_rate': bound,
+        'columns': columns
+    }
@@ -0,0 +1,99 @@
+import numpy as np
+from pandas import DataFrame, Series
+
+from ninjasql.db.table_schema import column_kind
+
+# largest number of decimal places a float column is typed as decimal with
+MAX_SCALE = 6
+_NUMERIC_KINDS = ('integer', 'floating')
+
+
+def decimal_scale(values: np.ndarray, max_scale: int = MAX_SCALE) -> int:
+    """
+    function that returns the number of decimal places needed to hold
+    all float values exactly. Returns None if more than max_scale places
+    are needed
+    """
+    rtol = np.finfo(values.dtype).eps * 8
+    for scale in range(max_scale + 1):
+        scaled = values * 10 ** scale
+        if np.allclose(scaled, np.round(scaled), rtol=rtol, atol=0):
+            return scale
+    return None
+
+
+def column_stats(values: Series, kind: str) -> dict:
+    """
+    function that computes the value statistics of a column needed for
+    narrow SQL types with vectorized passes:
+    string: max byte length (utf-8), integer: min and max,
+    floating: min, max and decimal scale
+    """
+    values = values.dropna()
+    if not len(values):
+        return {}
+    if kind == 'string':
+        nbytes = values.astype(str).str.encode('utf-8').str.len()
+        return {'kind': kind, 'max_bytes': int(nbytes.max())}
+    if kind == 'integer':
+        array = values.to_numpy()
+        return {'kind': kind, 'min': int(array.min()),
+                'max': int(array.max()), 'scale': 0}
+    if kind == 'floating':
+        array = values.to_numpy()
+        if not np.isfinite(array).all():
+            return {'kind': kind, 'scale': None}
+        return {'kind': kind, 'min': float(array.min()),
+                'max': float(array.max()), 'scale': decimal_scale(array)}
+    return {'kind': kind}
+
+
+def merge_stats(left: dict, right: dict) -> dict:
+    """
+    function that merges the value statistics of two chunks of a column.
+    Integer and float chunks merge to float statistics. A string column
+    with chunks of another kind gets no max byte length, because the
+    text of the other values is not known any more
+    """
+    if not left:
+        return dict(right)
+    if not right:
+        return dict(left)
+    lkind, rkind = left.get('kind'), right.get('kind')
+    if lkind == rkind:
+        kind = lkind
+    elif lkind in _NUMERIC_KINDS and rkind in _NUMERIC_KINDS:
+        kind = 'floating'
+    else:
+        return {'kind': 'string' if 'string' in (lkind, rkind) else None}
+    merged = {'kind': kind}
+    if 'max_bytes' in left and 'max_bytes' in right:
+        merged['max_bytes'] = max(left['max_bytes'], right['max_bytes'])
+    if 'min' in left and 'min' in right:
+        merged['min'] = min(left['min'], right['min'])
+        merged['max'] = max(left['max'], right['max'])
+    if 'scale' in left and 'scale' in right:
+        if left['scale'] is None or right['scale'] is None:
+            merged['scale'] = None
+        else:
+            merged['scale'] = max(left['scale'], right['scale'])
+    return merged
+
+
+def frame_stats(frame: DataFrame) -> dict:
+    """
+    function that returns the value statistics of all columns of a frame
+    """
+    return {col: column_stats(frame[col], column_kind(frame[col]))
+            for col in frame.columns}
+
+
+def merge_frame_stats(left: dict, right: dict) -> dict:
+    """
+    function that merges the value statistics of two chunks. A column
+    missing on one side keeps the statistics of the other side
+    """
+    merged = dict(left)
+    for col, stats in right.items():
+        merged[col] = merge_stats(left.get(col, {}), stats)
+    return merged
@@ -0,0 +1,113 @@
+from typing import Iterable, Iterator
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import (
+    is_bool_dtype,
+    is_integer_dtype,
+    is_float_dtype)
+
+# A column that only holds NaN values in a chunk does not say anything about
+# its type. It is kept as UNKNOWN until another chunk gives a real dtype.
+UNKNOWN = None
+
+OBJECT = np.dtype('object')
+FLOAT = np.dtype('float64')
+
+
+def frame_dtypes(frame: DataFrame) -> dict:
+    """
+    function that returns the dtypes of a (chunk) dataframe. Columns
+    without any value are returned as UNKNOWN
+    """
+    dtypes = {}
+    for col in frame.columns:
+        if frame[col].isna().all():
+            dtypes[col] = UNKNOWN
+        else:
+            dtypes[col] = frame[col].dtype
+    return dtypes
+
+
+def widen(left, right):
+    """
+    function that returns the narrowest dtype both given dtypes fit in.
+    The rules follow what pandas does on a full read:
+    int -> float -> object, bool -> object and
+    NaN only (UNKNOWN) + int -> float, NaN only + bool -> object
+    """
+    if left is UNKNOWN and right is UNKNOWN:
+        return UNKNOWN
+    if left is UNKNOWN or right is UNKNOWN:
+        known = right if left is UNKNOWN else left
+        if is_bool_dtype(known):
+            return OBJECT
+        if is_integer_dtype(known):
+            return FLOAT
+        return known
+    if left == right:
+        return left
+    if is_bool_dtype(left) or is_bool_dtype(right):
+        return OBJECT
+    if (is_integer_dtype(left) or is_float_dtype(left)) and \
+            (is_integer_dtype(right) or is_float_dtype(right)):
+        return np.promote_types(left, right)
+    return OBJECT
+
+
+def merge_dtypes(left: dict, right: dict) -> dict:
+    """
+    function that merges two dtype dicts into a widened one. A column
+    that is missing on one side is handled as UNKNOWN for that side.
+    The column order of the first appearance is kept. An empty dict
+    stands for no seen data and returns the other side unchanged.
+    """
+    if not left:
+        return dict(right)
+    if not right:
+        return dict(left)
+    merged = {}
+    for col in list(left.keys()) + [c for c in right if c not in left]:
+        merged[col] = widen(left.get(col, UNKNOWN), right.get(col, UNKNOWN))
+    return merged
+
+
+def resolve_dtypes(dtypes: dict) -> dict:
+    """
+    function that replaces all UNKNOWN dtypes with float64 as pandas
+    does for columns without any value
+    """
+    return {col: (FLOAT if dt is UNKNOWN else dt)
+            for col, dt in dtypes.items()}
+
+
+def iter_infer_chunks(chunks: Iterable[DataFrame]) -> Iterator[dict]:
+    """
+    function that yields the widened dtypes after every chunk. The
+    first schema is available after the first chunk and only gets
+    wider with every further chunk
+    """
+    dtypes = {}
+    for chunk in chunks:
+        dtypes = merge_dtypes(dtypes, frame_dtypes(chunk))
+        yield resolve_dtypes(dtypes)
+
+
+def infer_from_chunks(chunks: Iterable[DataFrame]) -> dict:
+    """
+    function that infers the dtypes of a chunked dataset. Only one chunk
+    is held in memory at a time
+    """
+    dtypes = {}
+    for dtypes in iter_infer_chunks(chunks):
+        pass
+    return dtypes
+
+
+def empty_frame(dtypes: dict) -> DataFrame:
+    """
+    function that creates a dataframe without rows that carries
+    the given dtypes
+    """
+    return DataFrame({col: pd.Series(dtype=dt)
+                      for col, dt in dtypes.items()})
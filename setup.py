@@ -35,11 +35,14 @@ setup(
         'decorator==4.4.2',
         'networkx==2.4',
         'numpy==1.18.2',
-        'pandas==1.0.3',
+        'pandas==1.1.5',
         'python-dateutil==2.8.1',
         'pytz==2019.3',
         'six==1.14.0',
         'sqlalchemy==1.3.15'
     ],
+    extras_require={
+        'arrow': ['pyarrow'],
+    },
     zip_safe=False,
 )
@@ -4,6 +4,8 @@ from sqlalchemy.ext.declarative import declarative_base
 from tests import db
 
 DBPATH = os.path.dirname(db.__file__)
+# url of a postgresql 15+ test database, the MERGE tests run only with it
+POSTGRES15_URL = os.environ.get('NINJASQL_POSTGRES15_URL')
 
 
 def get_engine():
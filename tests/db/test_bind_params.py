@@ -0,0 +1,33 @@
+import unittest
+from sqlalchemy import MetaData, Table, Column, select
+from sqlalchemy.types import DateTime
+
+from ninjasql.db.bind_params import DateParam
+from ninjasql.db.dialects import load_dialect
+
+
+class DateParamTest(unittest.TestCase):
+
+    def test_placeholder(self):
+        """
+        test if a date parameter is a placeholder of the dialect and
+        other values stay literals
+        """
+        table = Table("T25", MetaData(), Column("LOAD_DATE", DateTime))
+        stmt = select([table.c.LOAD_DATE]).where(
+            table.c.LOAD_DATE == DateParam('batch_date'))
+        compiled = stmt.compile(dialect=load_dialect("postgresql"),
+                                compile_kwargs={"literal_binds": True})
+        self.assertIn('"T25"."LOAD_DATE" = %(batch_date)s', str(compiled))
+        self.assertEqual(compiled.date_params, ['batch_date'])
+
+    def test_invalid_name(self):
+        """
+        test if an unknown date parameter raises an error
+        """
+        with self.assertRaises(ValueError):
+            DateParam('load_date')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from sqlalchemy.dialects.postgresql.base import PGDialect
+from sqlalchemy.dialects.mssql.base import MSDialect
+
+from ninjasql.db.dialects import load_dialect, resolve_dialect
+from tests.db.db_helper import get_engine
+
+
+class DialectTest(unittest.TestCase):
+
+    def test_load_dialect(self):
+        """
+        test if a dialect is loaded by name without an engine
+        """
+        self.assertIsInstance(load_dialect("postgresql"), PGDialect)
+        self.assertIsInstance(load_dialect("mssql+pyodbc"), MSDialect)
+        with self.assertRaises(ValueError):
+            load_dialect("XXYUI")
+
+    def test_resolve_dialect(self):
+        """
+        test if a given dialect wins over the dialect of the connection
+        """
+        engine = get_engine()
+        self.assertIs(resolve_dialect(con=engine), engine.dialect)
+        self.assertIsInstance(resolve_dialect(con=engine,
+                                              dialect="postgresql"),
+                              PGDialect)
+        dialect = load_dialect("mssql")
+        self.assertIs(resolve_dialect(dialect=dialect), dialect)
+        self.assertIsInstance(resolve_dialect(con="postgresql://u@h/db"),
+                              PGDialect)
+        self.assertIsNone(resolve_dialect())
+
+
+if __name__ == "__main__":
+    unittest.main()
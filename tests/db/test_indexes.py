@@ -0,0 +1,57 @@
+import unittest
+from sqlalchemy import MetaData, Table, Column
+from sqlalchemy.types import Integer, Text, DateTime
+
+from ninjasql.db.dialects import load_dialect
+from ninjasql.db.indexes import (
+    index_name,
+    staging_index,
+    history_index,
+    index_ddl)
+
+
+class IndexesTest(unittest.TestCase):
+
+    def _table(self, name, *columns):
+        return Table(name, MetaData(), Column("Id", Integer),
+                     Column("Nam", Text), *columns)
+
+    def test_index_name(self):
+        """
+        test if index names are derived from the table and fit the dialect
+        """
+        self.assertEqual(index_name("STAGING.STG_T1", "pk"),
+                         "ix_STAGING_STG_T1_pk")
+        name = index_name("T" * 100, "pk", load_dialect("postgresql"))
+        self.assertEqual(len(name), 63)
+        self.assertNotEqual(name, index_name("T" * 101, "pk"))
+
+    def test_index_ddl(self):
+        """
+        test if the staging and history index ddl is compiled
+        """
+        stg = self._table("STG_T1")
+        self.assertEqual(index_ddl(staging_index(stg, ['Id', 'Nam'])),
+                         'CREATE INDEX "ix_STG_T1_pk" ON "STG_T1" '
+                         '("Id", "Nam")')
+        his = self._table("PER_STG_T1", Column("VALID_TO_DATE", DateTime))
+        ddl = index_ddl(history_index(his, ['Id'], load_dialect("mssql")),
+                        load_dialect("mssql"))
+        self.assertEqual(ddl, 'CREATE INDEX [ix_PER_STG_T1_pk_valid_to] ON '
+                              '[PER_STG_T1] ([Id], [VALID_TO_DATE])')
+        self.assertTrue(index_ddl(staging_index(stg, ['Id']),
+                                  if_not_exists=True).startswith(
+                                      'CREATE INDEX IF NOT EXISTS'))
+
+    def test_unknown_index_column(self):
+        """
+        test if an index on an unknown column raises an error
+        """
+        with self.assertRaises(ValueError):
+            staging_index(self._table("STG_T1"), ['Missing'])
+        with self.assertRaises(ValueError):
+            history_index(self._table("PER_STG_T1"), ['Id'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from sqlalchemy.types import (
+    VARCHAR,
+    SmallInteger,
+    Integer,
+    BigInteger,
+    Numeric)
+
+from ninjasql.db.dialects import load_dialect
+from ninjasql.db.narrow_types import (
+    integer_type,
+    string_type,
+    decimal_type,
+    narrow_type)
+
+
+class NarrowTypesTest(unittest.TestCase):
+
+    def test_integer_type(self):
+        """
+        test if the smallest integer type with headroom is returned
+        """
+        self.assertIsInstance(integer_type(0, 100), SmallInteger)
+        self.assertIsInstance(integer_type(0, 30000, headroom=0.2), Integer)
+        self.assertIsInstance(integer_type(0, 30000, headroom=0), SmallInteger)
+        self.assertIsInstance(integer_type(-2 ** 31, 0), BigInteger)
+        self.assertIsNone(integer_type(0, 2 ** 63 - 1))
+
+    def test_string_type(self):
+        """
+        test if the varchar length has headroom and respects the dialect
+        """
+        self.assertEqual(string_type(10).length, 12)
+        self.assertEqual(string_type(0).length, 1)
+        self.assertIsInstance(string_type(7000, headroom=0), VARCHAR)
+        self.assertIsNone(string_type(7000, dialect=load_dialect("mssql")))
+
+    def test_decimal_type(self):
+        """
+        test if precision and scale hold all values with headroom
+        """
+        dec = decimal_type(-12.5, 999.25, scale=2, headroom=0)
+        self.assertIsInstance(dec, Numeric)
+        self.assertEqual((dec.precision, dec.scale), (5, 2))
+        dec = decimal_type(0, 999.25, scale=2, headroom=0.5)
+        self.assertEqual((dec.precision, dec.scale), (7, 2))
+        self.assertIsNone(decimal_type(0, 1e40, scale=2))
+
+    def test_narrow_type(self):
+        """
+        test if value statistics are mapped to narrow types
+        """
+        self.assertIsInstance(narrow_type({'kind': 'floating', 'min': 1.0,
+                                           'max': 5.0, 'scale': 0}),
+                              SmallInteger)
+        self.assertIsInstance(narrow_type({'kind': 'floating', 'min': 1.0,
+                                           'max': 5.5, 'scale': 1}),
+                              Numeric)
+        self.assertIsNone(narrow_type({'kind': 'floating', 'scale': None}))
+        self.assertIsNone(narrow_type({'kind': 'string'}))
+        self.assertIsNone(narrow_type({'kind': 'boolean'}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+from sqlalchemy import MetaData, Table, Column
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.types import Boolean, Float, Integer, Text, DateTime
+from sqlalchemy.dialects.postgresql.base import PGDialect
+from sqlalchemy.engine.default import DefaultDialect
+
+from ninjasql.db.dialects import load_dialect
+from ninjasql.db.physical import column_encoding, physical_ddl
+
+
+class RedshiftDialect(PGDialect):
+    """
+    stand in for the redshift dialect of the sqlalchemy-redshift package
+    """
+    name = 'redshift'
+
+
+class SnowflakeDialect(DefaultDialect):
+    """
+    stand in for the dialect of the snowflake-sqlalchemy package
+    """
+    name = 'snowflake'
+
+
+class PhysicalDesignTest(unittest.TestCase):
+
+    def _table(self, table_type):
+        columns = [Column("Id", Integer), Column("Nam", Text)]
+        if table_type == 'history':
+            columns.append(Column("VALID_TO_DATE", DateTime))
+        return Table(f"{table_type}_T19", MetaData(), *columns)
+
+    def test_column_encoding(self):
+        """
+        test if the redshift encodings fit the column types
+        """
+        self.assertEqual(column_encoding(Integer()), 'AZ64')
+        self.assertEqual(column_encoding(DateTime()), 'AZ64')
+        self.assertEqual(column_encoding(Float()), 'ZSTD')
+        self.assertEqual(column_encoding(Text()), 'ZSTD')
+        self.assertEqual(column_encoding(Boolean()), 'RAW')
+
+    def test_redshift(self):
+        """
+        test if redshift tables get DISTKEY, SORTKEY and column ENCODE
+        """
+        ddl = physical_ddl(self._table('history'), ['Id'], 'history',
+                           RedshiftDialect())
+        self.assertEqual(ddl, '\nCREATE TABLE "history_T19" (\n'
+                              '\t"Id" INTEGER ENCODE RAW, \n'
+                              '\t"Nam" TEXT ENCODE ZSTD, \n'
+                              '\t"VALID_TO_DATE" TIMESTAMP WITHOUT TIME ZONE '
+                              'ENCODE AZ64\n)\n'
+                              'DISTKEY ("Id")\n'
+                              'SORTKEY ("Id", "VALID_TO_DATE")\n\n')
+
+    def test_snowflake(self):
+        """
+        test if only the snowflake history table is clustered
+        """
+        ddl = physical_ddl(self._table('history'), ['Id'], 'history',
+                           SnowflakeDialect())
+        self.assertIn(')\nCLUSTER BY ("VALID_TO_DATE", "Id")', ddl)
+        ddl = physical_ddl(self._table('staging'), ['Id'], 'staging',
+                           SnowflakeDialect())
+        self.assertNotIn('CLUSTER BY', ddl)
+
+    def test_postgresql(self):
+        """
+        test if the postgresql history table is list partitioned on
+        VALID_TO_DATE
+        """
+        ddl = physical_ddl(self._table('history'), ['Id'], 'history',
+                           load_dialect("postgresql"))
+        statements = ddl.split(';\n\n')
+        self.assertEqual(len(statements), 3)
+        self.assertTrue(statements[0].endswith(
+            ')\n PARTITION BY LIST ("VALID_TO_DATE")'))
+        self.assertEqual(statements[1],
+                         'CREATE TABLE "history_T19_current" PARTITION OF '
+                         '"history_T19" FOR VALUES IN '
+                         '(\'9999-12-31 00:00:00\')')
+        self.assertEqual(statements[2],
+                         'CREATE TABLE "history_T19_closed" PARTITION OF '
+                         '"history_T19" DEFAULT;')
+
+    def test_mssql(self):
+        """
+        test if the mssql history table is a clustered columnstore
+        """
+        mssql = load_dialect("mssql")
+        mssql.server_version_info = (14, 0)
+        ddl = physical_ddl(self._table('history'), ['Id'], 'history', mssql)
+        self.assertTrue(ddl.endswith(
+            'CREATE CLUSTERED COLUMNSTORE INDEX [ix_history_T19_cci] '
+            'ON [history_T19];'))
+
+    def test_mssql_max_columns(self):
+        """
+        test if the mssql history table with VARCHAR(max) columns is only a
+        clustered columnstore from SQL Server 2017
+        """
+        table = self._table('history')
+        mssql = load_dialect("mssql")
+        ddl = physical_ddl(table, ['Id'], 'history', mssql)
+        self.assertNotIn('COLUMNSTORE', ddl)
+        mssql.server_version_info = (13, 0)
+        ddl = physical_ddl(table, ['Id'], 'history', mssql)
+        self.assertNotIn('COLUMNSTORE', ddl)
+        table = Table("history_T19", MetaData(), Column("Id", Integer),
+                      Column("VALID_TO_DATE", DateTime))
+        ddl = physical_ddl(table, ['Id'], 'history', mssql)
+        self.assertIn('COLUMNSTORE', ddl)
+
+    def test_plain_ddl(self):
+        """
+        test if the plain ddl is returned without a design or a key and
+        unknown key columns raise an error
+        """
+        table = self._table('staging')
+        mysql = load_dialect("mysql")
+        self.assertEqual(physical_ddl(table, ['Id'], 'staging', mysql),
+                         str(CreateTable(table).compile(dialect=mysql)))
+        self.assertNotIn('ENCODE', physical_ddl(table, None, 'staging',
+                                                RedshiftDialect()))
+        with self.assertRaises(ValueError):
+            physical_ddl(table, ['Missing'], 'staging', RedshiftDialect())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from sqlalchemy import MetaData, Table, Column, select, create_engine
+from sqlalchemy.exc import CompileError
+from sqlalchemy.types import Integer, Text
+
+from ninjasql.db.dialects import load_dialect
+from ninjasql.db.row_hash import row_hash, has_row_hash
+
+
+class RowHashTest(unittest.TestCase):
+
+    def _sql(self, dialect):
+        table = Table("T21", MetaData(), Column("Id", Integer),
+                      Column("Nam", Text))
+        stmt = select([row_hash([table.c.Id, table.c.Nam])])
+        return str(stmt.compile(dialect=load_dialect(dialect),
+                                compile_kwargs={"literal_binds": True}))
+
+    def test_dialect_hash(self):
+        """
+        test if every dialect gets its sha256 hex expression
+        """
+        self.assertIn("encode(sha256(convert_to(", self._sql("postgresql"))
+        self.assertIn("CONVERT(CHAR(64), HASHBYTES('SHA2_256', CASE WHEN "
+                      "([T21].[Id] IS NULL) THEN N'N' ELSE N'V' + "
+                      "CONVERT(NVARCHAR(MAX), [T21].[Id], 126) END",
+                      self._sql("mssql"))
+        self.assertIn("SHA2(concat(concat(CASE WHEN (`T21`.`Id` IS NULL) "
+                      "THEN 'N' ELSE concat('V', CAST(`T21`.`Id` AS CHAR))",
+                      self._sql("mysql"))
+        self.assertIn("LOWER(RAWTOHEX(STANDARD_HASH(CASE WHEN (",
+                      self._sql("oracle"))
+
+    def test_null_marker(self):
+        """
+        test if NULL and an empty text give different hash inputs
+        """
+        engine = create_engine("sqlite://")
+        table = Table("T21", MetaData(), Column("Id", Text),
+                      Column("Nam", Text))
+        table.create(engine)
+        rows = [(None, ''), ('', None), ('', ''), (None, None)]
+        engine.execute(table.insert(),
+                       [{'Id': i, 'Nam': n} for i, n in rows])
+        text = row_hash([table.c.Id, table.c.Nam]).clauses
+        texts = [r[0] for r in engine.execute(select([text]))]
+        self.assertEqual(texts, ['N|V', 'V|N', 'V|V', 'N|N'])
+
+    def test_no_hash(self):
+        """
+        test if sqlite without a hash function and a hash without columns
+        raise an error
+        """
+        with self.assertRaises(CompileError):
+            self._sql("sqlite")
+        with self.assertRaises(ValueError):
+            row_hash([])
+        self.assertFalse(has_row_hash(load_dialect("sqlite")))
+        self.assertTrue(has_row_hash("postgresql"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from sqlalchemy import create_engine, MetaData, Table, Column
+from sqlalchemy.types import (
+    VARCHAR,
+    Text,
+    SmallInteger,
+    Integer,
+    BigInteger,
+    Float,
+    Numeric,
+    Date,
+    DateTime)
+
+from ninjasql.db.dialects import load_dialect
+from ninjasql.db.schema_diff import (
+    reflect_columns,
+    widened_type,
+    diff_table,
+    alter_statements)
+
+
+class SchemaDiffTest(unittest.TestCase):
+
+    def _table(self, *columns):
+        return Table("STG_T17", MetaData(), *columns)
+
+    def test_widened_type(self):
+        """
+        test if column types are only widened and never narrowed
+        """
+        self.assertEqual(widened_type(VARCHAR(20), VARCHAR(10)).length, 20)
+        self.assertIsNone(widened_type(VARCHAR(5), VARCHAR(10)))
+        self.assertIsNone(widened_type(VARCHAR(5), Text()))
+        self.assertIsInstance(widened_type(Text(), VARCHAR(10)), Text)
+        self.assertIsNone(widened_type(Integer(), Text()))
+        self.assertIsInstance(widened_type(BigInteger(), SmallInteger()),
+                              BigInteger)
+        self.assertIsNone(widened_type(SmallInteger(), BigInteger()))
+        self.assertIsInstance(widened_type(Float(), Integer()), Float)
+        self.assertIsNone(widened_type(Integer(), Float()))
+        dec = widened_type(Numeric(5, 3), Numeric(6, 1))
+        self.assertEqual((dec.precision, dec.scale), (8, 3))
+        self.assertIsNone(widened_type(Numeric(4, 1), Numeric(6, 1)))
+        dec = widened_type(Integer(), Numeric(10, 2))
+        self.assertEqual((dec.precision, dec.scale), (12, 2))
+        self.assertIsNone(widened_type(SmallInteger(), Numeric(10, 2)))
+        self.assertIsInstance(widened_type(DateTime(), Date()), DateTime)
+        self.assertIsNone(widened_type(Date(), DateTime()))
+        self.assertIsInstance(widened_type(Integer(), DateTime()), Text)
+
+    def test_diff_table(self):
+        """
+        test if missing columns are added, types widened and columns
+        that only exist in the database are kept
+        """
+        table = self._table(Column("Id", BigInteger),
+                            Column("Name", VARCHAR(30)),
+                            Column("Zip", Text))
+        diff = diff_table(table, {'id': SmallInteger(),
+                                  'Name': VARCHAR(30),
+                                  'Old': Integer()})
+        self.assertEqual([c.name for c in diff['add']], ['Zip'])
+        self.assertEqual([c.name for c, _ in diff['alter']], ['Id'])
+
+    def test_alter_statements(self):
+        """
+        test if the ALTER TABLE statements follow the dialect
+        """
+        table = self._table(Column("Id", BigInteger), Column("Zip", Text))
+        diff = {'add': [table.c.Zip], 'alter': [(table.c.Id, BigInteger())]}
+        self.assertEqual(
+            alter_statements(table, diff, load_dialect("postgresql")),
+            ['ALTER TABLE "STG_T17" ADD COLUMN "Zip" TEXT',
+             'ALTER TABLE "STG_T17" ALTER COLUMN "Id" TYPE BIGINT'])
+        self.assertEqual(
+            alter_statements(table, diff, load_dialect("mssql")),
+            ['ALTER TABLE [STG_T17] ADD [Zip] TEXT NULL',
+             'ALTER TABLE [STG_T17] ALTER COLUMN [Id] BIGINT'])
+        self.assertEqual(
+            alter_statements(table, diff, load_dialect("sqlite")),
+            ['ALTER TABLE "STG_T17" ADD COLUMN "Zip" TEXT'])
+
+    def test_reflect_columns(self):
+        """
+        test if the columns of an existing table are reflected
+        """
+        engine = create_engine("sqlite://")
+        self.assertIsNone(reflect_columns(engine, "STG_T17"))
+        self._table(Column("Id", Integer)).create(engine)
+        columns = reflect_columns(engine, "STG_T17")
+        self.assertEqual(list(columns), ['Id'])
+        self.assertIsInstance(columns['Id'], Integer)
+
+
+if __name__ == "__main__":
+    unittest.main()
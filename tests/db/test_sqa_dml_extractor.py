@@ -1,11 +1,23 @@
+import re
 import unittest
-from sqlalchemy import MetaData, Column, Integer, DateTime
+from sqlalchemy import MetaData, Column, Integer, DateTime, CHAR, or_
+from sqlalchemy import create_engine
 from sqlalchemy import Table
 from sqlalchemy.sql.selectable import ScalarSelect
 from sqlalchemy.sql.elements import BinaryExpression
+from sqlalchemy.engine.default import DefaultDialect
 
 from ninjasql.db.sqa_dml_extractor import SqaExtractor
-from tests.db.db_helper import get_engine
+from ninjasql.db.dialects import load_dialect
+from ninjasql.db.blueprint import scd2_steps
+from tests.db.db_helper import get_engine, POSTGRES15_URL
+
+
+class SnowflakeDialect(DefaultDialect):
+    """
+    stand in for the dialect of the snowflake-sqlalchemy package
+    """
+    name = 'snowflake'
 
 
 class SqaExtractorTest(unittest.TestCase):
@@ -235,3 +247,474 @@ class SqaExtractorTest(unittest.TestCase):
 
         self.assertIsInstance(ins, str)
         self.assertIsNotNone(ins)
+
+    def test_compile_with_dialect(self):
+        """
+        test if the statements compile for a dialect without connection
+        """
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id", "number"],
+            load_strategy='database_table',
+            con=None,
+            dialect="postgresql")
+        self.assertIn("INSERT INTO his_table1", c.scd2_new_insert())
+        self.assertIn("'9999-12-31 00:00:00'", c.get_tableload_insert())
+
+    def test_current_snapshot(self):
+        """
+        test if the current snapshot is maintained from the current
+        history records
+        """
+        current_table = self.history_table.tometadata(MetaData(),
+                                                      name='cur_table1')
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='jinja',
+            con=None,
+            dialect="postgresql",
+            current_table=current_table)
+        delete = c.scd2_current_delete()
+        self.assertTrue(delete.startswith("DELETE FROM cur_table1 WHERE "
+                                          "EXISTS (SELECT his_table1.id"))
+        self.assertIn("date({{ offset_validto_date }})", delete)
+        insert = c.scd2_current_insert()
+        self.assertTrue(insert.startswith("INSERT INTO cur_table1 (id, "))
+        self.assertIn('his_table1."BATCH_RUN_AT" = date({{ batch_date }})',
+                      insert)
+        self.assertIn("NOT (EXISTS (SELECT cur_table1.id", insert)
+        self.assertTrue(c.current_view_ddl().startswith(
+            "CREATE MATERIALIZED VIEW cur_table1 AS\nSELECT his_table1.id"))
+        self.assertEqual(c.scd2_current_refresh(),
+                         "REFRESH MATERIALIZED VIEW cur_table1")
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='jinja',
+            con=None,
+            dialect="mssql",
+            current_table=current_table)
+        with self.assertRaises(ValueError):
+            c.current_view_ddl()
+        for load_strategy, view in (('jinja', "CREATE MATERIALIZED VIEW"),
+                                    ('database_table', "CREATE VIEW")):
+            c = SqaExtractor(
+                staging_table=self.staging_table,
+                history_table=self.history_table,
+                logical_pk=["id"],
+                load_strategy=load_strategy,
+                con=None,
+                dialect=SnowflakeDialect(),
+                current_table=current_table)
+            self.assertTrue(c.current_view_ddl().startswith(
+                f"{view} cur_table1 AS\nSELECT his_table1.id"))
+            self.assertIsNone(c.scd2_current_refresh())
+
+    def test_current_initial_insert(self):
+        """
+        test if the initial insert fills a new current snapshot with all
+        current history records and the steps keep it current
+        """
+        engine = create_engine("sqlite://")
+        metadata = MetaData()
+        staging = Table('stg_table1', metadata,
+                        Column('id', Integer),
+                        Column('number', Integer))
+        history = Table('his_table1', metadata,
+                        Column('id', Integer),
+                        Column('number', Integer),
+                        Column('UPDATED_AT', DateTime),
+                        Column('BATCH_RUN_AT', DateTime),
+                        Column('VALID_FROM_DATE', DateTime),
+                        Column('VALID_TO_DATE', DateTime))
+        current = history.tometadata(metadata, name='cur_table1')
+        metadata.create_all(engine)
+        c = SqaExtractor(
+            staging_table=staging,
+            history_table=history,
+            logical_pk=["id"],
+            load_strategy='bind',
+            con=None,
+            dialect=engine.dialect,
+            current_table=current)
+        snapshot_steps = ['scd2_current_delete', 'scd2_current_insert']
+
+        def load(day, batch, steps):
+            dates = {'batch_date': f'2020-01-0{day}',
+                     'validfrom_date': f'2020-01-0{day}',
+                     'validto_date': '9999-12-31',
+                     'offset_validto_date': f'2020-01-0{day - 1}'}
+            engine.execute(staging.delete())
+            engine.execute(staging.insert(),
+                           [{'id': k, 'number': v} for k, v in batch.items()])
+            for method in steps:
+                sql, names = c.bind_statement(method)
+                engine.execute(sql, tuple(dates[n] for n in names))
+
+        def rows(table):
+            return engine.execute(
+                f'SELECT id, number FROM {table} WHERE "VALID_TO_DATE" = '
+                f'\'9999-12-31\' ORDER BY 1').fetchall()
+
+        steps = [method for _, method in scd2_steps()]
+        load(2, {1: 10, 2: 20, 3: 30}, steps)
+        load(3, {1: 11, 2: 20}, steps)
+        # the batch steps alone only add the records of the last batch
+        load(4, {1: 11, 2: 20}, snapshot_steps)
+        self.assertEqual(rows('cur_table1'), [])
+        sql, names = c.bind_statement('scd2_current_initial_insert')
+        self.assertEqual(names, ['validto_date'])
+        engine.execute(sql, ('9999-12-31',))
+        self.assertEqual(rows('cur_table1'), [(1, 11), (2, 20)])
+        load(5, {1: 12, 4: 40}, steps + snapshot_steps)
+        self.assertEqual(rows('cur_table1'), rows('his_table1'))
+        self.assertEqual(rows('cur_table1'), [(1, 12), (4, 40)])
+
+    def test_hash_diff(self):
+        """
+        test if changed records are detected by the row hash and the
+        staging records are hashed first
+        """
+        staging_table = Table('stg_table2', MetaData(),
+                              Column('id', Integer),
+                              Column('number', Integer),
+                              Column('ROW_HASH', CHAR(64)))
+        history_table = Table('his_table2', MetaData(),
+                              *[Column(c.name, c.type)
+                                for c in staging_table.c],
+                              Column('UPDATED_AT', DateTime),
+                              Column('BATCH_RUN_AT', DateTime),
+                              Column('VALID_FROM_DATE', DateTime),
+                              Column('VALID_TO_DATE', DateTime))
+        c = SqaExtractor(
+            staging_table=staging_table,
+            history_table=history_table,
+            logical_pk=["id"],
+            load_strategy='jinja',
+            con=None,
+            dialect="postgresql",
+            hash_diff=True)
+        compare = c.get_compare_columns()
+        self.assertEqual(len(compare), 1)
+        self.assertEqual(str(compare[0]),
+                         'stg_table2."ROW_HASH" != his_table2."ROW_HASH"')
+        self.assertIn('stg_table2."ROW_HASH" != his_table2."ROW_HASH"',
+                      c.scd2_updated_update())
+        self.assertEqual(
+            c.scd2_row_hash(),
+            'UPDATE stg_table2 SET "ROW_HASH"=encode(sha256(convert_to('
+            "CASE WHEN (stg_table2.id IS NULL) THEN 'N' ELSE 'V' || "
+            "CAST(stg_table2.id AS VARCHAR) END || '|' || "
+            "CASE WHEN (stg_table2.number IS NULL) THEN 'N' ELSE 'V' || "
+            "CAST(stg_table2.number AS VARCHAR) END, 'UTF8')), 'hex')")
+        with self.assertRaises(ValueError):
+            SqaExtractor(
+                staging_table=self.staging_table,
+                history_table=self.history_table,
+                logical_pk=["id"],
+                load_strategy='jinja',
+                con=None,
+                hash_diff=True)
+
+    def test_merge(self):
+        """
+        test if one MERGE loads the scd2 records and only mssql closes
+        the deleted records in it
+        """
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='jinja',
+            con=None,
+            dialect="mssql")
+        merge = c.scd2_merge()
+        self.assertTrue(merge.startswith("MERGE INTO his_table1 USING (\n"
+                                         "SELECT stg_table1.id, "))
+        self.assertIn("CAST(NULL AS INTEGER) AS [MERGE_KEY_id]", merge)
+        self.assertIn("ON his_table1.id = src.[MERGE_KEY_id] AND "
+                      "his_table1.[VALID_TO_DATE] = src.[VALID_TO_DATE]",
+                      merge)
+        self.assertIn("UPDATE SET [VALID_TO_DATE]=src.[OFFSET_VALID_TO_DATE]",
+                      merge)
+        self.assertIn("WHEN NOT MATCHED BY SOURCE", merge)
+        self.assertTrue(merge.endswith(";"))
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='jinja',
+            con=None,
+            dialect="postgresql")
+        with self.assertRaises(ValueError):
+            c.scd2_merge()
+        dialect = load_dialect("postgresql")
+        dialect.server_version_info = (15, 2)
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='jinja',
+            con=None,
+            dialect=dialect)
+        self.assertNotIn("NOT MATCHED BY SOURCE", c.scd2_merge())
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='jinja',
+            con=None,
+            dialect="sqlite")
+        with self.assertRaises(ValueError):
+            c.scd2_merge()
+        insert = c.scd2_missing_insert()
+        self.assertTrue(insert.startswith("INSERT INTO his_table1 (id, "))
+        self.assertIn('NOT (EXISTS (SELECT his_table1.id', insert)
+        self.assertIn('his_table1."VALID_TO_DATE" = date({{ validto_date }})',
+                      insert)
+
+    def _load_histories(self, engine) -> dict:
+        """
+        loads the same batches in the steps and the merge mode and
+        returns the history of each mode
+        """
+        batches = [{1: 10, 2: 20},
+                   {1: 11},
+                   {1: 11, 2: 20},
+                   {1: 12, 2: 21, 3: 30}]
+        histories = {}
+        for mode in ['steps', 'merge']:
+            metadata = MetaData()
+            staging = Table('stg_table1', metadata,
+                            Column('id', Integer),
+                            Column('number', Integer))
+            history = Table('his_table1', metadata,
+                            Column('id', Integer),
+                            Column('number', Integer),
+                            Column('UPDATED_AT', DateTime),
+                            Column('BATCH_RUN_AT', DateTime),
+                            Column('VALID_FROM_DATE', DateTime),
+                            Column('VALID_TO_DATE', DateTime))
+            metadata.drop_all(engine)
+            metadata.create_all(engine)
+            c = SqaExtractor(
+                staging_table=staging,
+                history_table=history,
+                logical_pk=["id"],
+                load_strategy='bind',
+                con=None,
+                dialect=engine.dialect)
+            for day, batch in enumerate(batches, start=2):
+                dates = {'batch_date': f'2020-01-0{day}',
+                         'validfrom_date': f'2020-01-0{day}',
+                         'validto_date': '9999-12-31',
+                         'offset_validto_date': f'2020-01-0{day - 1}'}
+                engine.execute(staging.delete())
+                engine.execute(staging.insert(),
+                               [{'id': k, 'number': v}
+                                for k, v in batch.items()])
+                for _, method in scd2_steps(load_mode=mode,
+                                            dialect=engine.dialect):
+                    sql, names = c.bind_statement(method)
+                    if engine.dialect.paramstyle in ['named', 'pyformat']:
+                        engine.execute(sql, {n: dates[n] for n in names})
+                    else:
+                        engine.execute(sql, tuple(dates[n] for n in names))
+            histories[mode] = [tuple(str(v) for v in r) for r in
+                               engine.execute(
+                'SELECT id, number, "BATCH_RUN_AT", "VALID_FROM_DATE", '
+                '"VALID_TO_DATE" FROM his_table1 ORDER BY 1, 3')]
+            metadata.drop_all(engine)
+        return histories
+
+    def test_merge_matches_steps(self):
+        """
+        test if the merge mode loads the same history as the steps when a
+        deleted record comes back in a later batch
+        """
+        histories = self._load_histories(create_engine("sqlite://"))
+        self.assertEqual(histories['steps'], histories['merge'])
+        self.assertEqual([r[1:] for r in histories['steps'] if r[0] == '2'],
+                         [('20', '2020-01-02', '2020-01-02', '2020-01-02')])
+
+    @unittest.skipIf(POSTGRES15_URL is None,
+                     "NINJASQL_POSTGRES15_URL is not set")
+    def test_merge_matches_steps_postgresql(self):
+        """
+        test if the MERGE of postgresql 15+ loads the same history as the
+        steps
+        """
+        engine = create_engine(POSTGRES15_URL)
+        with engine.connect() as con:
+            self.assertGreaterEqual(con.dialect.server_version_info, (15,))
+        histories = self._load_histories(engine)
+        self.assertEqual(histories['steps'], histories['merge'])
+
+    def test_merge_structure(self):
+        """
+        test if the ON and WHEN clauses of the MERGE of every dialect
+        close, insert and compare like the scd2 steps
+        """
+        postgresql = load_dialect("postgresql")
+        postgresql.server_version_info = (15, 2)
+        clauses = re.compile(
+            r"MERGE INTO (?P<target>\S+) USING \(\n.*?\n\) AS src\n"
+            r"ON (?P<on>.*)\n"
+            r"WHEN MATCHED AND (?P<matched>.*) THEN\n"
+            r"UPDATE SET (?P<update>.*)\n"
+            r"WHEN NOT MATCHED THEN\n"
+            r"INSERT \((?P<insert>.*)\) VALUES \((?P<values>.*?)\)"
+            r"(\nWHEN NOT MATCHED BY SOURCE AND (?P<by_source>.*) THEN\n"
+            r"UPDATE SET (?P<by_source_update>.*?))?;?$", re.S)
+
+        def set_names(stmt):
+            names = re.search(r" SET (.*?) WHERE ", stmt, re.S).group(1)
+            return sorted(re.findall(r"(\S+)=", names))
+
+        metadata = MetaData()
+        staging = Table('stg_table1', metadata,
+                        Column('id', Integer),
+                        Column('number', Integer))
+        history = Table('his_table1', metadata,
+                        Column('id', Integer),
+                        Column('number', Integer),
+                        Column('UPDATED_AT', DateTime),
+                        Column('BATCH_RUN_AT', DateTime),
+                        Column('VALID_FROM_DATE', DateTime),
+                        Column('VALID_TO_DATE', DateTime))
+        for dialect in ["mssql", SnowflakeDialect(), postgresql]:
+            c = SqaExtractor(
+                staging_table=staging,
+                history_table=history,
+                logical_pk=["id"],
+                load_strategy='jinja',
+                con=None,
+                dialect=dialect)
+            q = c._dialect.identifier_preparer.quote
+            merge = clauses.match(c.scd2_merge())
+            self.assertIsNotNone(merge, c._dialect.name)
+            self.assertEqual(merge.group('target'), 'his_table1')
+            self.assertEqual(
+                merge.group('on'),
+                f"his_table1.id = src.{q('MERGE_KEY_id')} AND "
+                f"his_table1.{q('VALID_TO_DATE')} = "
+                f"src.{q('VALID_TO_DATE')}")
+            # the same changes as the steps, compared to the source
+            changed = c._compile(or_(*c.get_compare_columns()))
+            self.assertIn(changed, c.scd2_updated_update())
+            self.assertEqual(
+                merge.group('matched'),
+                f"his_table1.{q('BATCH_RUN_AT')} < src.{q('BATCH_RUN_AT')}"
+                f" AND ({changed.replace('stg_table1.', 'src.')})")
+            self.assertEqual(sorted(re.findall(r"(\S+)=",
+                                               merge.group('update'))),
+                             set_names(c.scd2_updated_update()))
+            insert = re.match(r"INSERT INTO his_table1 \((.*?)\) SELECT",
+                              c.scd2_new_insert())
+            self.assertEqual(merge.group('insert'), insert.group(1))
+            deleted = c.scd2_deleted_update()
+            methods = [m for _, m in scd2_steps(load_mode='merge',
+                                                dialect=c._dialect)]
+            if merge.group('by_source') is None:
+                self.assertIn('scd2_deleted_update', methods)
+                continue
+            self.assertNotIn('scd2_deleted_update', methods)
+            self.assertTrue(deleted.endswith(merge.group('by_source')))
+            self.assertEqual(sorted(re.findall(
+                r"(\S+)=", merge.group('by_source_update'))),
+                set_names(deleted))
+
+    def test_join_updates(self):
+        """
+        test if the updates join the staging table where the dialect
+        supports it and keep the subqueries elsewhere
+        """
+        def extractor(dialect):
+            return SqaExtractor(
+                staging_table=self.staging_table,
+                history_table=self.history_table,
+                logical_pk=["id"],
+                load_strategy='jinja',
+                con=None,
+                dialect=dialect,
+                join_updates=True)
+        update = extractor("postgresql").scd2_updated_update()
+        self.assertIn("FROM stg_table1 WHERE stg_table1.id = his_table1.id",
+                      update)
+        self.assertNotIn("EXISTS", update)
+        self.assertIn("NOT (EXISTS",
+                      extractor("postgresql").scd2_deleted_update())
+        self.assertTrue(extractor("mysql").scd2_deleted_update().startswith(
+            "UPDATE his_table1 LEFT OUTER JOIN stg_table1 ON "
+            "stg_table1.id = his_table1.id SET"))
+        self.assertIn("WHERE stg_table1.id IS NULL",
+                      extractor("mysql").scd2_deleted_update())
+        self.assertTrue(extractor("sqlite").scd2_updated_update().startswith(
+            'UPDATE his_table1 SET "UPDATED_AT"=CURRENT_TIMESTAMP, '
+            '"VALID_TO_DATE"=date({{ offset_validto_date }}) WHERE EXISTS'))
+
+    def test_tableload_row(self):
+        """
+        test if the statements join one derived table load row and
+        updates without UPDATE ... FROM keep the subqueries
+        """
+        def extractor(dialect):
+            return SqaExtractor(
+                staging_table=self.staging_table,
+                history_table=self.history_table,
+                logical_pk=["id"],
+                load_strategy='database_table',
+                con=None,
+                dialect=dialect,
+                tableload_row=True)
+        c = extractor("postgresql")
+        for stmt in (c.scd2_new_insert(), c.scd2_updated_insert(),
+                     c.scd2_updated_update(), c.scd2_deleted_update()):
+            self.assertEqual(stmt.count("FROM tableloads"), 1)
+            self.assertIn(') AS tl', stmt)
+        self.assertIn('"VALID_TO_DATE"=tl."OffsetValidToDate" FROM (SELECT',
+                      c.scd2_updated_update())
+        c = extractor("sqlite")
+        self.assertEqual(c.scd2_new_insert().count("FROM tableloads"), 1)
+        self.assertEqual(c.scd2_deleted_update().count("FROM tableloads"), 2)
+        self.assertNotIn("AS tl", c.scd2_deleted_update())
+
+    def test_bind_statement(self):
+        """
+        test if the load dates are named bind parameters and their names
+        are returned in placeholder order
+        """
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='bind',
+            con=None,
+            dialect="postgresql")
+        sql, names = c.bind_statement('scd2_deleted_update')
+        self.assertEqual(names, ['offset_validto_date', 'validto_date'])
+        self.assertIn('"VALID_TO_DATE"=%(offset_validto_date)s', sql)
+        self.assertIn('his_table1."VALID_TO_DATE" = %(validto_date)s', sql)
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='bind',
+            con=None,
+            dialect="sqlite")
+        sql, names = c.bind_statement('scd2_updated_update')
+        self.assertEqual(names, ['offset_validto_date', 'validto_date',
+                                 'batch_date'])
+        self.assertEqual(sql.count('?'), 3)
+        c = SqaExtractor(
+            staging_table=self.staging_table,
+            history_table=self.history_table,
+            logical_pk=["id"],
+            load_strategy='jinja',
+            con=None)
+        with self.assertRaises(ValueError):
+            c.bind_statement('scd2_new_insert')
@@ -11,3 +11,11 @@ class SqaTableLoads(unittest.TestCase):
         """
         ddl = get_sqa_tableload(con=get_engine())
         self.assertTrue("CREATE TABLE tableloads" in ddl)
+
+    def test_ddl_extraction_for_dialect(self):
+        """
+        Test if batch helper table ddl can be extracted for a dialect
+        without an engine
+        """
+        ddl = get_sqa_tableload(dialect="postgresql")
+        self.assertIn("TIMESTAMP WITHOUT TIME ZONE", ddl)
@@ -0,0 +1,106 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sqlalchemy import Table
+from sqlalchemy.types import BigInteger, Float, Text, Date, DateTime, VARCHAR
+
+from ninjasql.db.table_schema import TableSchema, ColumnSchema
+from ninjasql.db.sqa_dml_extractor import SqaExtractor
+from tests.db.db_helper import get_engine
+
+
+class TableSchemaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            'id': [1, 2, 3],
+            'amount': [1.5, np.nan, 3.0],
+            'name': ['a', 'b', None],
+            'day': pd.to_datetime(['2021-01-01', '2021-01-02', None]),
+            'ts': pd.to_datetime(['2021-01-01 10:00:00'] * 3)})
+
+    def test_from_frame(self):
+        """
+        test if the schema holds names, kinds, nullability and stats
+        """
+        schema = TableSchema.from_frame(self.frame, name="t",
+                                        date_columns=['day'])
+        self.assertEqual(schema.names, list(self.frame.columns))
+        self.assertEqual([c.kind for c in schema],
+                         ['integer', 'floating', 'string', 'date',
+                          'datetime'])
+        self.assertEqual([c.nullable for c in schema],
+                         [False, True, True, True, False])
+        self.assertEqual(schema.columns[1].stats,
+                         {'count': 2, 'nulls': 1})
+        with self.assertRaises(AttributeError):
+            schema.columns[0].comment = "no slot"
+
+    def test_to_table(self):
+        """
+        test if a sqlalchemy table is built with pandas compatible types
+        """
+        schema = TableSchema.from_frame(self.frame, name="t",
+                                        date_columns=['day'])
+        table = schema.to_table(dtype={'name': VARCHAR(10)})
+        self.assertIsInstance(table, Table)
+        self.assertEqual(table.name, "t")
+        types = {c.name: c.type for c in table.c}
+        self.assertIsInstance(types['id'], BigInteger)
+        self.assertIsInstance(types['amount'], Float)
+        self.assertIsInstance(types['name'], VARCHAR)
+        self.assertIsInstance(types['day'], Date)
+        self.assertIsInstance(types['ts'], DateTime)
+        self.assertIsInstance(
+            TableSchema.from_frame(self.frame).to_table(
+                name="u").c.day.type, DateTime)
+        self.assertIsInstance(
+            TableSchema.from_frame(self.frame[:0]).to_table(
+                name="u").c.name.type, Text)
+
+    def test_with_columns_shares_columns(self):
+        """
+        test if added columns do not copy the existing ones
+        """
+        schema = TableSchema.from_frame(self.frame, name="t")
+        extra = ColumnSchema(name="VALID_TO_DATE",
+                             dtype=np.dtype('datetime64[ns]'),
+                             kind='datetime')
+        his = schema.with_columns([extra], name="h")
+        self.assertEqual(len(his), len(schema) + 1)
+        self.assertIs(his.columns[0], schema.columns[0])
+        self.assertEqual(len(schema), 5)
+        self.assertEqual(list(his.empty_frame().columns), his.names)
+
+    def test_sqlite_types(self):
+        """
+        test if the pandas sqlite fallback types are returned
+        """
+        schema = TableSchema.from_frame(self.frame, date_columns=['day'])
+        self.assertEqual(schema.sqlite_types({'id': 'TEXT'}),
+                         {'id': 'TEXT', 'amount': 'REAL', 'name': 'TEXT',
+                          'day': 'DATE', 'ts': 'TIMESTAMP'})
+
+    def test_extractor_accepts_schema(self):
+        """
+        test if the dml extractor can consume table schemas
+        """
+        stg = TableSchema.from_frame(self.frame[['id', 'name']],
+                                     name="stg_t")
+        his = stg.with_columns(
+            [ColumnSchema(name=col, dtype=np.dtype('datetime64[ns]'),
+                          kind='datetime')
+             for col in ['UPDATED_AT', 'BATCH_RUN_AT', 'VALID_FROM_DATE',
+                         'VALID_TO_DATE']],
+            name="his_t")
+        c = SqaExtractor(staging_table=stg,
+                         history_table=his,
+                         logical_pk=['id'],
+                         con=get_engine(),
+                         load_strategy='jinja')
+        self.assertEqual(c.get_col_names(), ['id', 'name'])
+        self.assertEqual(c.get_hist_table_name(), "his_t")
+
+
+if __name__ == "__main__":
+    unittest.main()
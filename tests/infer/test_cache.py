@@ -0,0 +1,92 @@
+import unittest
+import os
+import tempfile
+
+from ninjasql.infer.cache import (
+    SchemaCache,
+    file_fingerprint,
+    layout_fingerprint)
+
+
+class SchemaCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.dir.name, "data.csv")
+        self._write(self.file, "id,name\n1,a\n2,b\n")
+        self.cache = SchemaCache(path=os.path.join(self.dir.name, "c.db"))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_file_fingerprint(self):
+        """
+        test if the fingerprint changes with the content and the options
+        """
+        first = file_fingerprint(self.file)
+        self.assertEqual(first, file_fingerprint(self.file))
+        self.assertNotEqual(first, file_fingerprint(self.file, options="x"))
+        self._write(self.file, "id,name\n1,a\n2,c\n")
+        self.assertNotEqual(first, file_fingerprint(self.file))
+
+    def test_layout_fingerprint(self):
+        """
+        test if files with the same header share the layout
+        """
+        other = os.path.join(self.dir.name, "other.csv")
+        self._write(other, "id,name\n3,c\n")
+        self.assertEqual(layout_fingerprint(self.file, 1),
+                         layout_fingerprint(other, 1))
+        self._write(other, "id,nam\n3,c\n")
+        self.assertNotEqual(layout_fingerprint(self.file, 1),
+                            layout_fingerprint(other, 1))
+
+    def test_get_put(self):
+        """
+        test if values are cached by key and by layout
+        """
+        self.assertIsNone(self.cache.get("k"))
+        self.cache.put("k", {'a': 1}, path=self.file, layout="l")
+        self.assertEqual(self.cache.get("k"), {'a': 1})
+        self.assertEqual(self.cache.get("other", layout="l"), {'a': 1})
+        self.assertIsNone(self.cache.get("other"))
+
+    def test_eviction(self):
+        """
+        test if the least recently used entries are evicted
+        """
+        cache = SchemaCache(path=os.path.join(self.dir.name, "e.db"),
+                            max_entries=2)
+        cache.put("a", {'v': 1})
+        cache.put("b", {'v': 2})
+        cache.get("a")
+        cache.put("c", {'v': 3})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+        cache = SchemaCache(path=os.path.join(self.dir.name, "s.db"),
+                            max_bytes=20)
+        cache.put("a", {'v': "x" * 5})
+        cache.put("b", {'v': "y" * 5})
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.get("b"))
+
+    def test_invalidate(self):
+        """
+        test if the entries of a file or all entries are deleted
+        """
+        self.cache.put("a", {'v': 1}, path=self.file)
+        self.cache.put("b", {'v': 2}, path="other.csv")
+        self.assertEqual(self.cache.invalidate(path=self.file), 1)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.invalidate(), 1)
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import pandas as pd
+
+from ninjasql.infer.columnar import (
+    read_schema,
+    count_rows,
+    schema_frame,
+    read_columnar)
+from tests.helpers.file_generator import FILEPATH
+
+try:
+    import pyarrow
+    import pyarrow.feather
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+@unittest.skipIf(not HAS_PYARROW, "pyarrow is not installed")
+class ColumnarTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rows = 100
+        cls.df = pd.DataFrame({
+            'id': range(rows),
+            'amount': [n * 0.5 for n in range(rows)],
+            'name': [f"name_{n}" for n in range(rows)],
+            'created': pd.date_range('2020-01-01', periods=rows)
+        })
+        cls.files = [
+            ('parquet', os.path.join(FILEPATH, "columnar.parquet")),
+            ('feather', os.path.join(FILEPATH, "columnar.feather")),
+            ('feather', os.path.join(FILEPATH, "columnar_v1.feather"))
+        ]
+        # small row groups, so nrows spans several of them
+        cls.df.to_parquet(cls.files[0][1], index=False, row_group_size=7)
+        cls.df.to_feather(cls.files[1][1])
+        pyarrow.feather.write_feather(cls.df, cls.files[2][1], version=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        for _, path in cls.files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def test_schema_frame(self):
+        """
+        test if the schema frame carries the dtypes without rows
+        """
+        for ftype, path in self.files:
+            frame = schema_frame(path=path, type=ftype)
+            self.assertEqual(len(frame), 0)
+            self.assertEqual(frame.dtypes.to_dict(),
+                             self.df.dtypes.to_dict())
+            self.assertEqual(read_schema(path=path, type=ftype).names,
+                             list(self.df.columns))
+
+    def test_count_rows(self):
+        """
+        test if the row count is taken from the metadata
+        """
+        for ftype, path in self.files:
+            self.assertEqual(count_rows(path=path, type=ftype), 100)
+
+    def test_read_columnar_projection(self):
+        """
+        test if only the given columns and rows are read
+        """
+        for ftype, path in self.files:
+            frame = read_columnar(path=path,
+                                  type=ftype,
+                                  columns=['name', 'id'],
+                                  nrows=10)
+            self.assertEqual(list(frame.columns), ['name', 'id'])
+            self.assertEqual(len(frame), 10)
+
+            frame = read_columnar(path=path, type=ftype, columns=['id'])
+            self.assertEqual(len(frame), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import bz2
+import gzip
+import lzma
+import zipfile
+
+from ninjasql.infer.compression import (
+    detect_compression,
+    open_text,
+    uncompressed_size)
+from tests.helpers.file_generator import FILEPATH
+
+
+class CompressionTest(unittest.TestCase):
+
+    content = "id,name\n" + "".join(f"{n},name_{n}\n" for n in range(100))
+
+    @classmethod
+    def setUpClass(cls):
+        data = cls.content.encode()
+        cls.files = {
+            None: os.path.join(FILEPATH, "compressed.csv"),
+            'gzip': os.path.join(FILEPATH, "compressed.csv.gz"),
+            'bz2': os.path.join(FILEPATH, "compressed.csv.bz2"),
+            'xz': os.path.join(FILEPATH, "compressed.csv.xz"),
+            'zip': os.path.join(FILEPATH, "compressed.zip"),
+        }
+        with open(cls.files[None], 'wb') as f:
+            f.write(data)
+        with gzip.open(cls.files['gzip'], 'wb') as f:
+            f.write(data)
+        with bz2.open(cls.files['bz2'], 'wb') as f:
+            f.write(data)
+        with lzma.open(cls.files['xz'], 'wb') as f:
+            f.write(data)
+        with zipfile.ZipFile(cls.files['zip'], 'w') as archive:
+            archive.writestr("compressed.csv", data)
+
+    @classmethod
+    def tearDownClass(cls):
+        for path in cls.files.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def test_detect_compression(self):
+        """
+        test if the compression is detected from the magic number
+        """
+        for compression, path in self.files.items():
+            self.assertEqual(detect_compression(path), compression)
+        self.assertIsNone(detect_compression("XXYUI"))
+
+    def test_open_text(self):
+        """
+        test if every compression is decompressed while streaming
+        """
+        for compression, path in self.files.items():
+            with open_text(path, compression) as f:
+                self.assertEqual(f.readline(), "id,name\n")
+                self.assertEqual(f.read(), self.content[8:])
+
+    def test_uncompressed_size(self):
+        """
+        test if the uncompressed size is returned where it is stored
+        """
+        size = len(self.content)
+        self.assertEqual(uncompressed_size(self.files[None]), size)
+        self.assertEqual(uncompressed_size(self.files['zip'], 'zip'), size)
+        self.assertIsNone(uncompressed_size(self.files['gzip'], 'gzip'))
+
+
+if __name__ == "__main__":
+    unittest.main()
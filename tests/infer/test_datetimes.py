@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from ninjasql.infer.datetimes import (
+    infer_date_formats,
+    is_date_format,
+    parse_dates)
+
+
+class DatetimesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            'day': ['2021-01-31', '2021-02-01', np.nan],
+            'ts': ['2021-01-31 10:00:00', '2021-02-01 11:30:00',
+                   '2021-02-02 00:00:00'],
+            'us': ['01/31/2021', '02/01/2021', '02/02/2021'],
+            'year': ['2020', '2021', '2022'],
+            'name': ['John', 'Jane', 'Joe'],
+            'num': [1, 2, 3]})
+
+    def test_infer_date_formats(self):
+        """
+        test if only date and timestamp string columns are detected
+        """
+        formats = infer_date_formats(self.frame)
+        self.assertEqual(formats, {'day': '%Y-%m-%d',
+                                   'ts': '%Y-%m-%d %H:%M:%S',
+                                   'us': '%m/%d/%Y'})
+        self.assertTrue(is_date_format(formats['day']))
+        self.assertFalse(is_date_format(formats['ts']))
+
+    def test_mixed_values_are_not_detected(self):
+        """
+        test if a column with a non date value is not detected
+        """
+        frame = pd.DataFrame({'day': ['2021-01-31', 'tomorrow']})
+        self.assertEqual(infer_date_formats(frame), {})
+
+    def test_parse_dates(self):
+        """
+        test if detected columns are parsed and non matching ones kept
+        """
+        frame = parse_dates(self.frame, infer_date_formats(self.frame))
+        self.assertEqual(frame['day'].dtype, np.dtype('datetime64[ns]'))
+        self.assertTrue(frame['day'].isna().iloc[2])
+        self.assertEqual(frame['ts'].dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(frame['name'].dtype, np.dtype('object'))
+
+        other = pd.DataFrame({'day': ['2021-01-31', 'unknown']})
+        other = parse_dates(other, {'day': '%Y-%m-%d'})
+        self.assertEqual(other['day'].dtype, np.dtype('object'))
+
+
+if __name__ == "__main__":
+    unittest.main()
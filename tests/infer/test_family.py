@@ -0,0 +1,75 @@
+import os
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+
+from ninjasql.db.table_schema import TableSchema
+from ninjasql.infer.family import expand_files, union_column, union_schemas
+
+
+class FamilyTest(unittest.TestCase):
+
+    def test_expand_files(self):
+        """
+        test if glob patterns are expanded sorted and single files
+        are left alone
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ['b.csv', 'a.csv', 'c.txt']:
+                open(os.path.join(tmp, name), 'w').close()
+            files = expand_files(os.path.join(tmp, '*.csv'))
+            self.assertEqual([f.name for f in files], ['a.csv', 'b.csv'])
+            self.assertIsNone(expand_files(os.path.join(tmp, 'a.csv')))
+            self.assertEqual(len(expand_files(['x.csv', 'y.csv'])), 2)
+            with self.assertRaises(FileNotFoundError):
+                expand_files(os.path.join(tmp, '*.json'))
+
+    def test_expand_bracketed_file(self):
+        """
+        test if an existing file with glob chars in its name is a single
+        file and not a pattern
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ['data[1].csv', 'data1.csv']:
+                open(os.path.join(tmp, name), 'w').close()
+            self.assertIsNone(expand_files(os.path.join(tmp, 'data[1].csv')))
+            files = expand_files(os.path.join(tmp, 'data[0-9].csv'))
+            self.assertEqual([f.name for f in files], ['data1.csv'])
+
+    def test_union_column(self):
+        """
+        test if the columns of two files widen like chunks of one file
+        """
+        def column(values, dtype=None):
+            frame = pd.DataFrame({'A': pd.Series(values, dtype=dtype)})
+            return TableSchema.from_frame(frame).columns[0]
+
+        merged = union_column(column([1, 2]), column([1.5]))
+        self.assertEqual((merged.kind, merged.dtype),
+                         ('floating', np.dtype('float64')))
+        merged = union_column(column([1, 2]), column([np.nan]))
+        self.assertEqual(merged.kind, 'floating')
+        self.assertTrue(merged.nullable)
+        merged = union_column(column([1]), column(['x']))
+        self.assertEqual((merged.kind, merged.dtype),
+                         ('string', np.dtype('object')))
+        self.assertEqual(merged.stats, {'count': 2, 'nulls': 0})
+
+    def test_union_schemas(self):
+        """
+        test if the superset schema and the contribution report are built
+        """
+        first = TableSchema.from_frame(pd.DataFrame({'A': [1], 'B': ['x']}))
+        second = TableSchema.from_frame(pd.DataFrame({'A': [2], 'C': [1.5]}))
+        schema, report = union_schemas({'f1.csv': first, 'f2.csv': second})
+        self.assertEqual(schema.names, ['A', 'B', 'C'])
+        self.assertEqual([c.nullable for c in schema], [False, True, True])
+        self.assertEqual(report['files'], {'f1.csv': ['A', 'B'],
+                                           'f2.csv': ['A', 'C']})
+        self.assertEqual(report['columns']['A'], ['f1.csv', 'f2.csv'])
+        self.assertEqual(report['columns']['C'], ['f2.csv'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from ninjasql.infer.hints import project, downcast_numeric, categorize
+
+
+class HintsTest(unittest.TestCase):
+
+    def test_project(self):
+        """
+        test if only the given columns are kept in file order
+        """
+        df = pd.DataFrame({'a': [1], 'b': [2], 'c': [3]})
+        self.assertEqual(list(project(df, ['c', 'a']).columns), ['a', 'c'])
+        self.assertIs(project(df), df)
+
+    def test_downcast_numeric(self):
+        """
+        test if numeric columns are downcasted without changing values
+        """
+        df = pd.DataFrame({'small': [1, 2, 3],
+                           'big': [1, 2, 2 ** 40],
+                           'half': [0.5, np.nan, 1.25],
+                           'exact': [0.1, 0.2, 0.3]})
+        res = downcast_numeric(df)
+        self.assertEqual(res['small'].dtype, np.dtype('int8'))
+        self.assertEqual(res['big'].dtype, np.dtype('int64'))
+        self.assertEqual(res['half'].dtype, np.dtype('float32'))
+        self.assertEqual(res['exact'].dtype, np.dtype('float64'))
+        self.assertEqual(df['small'].dtype, np.dtype('int64'))
+
+    def test_categorize(self):
+        """
+        test if low cardinality string columns become categoricals
+        """
+        df = pd.DataFrame({'country': ['DE', 'US'] * 50,
+                           'name': [f"n{n}" for n in range(100)]})
+        res = categorize(df, ratio=0.1)
+        self.assertEqual(res['country'].dtype.name, 'category')
+        self.assertEqual(res['name'].dtype, np.dtype('object'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import time
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+from ninjasql.infer.memory import (
+    PeakMemory,
+    parse_size,
+    row_bytes,
+    fitting_rows)
+
+
+class MemoryTest(unittest.TestCase):
+
+    def test_parse_size(self):
+        """
+        test if memory sizes are converted into bytes
+        """
+        self.assertEqual(parse_size(1024), 1024)
+        self.assertEqual(parse_size('512'), 512)
+        self.assertEqual(parse_size('2KB'), 2048)
+        self.assertEqual(parse_size('1.5 mb'), 1572864)
+        self.assertEqual(parse_size('1G'), 1 << 30)
+        with self.assertRaises(ValueError):
+            parse_size('a lot')
+
+    def test_row_bytes(self):
+        """
+        test if the average parsed row size is estimated
+        """
+        frame = pd.DataFrame({'a': np.arange(100, dtype='int64')})
+        self.assertGreaterEqual(row_bytes(frame), 8)
+        self.assertLess(row_bytes(frame), 16)
+        self.assertEqual(row_bytes(frame.iloc[:0]), 0.0)
+
+    def test_fitting_rows(self):
+        """
+        test if the rows per read are bounded by the budget
+        """
+        self.assertEqual(fitting_rows(1000, 10), 50)
+        self.assertEqual(fitting_rows(1, 10), 1)
+        self.assertIsNone(fitting_rows(1000, 0))
+
+    def test_peak_memory(self):
+        """
+        test if the peak of an allocation inside the block is measured
+        """
+        with PeakMemory() as peak:
+            data = np.ones(1 << 23)
+            del data
+        self.assertGreaterEqual(peak.peak, 60 << 20)
+
+    def test_peak_memory_per_block(self):
+        """
+        test if a block reports its own peak and not the peak of an
+        earlier block of the process
+        """
+        with PeakMemory() as first:
+            data = np.ones(1 << 23)
+            del data
+        with PeakMemory() as second:
+            data = np.ones(1 << 10)
+            del data
+        self.assertGreaterEqual(first.peak, 60 << 20)
+        self.assertLess(second.peak, 16 << 20)
+
+    def test_peak_memory_sampled(self):
+        """
+        test if the peak is sampled where the peak of the process can not
+        be reset
+        """
+        with mock.patch('ninjasql.infer.memory.reset_peak_rss',
+                        return_value=False):
+            with PeakMemory() as peak:
+                data = np.ones(1 << 23)
+                time.sleep(0.1)
+                del data
+        self.assertGreaterEqual(peak.peak, 60 << 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
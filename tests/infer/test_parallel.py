@@ -0,0 +1,105 @@
+import unittest
+import os
+import tempfile
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from ninjasql.infer.parallel import (
+    split_ranges,
+    parallel_read_csv)
+from tests.helpers.file_generator import FILEPATH
+
+
+class ParallelReadTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rows = 300
+        cls.df = pd.DataFrame({
+            'id': range(rows),
+            'amount': [None if n % 97 == 0 else n for n in range(rows)],
+            'note': [f'line "{n}"\nnext, line' if n % 3 == 0 else f"n{n}"
+                     for n in range(rows)]
+        })
+        cls.path = os.path.join(FILEPATH, "parallel.csv")
+        cls.df.to_csv(cls.path, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            os.remove(cls.path)
+        except OSError:
+            pass
+
+    def _options(self) -> dict:
+        return {'filepath_or_buffer': self.path,
+                'sep': ',',
+                'header': 0,
+                'names': None}
+
+    def test_split_ranges(self):
+        """
+        test if ranges cover the whole file and never split a quoted
+        line break
+        """
+        head, ranges = split_ranges(path=self.path, parts=7, header_rows=1)
+        self.assertEqual(head, b"id,amount,note\n")
+        self.assertEqual(ranges[0][0], len(head))
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.path))
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        for begin, end in ranges:
+            self.assertEqual(content[begin:end].count(b'"') % 2, 0)
+            self.assertEqual(content[end - 1:end], b'\n')
+
+    def test_parallel_read_matches_full_read(self):
+        """
+        test if the parallel frame equals a single pandas read
+        """
+        full = pd.read_csv(**self._options())
+        frame = parallel_read_csv(workers=2,
+                                  header_rows=1,
+                                  range_bytes=1024,
+                                  **self._options())
+        assert_frame_equal(frame, full)
+
+    def test_types_differ_between_ranges(self):
+        """
+        test if a column of ints in the first ranges and texts in later
+        ranges is read as texts like a single pandas read
+        """
+        rows = 300
+        df = pd.DataFrame({
+            'id': range(rows),
+            'code': [n if n < 200 else f"X{n}" for n in range(rows)],
+            'flag': [None if n < 200 else n % 2 == 0 for n in range(rows)]
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mixed.csv")
+            df.to_csv(path, index=False)
+            options = dict(self._options(), filepath_or_buffer=path)
+            full = pd.read_csv(**options)
+            frame = parallel_read_csv(workers=2,
+                                      header_rows=1,
+                                      range_bytes=512,
+                                      **options)
+        self.assertEqual(full['code'].map(type).unique().tolist(), [str])
+        assert_frame_equal(frame, full)
+        self.assertTrue(frame.equals(full))
+
+    def test_parallel_schema_only(self):
+        """
+        test if the parallel schema equals the dtypes of a full read
+        """
+        full = pd.read_csv(**self._options())
+        frame = parallel_read_csv(workers=2,
+                                  header_rows=1,
+                                  schema_only=True,
+                                  range_bytes=1024,
+                                  **self._options())
+        self.assertEqual(len(frame), 0)
+        self.assertEqual(frame.dtypes.to_dict(), full.dtypes.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
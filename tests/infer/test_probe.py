@@ -0,0 +1,93 @@
+import unittest
+import os
+import pandas as pd
+
+from ninjasql.infer.probe import (
+    probe_csv_columns,
+    probe_json_columns,
+    schema_drift)
+from tests.helpers.file_generator import FILEPATH
+
+
+class ProbeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = pd.DataFrame({'id': range(50),
+                               'name': [f"name_{n}" for n in range(50)],
+                               'note': ['a "quoted", text'] * 50})
+        cls.files = []
+
+    @classmethod
+    def tearDownClass(cls):
+        for f in cls.files:
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+
+    def _path(self, name: str) -> str:
+        path = os.path.join(FILEPATH, name)
+        self.files.append(path)
+        return path
+
+    def test_probe_csv_columns(self):
+        """
+        test if csv columns are read from the header
+        """
+        path = self._path("probe.csv")
+        self.df.to_csv(path, index=False, sep='|')
+        cols = probe_csv_columns(filepath_or_buffer=path,
+                                 sep='|',
+                                 header=0,
+                                 names=None)
+        self.assertEqual(cols, ['id', 'name', 'note'])
+
+    def test_probe_json_columns(self):
+        """
+        test if json columns are read from the first record
+        """
+        for orient in ['records', 'index', 'split']:
+            path = self._path(f"probe_{orient}.json")
+            self.df.to_json(path, orient=orient)
+            self.assertEqual(probe_json_columns(path=path, orient=orient),
+                             ['id', 'name', 'note'])
+
+    def test_probe_json_lines(self):
+        """
+        test if json lines columns are read from the first line
+        """
+        path = self._path("probe_lines.json")
+        self.df.to_json(path, orient='records', lines=True)
+        self.assertEqual(probe_json_columns(path=path,
+                                            orient='records',
+                                            lines=True),
+                         ['id', 'name', 'note'])
+
+    def test_probe_json_unsupported(self):
+        """
+        test if an orient that can not be probed returns None
+        """
+        path = self._path("probe_columns.json")
+        self.df.to_json(path, orient='columns')
+        self.assertIsNone(probe_json_columns(path=path, orient='columns'))
+
+    def test_schema_drift(self):
+        """
+        test if added, removed and reordered columns are detected
+        """
+        self.assertFalse(schema_drift(['a', 'b'], ['a', 'b'])['drift'])
+
+        drift = schema_drift({'a': 'int64', 'b': 'object'}, ['b', 'a', 'c'])
+        self.assertTrue(drift['drift'])
+        self.assertEqual(drift['added'], ['c'])
+        self.assertEqual(drift['removed'], [])
+        self.assertTrue(drift['reordered'])
+
+        drift = schema_drift(['a', 'b'], ['a'])
+        self.assertEqual(drift['removed'], ['b'])
+        self.assertFalse(drift['reordered'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+import io
+import os
+import tempfile
+from functools import partial
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+from ninjasql.infer.sampling import (
+    head_sample,
+    reservoir_sample,
+    stratified_sample,
+    sample_confidence)
+from tests.helpers.file_generator import FileGenerator, FILEPATH
+
+
+class SamplingTest(unittest.TestCase):
+
+    rows = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.gen = FileGenerator(type="csv",
+                                name="sampling",
+                                header=True,
+                                seperator=',')
+        for n in range(cls.rows):
+            cls.gen.add_rows({'id': n,
+                              'amount': n * 0.5,
+                              'name': f"name_{n}"})
+        cls.gen.create()
+        cls.path = os.path.join(FILEPATH, "sampling.csv")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.gen.rm()
+
+    def _read(self):
+        return partial(pd.read_csv, sep=',', header=0)
+
+    def test_head_sample(self):
+        """
+        test if the first n rows are sampled and the rows are estimated
+        """
+        frame, total = head_sample(read=self._read(), path=self.path,
+                                   size=100, header_rows=1)
+        self.assertEqual(len(frame), 100)
+        self.assertEqual(list(frame['id']), list(range(100)))
+        self.assertAlmostEqual(total, self.rows, delta=self.rows * 0.2)
+
+    def test_head_sample_whole_file(self):
+        """
+        test if a sample larger than the file returns the exact row count
+        """
+        frame, total = head_sample(read=self._read(), path=self.path,
+                                   size=5000, header_rows=1)
+        self.assertEqual(len(frame), self.rows)
+        self.assertEqual(total, self.rows)
+
+    def test_reservoir_sample(self):
+        """
+        test if the reservoir sample is bounded, unique and covers the
+        whole file
+        """
+        chunks = self._read()(self.path, chunksize=64)
+        frame, total = reservoir_sample(chunks=chunks, size=100, seed=1)
+        self.assertEqual(len(frame), 100)
+        self.assertEqual(total, self.rows)
+        self.assertEqual(frame['id'].nunique(), 100)
+        self.assertGreater(frame['id'].max(), 500)
+
+    def test_stratified_sample(self):
+        """
+        test if byte offset sampling returns full rows of the whole file
+        """
+        frame, total = stratified_sample(read=self._read(), path=self.path,
+                                         size=100, header_rows=1,
+                                         strata=20, seed=1)
+        self.assertEqual(list(frame.columns), ['id', 'amount', 'name'])
+        self.assertGreater(len(frame), 50)
+        self.assertTrue((frame['name'] == "name_" +
+                         frame['id'].astype(str)).all())
+        self.assertEqual(frame['id'].dtype, np.dtype('int64'))
+        self.assertGreater(frame['id'].max(), 500)
+        self.assertAlmostEqual(total, self.rows, delta=self.rows * 0.2)
+
+    def test_stratified_quoted_newlines(self):
+        """
+        test if csv records with quoted line breaks are not split by the
+        byte offsets
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "quoted.csv")
+            with open(path, 'w') as f:
+                f.write('id,note\n')
+                for n in range(500):
+                    f.write(f'{n},"line one\nline ""two"" {n}"\n')
+            frame, total = stratified_sample(read=self._read(), path=path,
+                                             size=100, header_rows=1,
+                                             strata=20, seed=1,
+                                             quotechar=b'"')
+        self.assertGreater(len(frame), 50)
+        self.assertEqual(frame['id'].dtype, np.dtype('int64'))
+        self.assertTrue((frame['note'] == 'line one\nline "two" ' +
+                         frame['id'].astype(str)).all())
+        self.assertAlmostEqual(total, 500, delta=100)
+
+    def test_stratified_bytes_bounded(self):
+        """
+        test if aligning the byte offsets of a large csv file with quoted
+        line breaks reads only a window per offset, not the whole file
+        """
+        read_bytes = []
+
+        class CountingFile(io.FileIO):
+            def readinto(self, buffer):
+                n = super().readinto(buffer)
+                read_bytes.append(n or 0)
+                return n
+
+        def counting_open(path, mode='r'):
+            return io.BufferedReader(CountingFile(path, mode))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "large.csv")
+            with open(path, 'w') as f:
+                f.write('id,note\n')
+                for n in range(200000):
+                    f.write(f'{n},"line one\nline ""two"" {n}"\n')
+            with mock.patch('builtins.open', counting_open):
+                frame, total = stratified_sample(read=self._read(),
+                                                 path=path,
+                                                 size=100, header_rows=1,
+                                                 strata=20, seed=1,
+                                                 quotechar=b'"')
+            fsize = os.path.getsize(path)
+        self.assertLess(sum(read_bytes), fsize / 10)
+        self.assertGreater(len(frame), 50)
+        self.assertGreater(frame['id'].max(), 150000)
+        self.assertTrue((frame['note'] == 'line one\nline "two" ' +
+                         frame['id'].astype(str)).all())
+
+    def test_sample_confidence(self):
+        """
+        test if the confidence report reflects the sample size
+        """
+        frame = pd.DataFrame({'a': [1, 2, 3],
+                              'b': ['x', 'y', 'z'],
+                              'c': [np.nan] * 3})
+        report = sample_confidence(frame=frame, total_rows=300)
+        self.assertEqual(report['max_unseen_rate'], 1.0)
+        self.assertEqual(report['columns'],
+                         {'a': 0.0, 'b': 1.0, 'c': 0.0})
+
+        report = sample_confidence(frame=frame, total_rows=3)
+        self.assertEqual(report['columns'],
+                         {'a': 1.0, 'b': 1.0, 'c': 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
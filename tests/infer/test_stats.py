@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from ninjasql.infer.stats import (
+    decimal_scale,
+    column_stats,
+    merge_stats,
+    frame_stats,
+    merge_frame_stats)
+
+
+class StatsTest(unittest.TestCase):
+
+    def test_decimal_scale(self):
+        """
+        test if the decimal places of float values are found
+        """
+        self.assertEqual(decimal_scale(np.array([1.0, 2.0])), 0)
+        self.assertEqual(decimal_scale(np.array([1.25, 12345.5])), 2)
+        self.assertEqual(decimal_scale(np.array([0.1, 0.2],
+                                                dtype=np.float32)), 1)
+        self.assertIsNone(decimal_scale(np.array([np.pi])))
+
+    def test_column_stats(self):
+        """
+        test if lengths, ranges and scales are computed
+        """
+        self.assertEqual(column_stats(pd.Series(['ab', 'äöü', None]),
+                                      'string'),
+                         {'kind': 'string', 'max_bytes': 6})
+        self.assertEqual(column_stats(pd.Series([-3, 7]), 'integer'),
+                         {'kind': 'integer', 'min': -3, 'max': 7,
+                          'scale': 0})
+        self.assertEqual(column_stats(pd.Series([1.5, np.nan]), 'floating'),
+                         {'kind': 'floating', 'min': 1.5, 'max': 1.5,
+                          'scale': 1})
+        self.assertEqual(column_stats(pd.Series([np.nan]), 'floating'), {})
+
+    def test_merge_stats(self):
+        """
+        test if chunk statistics are merged like widened dtypes
+        """
+        ints = {'kind': 'integer', 'min': -3, 'max': 7, 'scale': 0}
+        floats = {'kind': 'floating', 'min': 0.5, 'max': 10.25, 'scale': 2}
+        self.assertEqual(merge_stats(ints, floats),
+                         {'kind': 'floating', 'min': -3, 'max': 10.25,
+                          'scale': 2})
+        self.assertEqual(merge_stats({}, ints), ints)
+        self.assertEqual(merge_stats({'kind': 'string', 'max_bytes': 3},
+                                     {'kind': 'string', 'max_bytes': 5}),
+                         {'kind': 'string', 'max_bytes': 5})
+        self.assertEqual(merge_stats({'kind': 'string', 'max_bytes': 3},
+                                     ints),
+                         {'kind': 'string'})
+
+    def test_chunked_stats_match_full_frame(self):
+        """
+        test if merged chunk statistics equal those of the whole frame
+        """
+        frame = pd.DataFrame({'a': range(100),
+                              'b': [f"name_{n}" for n in range(100)],
+                              'c': [n / 4 for n in range(100)]})
+        merged = {}
+        for start in range(0, 100, 30):
+            merged = merge_frame_stats(
+                merged, frame_stats(frame.iloc[start:start + 30]))
+        self.assertEqual(merged, frame_stats(frame))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from ninjasql.infer.widening import (
+    UNKNOWN,
+    frame_dtypes,
+    widen,
+    merge_dtypes,
+    infer_from_chunks,
+    iter_infer_chunks,
+    empty_frame)
+
+
+class WideningTest(unittest.TestCase):
+
+    def test_widen_rules(self):
+        """
+        test if dtypes are widened like pandas does on a full read
+        """
+        i, f = np.dtype('int64'), np.dtype('float64')
+        b, o = np.dtype('bool'), np.dtype('object')
+        cases = [
+            (i, i, i),
+            (i, f, f),
+            (f, o, o),
+            (b, i, o),
+            (b, b, b),
+            (UNKNOWN, i, f),
+            (UNKNOWN, b, o),
+            (UNKNOWN, o, o),
+            (UNKNOWN, UNKNOWN, UNKNOWN),
+        ]
+        for left, right, exp in cases:
+            self.assertEqual(widen(left, right), exp)
+            self.assertEqual(widen(right, left), exp)
+
+    def test_frame_dtypes_unknown(self):
+        """
+        test if columns without any value are UNKNOWN
+        """
+        df = pd.DataFrame({'a': [1, 2], 'b': [np.nan, np.nan]})
+        dtypes = frame_dtypes(df)
+        self.assertEqual(dtypes['a'], np.dtype('int64'))
+        self.assertIs(dtypes['b'], UNKNOWN)
+
+    def test_merge_missing_columns(self):
+        """
+        test if a column missing in one dict is handled as UNKNOWN
+        """
+        merged = merge_dtypes({'a': np.dtype('int64')},
+                              {'b': np.dtype('object')})
+        self.assertEqual(list(merged.keys()), ['a', 'b'])
+        self.assertEqual(merged['a'], np.dtype('float64'))
+        self.assertEqual(merged['b'], np.dtype('object'))
+
+    def test_chunks_match_full_read(self):
+        """
+        test if the dtypes of all chunks match the dtypes of the full frame
+        """
+        full = pd.DataFrame({
+            'a': [1, 2, 3, None],
+            'b': [True, False, None, None],
+            'c': [None, None, 1.5, 2.5],
+            'd': [np.nan, np.nan, np.nan, np.nan],
+            'e': ['x', 'y', 1, 2],
+        })
+        full = full.infer_objects()
+        chunks = [full.iloc[:2].infer_objects(), full.iloc[2:].infer_objects()]
+        self.assertEqual(infer_from_chunks(chunks), full.dtypes.to_dict())
+
+    def test_int_chunks_stay_int(self):
+        """
+        test if integer columns without NaN keep their dtype over chunks
+        """
+        chunks = [pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': [3]})]
+        self.assertEqual(infer_from_chunks(chunks), {'a': np.dtype('int64')})
+
+    def test_iter_infer_chunks(self):
+        """
+        test if the schema is yielded after every chunk and merges keys
+        """
+        chunks = [pd.DataFrame({'a': [1]}), pd.DataFrame({'b': ['x']})]
+        schemas = list(iter_infer_chunks(chunks))
+        self.assertEqual(schemas[0], {'a': np.dtype('int64')})
+        self.assertEqual(schemas[1], {'a': np.dtype('float64'),
+                                      'b': np.dtype('object')})
+
+    def test_empty_frame(self):
+        """
+        test if an empty frame carries the given dtypes
+        """
+        dtypes = {'a': np.dtype('int64'), 'b': np.dtype('object')}
+        df = empty_frame(dtypes)
+        self.assertEqual(len(df), 0)
+        self.assertEqual(df.dtypes.to_dict(), dtypes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,34 @@
 import unittest
 import os
+import json
+import gzip
+import tempfile
+import pandas as pd
 from faker import Faker
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.sql.schema import Table
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.types import VARCHAR
 
 from ninjasql.app import FileInspector
-from ninjasql.errors import NoColumnsError, NoTableNameGivenError
+from ninjasql.db.dialects import load_dialect
+from ninjasql.errors import (
+    NoColumnsError,
+    NoTableNameGivenError,
+    SchemaDriftError,
+    MemoryBudgetError)
 from tests.helpers.file_generator import FileGenerator, FILEPATH
 from tests.helpers.ini_generator import IniGenerator
+from tests.db.db_helper import get_engine
 from tests import config
 from tests import db
 
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 DBPATH = os.path.dirname(db.__file__)
 CONFIGPATH = os.path.dirname(config.__file__)
 
@@ -199,6 +215,9 @@ class FileInspectorCsvTest(unittest.TestCase):
         ]
 
         self.assertEqual(sorted(exp_col), sorted(c.show_columns()))
+        self.assertIsInstance(c.show_columns(), list)
+        c.get_dtypes()
+        self.assertIsInstance(c.show_columns(), list)
 
     def test_get_dtypes(self):
         """
@@ -702,6 +721,91 @@ class FileInspectorCsvTest(unittest.TestCase):
                     fpath = os.path.join(full_path, dir, f)
                     self._rm(fpath)
 
+    def test_blueprint_for_dialect(self):
+        """
+        test if a complete blueprint is generated for a dialect name
+        without a database connection
+        """
+        spec = {
+            'name': "TABLE13",
+            'log_pks': ['Nam']
+        }
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=os.path.join(
+                FILEPATH,
+                (f"{FileInspectorCsvTest.testfile['name']}."
+                 f"{FileInspectorCsvTest.testfile['type']}")),
+            seperator="|",
+            type="csv",
+            dialect="postgresql"
+        )
+
+        c.create_file_elt_blueprint(
+            path=FILEPATH,
+            table_name=spec['name'],
+            logical_pk=spec['log_pks'],
+            load_strategy='database_table'
+        )
+
+        ddl_dir = os.path.join(FILEPATH, spec['name'], 'DDL')
+        dml_dir = os.path.join(FILEPATH, spec['name'], 'DML')
+        history = [f for f in os.listdir(ddl_dir)
+                   if f.startswith('PERS_STAGING')][0]
+        with open(os.path.join(ddl_dir, history)) as f:
+            self.assertIn("TIMESTAMP WITHOUT TIME ZONE", f.read())
+        self.assertEqual(len(os.listdir(dml_dir)), 4)
+        for mod in [spec['name'], 'TABLELOAD']:
+            for dir in ['DDL', 'DML']:
+                full_path = os.path.join(FILEPATH, mod, dir)
+                for f in os.listdir(full_path):
+                    self._rm(os.path.join(full_path, f))
+
+    def test_multi_dialect_blueprint(self):
+        """
+        test if the blueprint of every dialect is saved in its own
+        folder from a single inference
+        """
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=os.path.join(
+                FILEPATH,
+                (f"{FileInspectorCsvTest.testfile['name']}."
+                 f"{FileInspectorCsvTest.testfile['type']}")),
+            seperator="|",
+            type="csv"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            saved = c.create_multi_dialect_blueprint(
+                path=tmp,
+                table_name="TABLE14",
+                logical_pk=['Nam'],
+                load_strategy='database_table',
+                dialects=['postgresql', 'mssql'],
+                workers=2
+            )
+            self.assertEqual(sorted(saved), ['mssql', 'postgresql'])
+            self.assertEqual(len(saved['mssql']), 10)
+            for folder, ddl_type in [('postgresql', 'TIMESTAMP WITHOUT'),
+                                     ('mssql', 'DATETIME')]:
+                ddl_dir = os.path.join(tmp, folder, 'TABLE14', 'DDL')
+                self.assertEqual(
+                    len(os.listdir(os.path.join(tmp, folder, 'TABLE14',
+                                                'DML'))), 4)
+                history = [f for f in os.listdir(ddl_dir)
+                           if f.startswith('PERS_STAGING')][0]
+                with open(os.path.join(ddl_dir, history)) as f:
+                    self.assertIn(ddl_type, f.read())
+                self.assertTrue(os.path.isdir(
+                    os.path.join(tmp, folder, 'TABLELOAD', 'DDL')))
+        with self.assertRaises(ValueError):
+            c.create_multi_dialect_blueprint(
+                path=FILEPATH,
+                table_name="TABLE14",
+                logical_pk=['Nam'],
+                load_strategy='database_table',
+                dialects=['mssql', 'mssql'])
+
     def test_get_sqa_table(self):
         """
         test if sqa table object can be extracted
@@ -728,6 +832,935 @@ class FileInspectorCsvTest(unittest.TestCase):
         )
         self.assertEqual(type(d), Table)
 
+    def test_chunked_read_mode(self):
+        """
+        test if the chunked read mode returns the same dtypes as a full
+        read without holding rows
+        """
+        fpath = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        full = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv"
+        )
+        chunked = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv",
+            read_mode="chunked",
+            chunksize=7
+        )
+
+        self.assertEqual(chunked.get_dtypes(), full.get_dtypes())
+        self.assertEqual(len(chunked._data), 0)
+
+    def test_sample_read_modes(self):
+        """
+        test if the sampling read modes return the columns and a
+        confidence report
+        """
+        exp_col = [
+            "Lat",
+            "Lon",
+            "Txt",
+            "Nam",
+            "Add",
+            "Job",
+        ]
+        for mode in ['head', 'reservoir', 'stratified']:
+            c = FileInspector(
+                cfg_path=get_inipath(),
+                file=os.path.join(
+                    FILEPATH,
+                    (f"{FileInspectorCsvTest.testfile['name']}."
+                     f"{FileInspectorCsvTest.testfile['type']}")),
+                seperator="|",
+                type="csv",
+                read_mode=mode,
+                chunksize=10,
+                sample_size=20
+            )
+            self.assertEqual(sorted(exp_col), sorted(c.get_dtypes().keys()))
+            report = c.get_sample_report()
+            self.assertLessEqual(report['sample_rows'], 20)
+            self.assertEqual(sorted(exp_col),
+                             sorted(report['columns'].keys()))
+
+    def test_stratified_quoted_newlines(self):
+        """
+        test if the stratified read mode samples csv records with quoted
+        line breaks
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            fpath = os.path.join(tmp, "quoted.csv")
+            with open(fpath, 'w') as f:
+                f.write('Id|Txt\n')
+                for n in range(1000):
+                    f.write(f'{n}|"first\nsecond {n}"\n')
+            c = FileInspector(
+                cfg_path=get_inipath(),
+                file=fpath,
+                seperator="|",
+                type="csv",
+                read_mode="stratified",
+                sample_size=100
+            )
+            self.assertEqual(c.get_dtypes(), {'Id': 'int64', 'Txt': 'object'})
+            self.assertGreater(c.get_sample_report()['sample_rows'], 50)
+
+    def test_parallel_read_mode(self):
+        """
+        test if the parallel read mode returns the same data as a full read
+        """
+        fpath = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        full = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv"
+        )
+        parallel = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv",
+            read_mode="parallel",
+            workers=2
+        )
+        parallel._load_df_if_empty()
+        full._load_df_if_empty()
+
+        self.assertEqual(parallel.get_dtypes(), full.get_dtypes())
+        self.assertEqual(len(parallel._data), len(full._data))
+
+    def test_check_schema_drift(self):
+        """
+        test if schema drift is detected from the header only
+        """
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=os.path.join(
+                FILEPATH,
+                (f"{FileInspectorCsvTest.testfile['name']}."
+                 f"{FileInspectorCsvTest.testfile['type']}")),
+            seperator="|",
+            type="csv"
+        )
+        cols = ["Lat", "Lon", "Txt", "Nam", "Add", "Job"]
+
+        self.assertFalse(c.check_schema_drift(expected=cols)['drift'])
+        self.assertIsNone(c._data)
+
+        drift = c.check_schema_drift(expected=cols + ["Zip"])
+        self.assertEqual(drift['removed'], ["Zip"])
+        with self.assertRaises(SchemaDriftError):
+            c.check_schema_drift(expected=cols[1:], raise_on_drift=True)
+
+    def test_compressed_file(self):
+        """
+        test if a gzip compressed csv is probed, sampled and read
+        """
+        fpath = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        gz_path = os.path.join(FILEPATH, "data1_gz")
+        with open(fpath, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+            dst.write(src.read())
+        full = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv"
+        )
+        for mode in ['full', 'parallel', 'chunked', 'stratified']:
+            c = FileInspector(
+                cfg_path=get_inipath(),
+                file=gz_path,
+                seperator="|",
+                type="csv",
+                read_mode=mode,
+                sample_size=20,
+                workers=2
+            )
+            self.assertEqual(c.probe_columns(), list(full.show_columns()))
+            self.assertEqual(c.get_dtypes().keys(),
+                             full.get_dtypes().keys())
+        rm_file(gz_path)
+
+    def test_read_hints(self):
+        """
+        test if only projected columns are parsed, categorized and
+        downcasted and the ddl only contains them
+        """
+        spec = {
+            'name': "table11",
+            'schema': "STAGING",
+            'table_prefix': "STG"
+        }
+        fpath = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        full = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv"
+        )
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv",
+            usecols=["Lat", "Nam", "Job"],
+            dtypes={"Job": "category"},
+            downcast=True,
+            con=self._get_engine()
+        )
+
+        self.assertEqual(c.show_columns(), ["Lat", "Nam", "Job"])
+        dtypes = c.get_dtypes()
+        self.assertEqual(list(dtypes.keys()), ["Lat", "Nam", "Job"])
+        self.assertEqual(dtypes["Job"].name, "category")
+        full._load_df_if_empty()
+        self.assertLess(c._data.memory_usage(deep=True).sum(),
+                        full._data.memory_usage(deep=True).sum())
+
+        c.save_staging_ddl(path=FILEPATH, table_name=spec['name'])
+        nfname = f"{spec['schema']}_{spec['table_prefix']}_{spec['name']}"
+        modelname = os.path.join(nfname.split('_')[-1], 'DDL')
+        full_path = f"{os.path.join(FILEPATH, modelname, nfname)}.sql"
+        with open(full_path) as f:
+            ddl = f.read()
+        self.assertIn("Nam", ddl)
+        self.assertNotIn("Txt", ddl)
+        self._rm(full_path)
+
+    def test_downcast_keeps_ddl(self):
+        """
+        test if downcasting only narrows the frame in memory and the DDL
+        is typed with the dtypes before the downcast
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            fpath = os.path.join(tmp, "downcast.csv")
+            pd.DataFrame({'Id': [1, 2, 3],
+                          'Amount': [0.5, 1.5, 2.5]}).to_csv(
+                fpath, sep="|", index=False)
+            ddls = []
+            for downcast in (False, True):
+                c = FileInspector(
+                    cfg_path=get_inipath(),
+                    file=fpath,
+                    seperator="|",
+                    type="csv",
+                    downcast=downcast,
+                    dialect="postgresql"
+                )
+                name = c._build_name(table="T08", table_type="staging")
+                ddls.append(c._extract_ddl(table_schema=c.get_table_schema(),
+                                           name=name,
+                                           dtype=None))
+        self.assertEqual(c.get_dtypes()['Id'].name, 'int8')
+        self.assertEqual(c.get_dtypes()['Amount'].name, 'float32')
+        self.assertEqual(ddls[1], ddls[0])
+        self.assertIn('"Id" BIGINT', ddls[1])
+        self.assertNotIn('SMALLINT', ddls[1])
+        self.assertNotIn('FLOAT(23)', ddls[1])
+
+    def test_categories_at_read_time(self):
+        """
+        test if a full csv read parses the columns with few distinct
+        values directly as categoricals
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            fpath = os.path.join(tmp, "categories.csv")
+            pd.DataFrame({'Id': range(100),
+                          'Country': ['DE', 'FR'] * 50,
+                          'Nam': [f"name_{n}" for n in range(100)]}).to_csv(
+                fpath, sep="|", index=False)
+            c = FileInspector(
+                cfg_path=get_inipath(),
+                file=fpath,
+                seperator="|",
+                type="csv",
+                category_ratio=0.1
+            )
+            c._build_header()
+            self.assertEqual(c._read_dtypes(), {'Country': 'category'})
+            dtypes = c.get_dtypes()
+        self.assertEqual(dtypes['Country'].name, 'category')
+        self.assertEqual(dtypes['Nam'].name, 'object')
+
+    def test_memory_budget(self):
+        """
+        test if a read over the memory budget switches to chunks that fit
+        the budget and the peak memory is reported
+        """
+        fpath = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        full = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv",
+            max_memory="1GB"
+        )
+        self.assertEqual(len(full.get_dtypes()), 6)
+        report = full.get_memory_report()
+        self.assertEqual(report['read_mode'], 'full')
+        self.assertGreater(report['estimated_bytes'], 0)
+        # the peak of this inspection only, a small file may not grow the
+        # resident memory at all
+        self.assertGreaterEqual(report['peak_bytes'], 0)
+        self.assertEqual(len(full._data), 100)
+
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv",
+            max_memory=report['estimated_bytes'] // 4
+        )
+        self.assertEqual(c.get_dtypes(), full.get_dtypes())
+        report = c.get_memory_report()
+        self.assertEqual(report['read_mode'], 'chunked')
+        self.assertLess(report['chunksize'], 100)
+        self.assertEqual(len(c._data), 0)
+        # the budget settings are only used for this read
+        self.assertEqual(c._read_mode, 'full')
+        self.assertEqual(c._chunksize, 100000)
+
+        s = FileInspector(
+            cfg_path=get_inipath(),
+            file=fpath,
+            seperator="|",
+            type="csv",
+            max_memory=report['estimated_bytes'] // 4,
+            budget_read_mode="reservoir"
+        )
+        s._load_df_if_empty()
+        self.assertEqual(s.get_memory_report()['read_mode'], 'reservoir')
+        self.assertLess(s.get_sample_report()['sample_rows'], 100)
+
+    def test_detect_dates(self):
+        """
+        test if date and timestamp columns are typed DATE and TIMESTAMP
+        in the staging and history ddl
+        """
+        spec = {
+            'name': "table12",
+            'schema': "STAGING",
+            'table_prefix': "STG",
+            'history_schema': "HISTORY",
+            'history_prefix': "PER_STG"
+        }
+        gen = FileGenerator(type="csv", name="dates", header=True,
+                            seperator='|')
+        faker = Faker()
+        for n in range(100):
+            gen.add_rows({'Nam': faker.name(),
+                          'Birth': faker.date(),
+                          'Login': str(faker.date_time())})
+        gen.create()
+        for read_mode in ('full', 'chunked'):
+            c = FileInspector(
+                cfg_path=get_inipath(),
+                file=gen.f_path,
+                seperator="|",
+                type="csv",
+                read_mode=read_mode,
+                chunksize=30,
+                detect_dates=True
+            )
+            dtypes = c.get_dtypes()
+            self.assertEqual(dtypes['Birth'].name, 'datetime64[ns]')
+            self.assertEqual(dtypes['Login'].name, 'datetime64[ns]')
+            self.assertEqual(dtypes['Nam'].name, 'object')
+
+            with tempfile.TemporaryDirectory() as tmp:
+                c.save_staging_ddl(path=tmp, table_name=spec['name'])
+                c.save_history_ddl(path=tmp, table_name=spec['name'],
+                                   schema=spec['history_schema'])
+                for schema, prefix in ((spec['schema'],
+                                        spec['table_prefix']),
+                                       (spec['history_schema'],
+                                        spec['history_prefix'])):
+                    nfname = f"{schema}_{prefix}_{spec['name']}"
+                    modelname = os.path.join(nfname.split('_')[-1], 'DDL')
+                    full_path = f"{os.path.join(tmp, modelname, nfname)}.sql"
+                    with open(full_path) as f:
+                        ddl = f.read()
+                    self.assertIn('"Birth" DATE', ddl)
+                    self.assertIn('"Login" TIMESTAMP', ddl)
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=gen.f_path,
+            seperator="|",
+            type="csv"
+        )
+        self.assertEqual(c.get_dtypes()['Birth'].name, 'object')
+        self.assertIsNone(c._date_formats)
+        gen.rm()
+
+    def test_schema_cache(self):
+        """
+        test if an unchanged file or a file with the same layout is not
+        parsed again
+        """
+        fpath = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        cache_path = os.path.join(DBPATH, "schema_cache.db")
+        rm_file(cache_path)
+
+        def inspector(file):
+            return FileInspector(
+                cfg_path=get_inipath(),
+                file=file,
+                seperator="|",
+                type="csv",
+                schema_cache=cache_path,
+                cache_by_layout=True
+            )
+
+        first = inspector(fpath)
+        dtypes = first.get_dtypes()
+        self.assertEqual(len(first._data), 100)
+
+        second = inspector(fpath)
+        self.assertEqual(second.get_dtypes(), dtypes)
+        self.assertEqual(len(second._data), 0)
+        self.assertEqual(second.get_table_schema().columns[0].stats,
+                         first.get_table_schema().columns[0].stats)
+        self.assertEqual(second.get_sample_report()['total_rows'], 100)
+
+        copy_gen = self._gen_file(name="data_copy")
+        copy_gen.create()
+        same_layout = inspector(copy_gen.f_path)
+        self.assertEqual(same_layout.get_dtypes(), dtypes)
+        self.assertEqual(len(same_layout._data), 0)
+        # the stats of another file are not taken
+        for column in same_layout.get_table_schema():
+            self.assertEqual(column.stats, {})
+            self.assertTrue(column.nullable)
+        narrow = FileInspector(
+            cfg_path=get_inipath(),
+            file=copy_gen.f_path,
+            seperator="|",
+            type="csv",
+            schema_cache=cache_path,
+            cache_by_layout=True,
+            narrow_types=True
+        )
+        self.assertIsNone(narrow._cache_keys()[1])
+        narrow.get_dtypes()
+        self.assertEqual(len(narrow._data), 100)
+
+        self.assertEqual(second.invalidate_schema_cache(), 1)
+        third = inspector(fpath)
+        third.get_dtypes()
+        self.assertEqual(len(third._data), 100)
+        copy_gen.rm()
+        rm_file(cache_path)
+
+    def test_narrow_types(self):
+        """
+        test if columns get the narrowest SQL type of their values for
+        full and chunked reads
+        """
+        gen = FileGenerator(type="csv", name="narrow", header=True,
+                            seperator='|')
+        for n in range(100):
+            gen.add_rows({'Id': n,
+                          'Code': f"C{n % 7}",
+                          'Price': round(n * 1.25, 2),
+                          'Big': n * 10 ** 12})
+        gen.create()
+        ddls = []
+        for read_mode, dialect in (('full', 'postgresql'),
+                                   ('chunked', 'postgresql'),
+                                   ('full', None)):
+            c = FileInspector(
+                cfg_path=get_inipath(),
+                file=gen.f_path,
+                seperator="|",
+                type="csv",
+                read_mode=read_mode,
+                chunksize=30,
+                narrow_types=True,
+                headroom=0.5,
+                dialect=dialect
+            )
+            name = c._build_name(table="T14", table_type="staging")
+            ddls.append(c._extract_ddl(table_schema=c.get_table_schema(),
+                                       name=name,
+                                       dtype=None))
+        self.assertEqual(ddls[0], ddls[1])
+        self.assertIn('"Id" SMALLINT', ddls[0])
+        self.assertIn('"Code" VARCHAR(3)', ddls[0])
+        self.assertIn('"Price" NUMERIC(7, 2)', ddls[0])
+        self.assertIn('"Big" BIGINT', ddls[0])
+        self.assertIn('"Code" VARCHAR(3)', ddls[2])
+
+        wide = FileInspector(
+            cfg_path=get_inipath(),
+            file=gen.f_path,
+            seperator="|",
+            type="csv",
+            dialect="postgresql"
+        )
+        ddl = wide._extract_ddl(table_schema=wide.get_table_schema(),
+                                name="T14",
+                                dtype=None)
+        self.assertIn('"Code" TEXT', ddl)
+
+        for options in ({'read_mode': 'head', 'sample_size': 20},
+                        {'read_mode': 'chunked', 'workers': 2}):
+            c = FileInspector(
+                cfg_path=get_inipath(),
+                file=gen.f_path,
+                seperator="|",
+                type="csv",
+                narrow_types=True,
+                dialect="postgresql",
+                **options
+            )
+            with self.assertLogs('ninjasql.app', level='WARNING') as logs:
+                schema = c.get_table_schema()
+            self.assertIn("gives no value statistics", logs.output[0])
+            ddl = c._extract_ddl(table_schema=schema, name="T14", dtype=None)
+            self.assertIn('"Code" TEXT', ddl)
+        gen.rm()
+
+    def test_file_family(self):
+        """
+        test if a glob of files is merged into one widened superset
+        schema and the contributing files are reported
+        """
+        gens = []
+        for day, rows in (('01', [{'Id': 1, 'Name': 'a'}]),
+                          ('02', [{'Id': 2.5, 'Name': 'b', 'Zip': 'x'}]),
+                          ('03', [{'Id': 3, 'Zip': 'y'}])):
+            gen = FileGenerator(type="csv", name=f"family_2026-10-{day}",
+                                header=True, seperator='|')
+            for row in rows:
+                gen.add_rows(row)
+            gen.create()
+            gens.append(gen)
+        results = []
+        for workers in (None, 2):
+            c = FileInspector(
+                cfg_path=get_inipath(),
+                file=os.path.join(FILEPATH, "family_2026-10-*.csv"),
+                seperator="|",
+                type="csv",
+                workers=workers,
+                dialect="postgresql"
+            )
+            results.append((c.get_dtypes(), c.get_file_report()))
+        self.assertEqual(results[0], results[1])
+        dtypes, report = results[0]
+        self.assertEqual(list(dtypes), ['Id', 'Name', 'Zip'])
+        self.assertEqual(dtypes['Id'], 'float64')
+        self.assertEqual(report['columns']['Zip'],
+                         [gens[1].f_path, gens[2].f_path])
+        self.assertEqual(report['files'][gens[0].f_path], ['Id', 'Name'])
+        name = c._build_name(table="T16", table_type="staging")
+        ddl = c._extract_ddl(table_schema=c.get_table_schema(),
+                             name=name,
+                             dtype=None)
+        self.assertIn('"Zip" TEXT', ddl)
+
+        family = FileInspector(
+            cfg_path=get_inipath(),
+            file=os.path.join(FILEPATH, "family_2026-10-*.csv"),
+            seperator="|",
+            type="csv"
+        )
+        self.assertEqual(family.probe_columns(), ['Id', 'Name', 'Zip'])
+        self.assertEqual(family.show_columns(), ['Id', 'Name', 'Zip'])
+        self.assertFalse(family.check_schema_drift(['Id', 'Name', 'Zip'])
+                         ['drift'])
+        self.assertIsNone(family._data)
+
+        budget = FileInspector(
+            cfg_path=get_inipath(),
+            file=os.path.join(FILEPATH, "family_2026-10-*.csv"),
+            seperator="|",
+            type="csv",
+            max_memory="1GB"
+        )
+        report = budget.get_memory_report()
+        self.assertEqual(sorted(report['files']),
+                         [gen.f_path for gen in gens])
+        self.assertEqual(report['files'][gens[0].f_path]['read_mode'], 'full')
+        self.assertEqual(report['peak_bytes'],
+                         max(r['peak_bytes']
+                             for r in report['files'].values()))
+        for gen in gens:
+            gen.rm()
+
+    def test_schema_evolution(self):
+        """
+        test if existing tables are evolved with ALTER TABLE statements
+        and the migration is saved with regenerated DMLs
+        """
+        engine = create_engine("sqlite://")
+
+        @event.listens_for(engine, "connect")
+        def attach_schemas(dbapi_con, record):
+            for schema in ("STAGING", "PERS_STAGING"):
+                dbapi_con.execute(f"ATTACH DATABASE ':memory:' AS {schema}")
+
+        old = FileGenerator(type="csv", name="evolve_old", header=True,
+                            seperator='|')
+        old.add_rows({'Id': 1, 'Name': 'a'})
+        old.create()
+        new = FileGenerator(type="csv", name="evolve_new", header=True,
+                            seperator='|')
+        new.add_rows({'Id': 2, 'Name': 'b', 'Zip': 'x'})
+        new.create()
+        before = FileInspector(cfg_path=get_inipath(), file=old.f_path,
+                               seperator="|", type="csv", con=engine)
+        after = FileInspector(cfg_path=get_inipath(), file=new.f_path,
+                              seperator="|", type="csv", con=engine)
+        before.create_db_table(table_name="T17", type="staging")
+        self.assertEqual(after.get_schema_diff(table_name="T17",
+                                               type="staging"),
+                         ['ALTER TABLE "T17" ADD COLUMN "Zip" TEXT'])
+        after.create_db_table(table_name="T17", type="staging",
+                              if_exists="alter")
+        columns = [c['name'] for c in inspect(engine).get_columns("T17")]
+        self.assertEqual(columns, ['Id', 'Name', 'Zip'])
+        self.assertEqual(after.get_schema_diff(table_name="T17",
+                                               type="staging"), [])
+
+        for table_type in ('staging', 'history'):
+            schema, _, name = before._build_name(
+                table="T17", table_type=table_type).partition('.')
+            before.create_db_table(table_name=name,
+                                   schema=schema,
+                                   type=table_type)
+        with tempfile.TemporaryDirectory() as tmp:
+            migrations = after.create_file_elt_migration(
+                path=tmp,
+                table_name="T17",
+                logical_pk=['Id'],
+                load_strategy='jinja')
+            self.assertEqual(migrations, {
+                'STAGING.STG_T17':
+                    ['ALTER TABLE "STAGING"."STG_T17" ADD COLUMN "Zip" TEXT'],
+                'PERS_STAGING.PER_STG_T17':
+                    ['ALTER TABLE "PERS_STAGING"."PER_STG_T17" '
+                     'ADD COLUMN "Zip" TEXT']})
+            ddl = sorted(os.listdir(os.path.join(tmp, 'T17', 'DDL')))
+            self.assertTrue(all(f.startswith('ALTER_') for f in ddl))
+            self.assertEqual(len(ddl), 2)
+            dml_dir = os.path.join(tmp, 'T17', 'DML')
+            self.assertEqual(len(os.listdir(dml_dir)), 4)
+            insert = [f for f in os.listdir(dml_dir)
+                      if f.startswith('scd2_1')][0]
+            self.assertEqual(insert, 'scd2_1_PERS_STAGING_PER_STG_T17.sql')
+            with open(os.path.join(dml_dir, insert)) as dml:
+                content = dml.read()
+            self.assertIn('Zip', content)
+            # the ALTER and the DML address the same tables
+            self.assertIn('INSERT INTO "PERS_STAGING"."PER_STG_T17"',
+                          content)
+            self.assertIn('FROM "STAGING"."STG_T17"', content)
+            self.assertNotIn('"PERS_STAGING.PER_STG_T17"', content)
+        old.rm()
+        new.rm()
+
+    def test_table_indexes(self):
+        """
+        test if the blueprint saves the index ddl and create_db_table
+        creates the indexes of the scd2 DMLs
+        """
+        engine = create_engine("sqlite://")
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=os.path.join(
+                FILEPATH,
+                (f"{FileInspectorCsvTest.testfile['name']}."
+                 f"{FileInspectorCsvTest.testfile['type']}")),
+            seperator="|",
+            type="csv",
+            con=engine
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            c.save_index_ddl(path=tmp, table_name="T18", logical_pk=['Nam'])
+            ddl_dir = os.path.join(tmp, 'T18', 'DDL')
+            with open(os.path.join(
+                    ddl_dir, "INDEX_PERS_STAGING_PER_STG_T18.sql")) as f:
+                self.assertEqual(f.read(),
+                                 'CREATE INDEX "ix_PERS_STAGING_PER_STG_T18_'
+                                 'pk_valid_to" ON "PERS_STAGING.PER_STG_T18" '
+                                 '("Nam", "VALID_TO_DATE")')
+            self.assertEqual(len(os.listdir(ddl_dir)), 2)
+
+        c.create_db_table(table_name="T18", type="history",
+                          index_pk=['Nam'])
+        indexes = inspect(engine).get_indexes("T18")
+        self.assertEqual([i['column_names'] for i in indexes],
+                         [['Nam', 'VALID_TO_DATE']])
+        c.create_db_table(table_name="T18_STG", type="staging")
+        c.create_db_table(table_name="T18_STG", type="staging",
+                          if_exists="alter", index_pk=['Nam'])
+        indexes = inspect(engine).get_indexes("T18_STG")
+        self.assertEqual([i['column_names'] for i in indexes], [['Nam']])
+        c.create_db_table(table_name="T18_APP", type="staging")
+        c.create_db_table(table_name="T18_APP", type="staging",
+                          if_exists="append", index_pk=['Nam'])
+        c.create_db_table(table_name="T18_APP", type="staging",
+                          if_exists="append", index_pk=['Nam'])
+        indexes = inspect(engine).get_indexes("T18_APP")
+        self.assertEqual([i['column_names'] for i in indexes], [['Nam']])
+
+    def test_physical_design(self):
+        """
+        test if the blueprint ddl gets the physical design of the dialect
+        """
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=os.path.join(
+                FILEPATH,
+                (f"{FileInspectorCsvTest.testfile['name']}."
+                 f"{FileInspectorCsvTest.testfile['type']}")),
+            seperator="|",
+            type="csv",
+            dialect="postgresql",
+            physical_design=True
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            c.create_file_elt_blueprint(path=tmp,
+                                        table_name="T19",
+                                        logical_pk=['Nam'],
+                                        load_strategy='jinja')
+            ddl_dir = os.path.join(tmp, 'T19', 'DDL')
+            with open(os.path.join(ddl_dir,
+                                   "PERS_STAGING_PER_STG_T19.sql")) as f:
+                history = f.read()
+            with open(os.path.join(ddl_dir, "STAGING_STG_T19.sql")) as f:
+                staging = f.read()
+        self.assertIn(')\n PARTITION BY LIST ("VALID_TO_DATE")', history)
+        self.assertIn('PARTITION OF "PERS_STAGING.PER_STG_T19" DEFAULT;',
+                      history)
+        self.assertNotIn('PARTITION', staging)
+
+    def test_current_snapshot(self):
+        """
+        test if the blueprint creates a current snapshot table or view
+        with the DMLs that maintain it after the scd2 steps
+        """
+        file = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        for dialect, snapshot, ddl_start, steps in (
+                ("postgresql", "view", "CREATE MATERIALIZED VIEW", 5),
+                ("mssql", "view", "\nCREATE TABLE", 7),
+                ("mssql", "table", "\nCREATE TABLE", 7)):
+            c = FileInspector(cfg_path=get_inipath(), file=file,
+                              seperator="|", type="csv", dialect=dialect)
+            with tempfile.TemporaryDirectory() as tmp:
+                c.create_file_elt_blueprint(path=tmp,
+                                            table_name="T20",
+                                            logical_pk=['Nam'],
+                                            load_strategy='jinja',
+                                            current_snapshot=snapshot)
+                ddl_dir = os.path.join(tmp, 'T20', 'DDL')
+                with open(os.path.join(
+                        ddl_dir, "PERS_STAGING_CUR_PER_STG_T20.sql")) as f:
+                    self.assertTrue(f.read().startswith(ddl_start))
+                dml = sorted(os.listdir(os.path.join(tmp, 'T20', 'DML')))
+                self.assertEqual(len(dml), steps)
+        self.assertIn("scd2_6_PERS_STAGING_PER_STG_T20.sql", dml)
+        self.assertIn("INITIAL_CURRENT_PERS_STAGING_PER_STG_T20.sql", dml)
+        with self.assertRaises(ValueError):
+            c.create_file_elt_blueprint(path=FILEPATH,
+                                        table_name="T20",
+                                        logical_pk=['Nam'],
+                                        load_strategy='jinja',
+                                        current_snapshot='XXYUI')
+
+    def test_hash_diff(self):
+        """
+        test if the hash diff blueprint adds the row hash to the staging
+        and history table and hashes the staging records first
+        """
+        file = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        c = FileInspector(cfg_path=get_inipath(), file=file, seperator="|",
+                          type="csv", dialect="postgresql", hash_diff=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            c.create_file_elt_blueprint(path=tmp,
+                                        table_name="T21",
+                                        logical_pk=['Nam'],
+                                        load_strategy='jinja')
+            for name in ("STAGING_STG_T21.sql",
+                         "PERS_STAGING_PER_STG_T21.sql"):
+                with open(os.path.join(tmp, 'T21', 'DDL', name)) as f:
+                    self.assertIn('"ROW_HASH" CHAR(64)', f.read())
+            dml_dir = os.path.join(tmp, 'T21', 'DML')
+            self.assertEqual(len(os.listdir(dml_dir)), 5)
+            with open(os.path.join(
+                    dml_dir, "scd2_0_PERS_STAGING_PER_STG_T21.sql")) as f:
+                self.assertIn("sha256", f.read())
+            with open(os.path.join(
+                    dml_dir, "scd2_2_PERS_STAGING_PER_STG_T21.sql")) as f:
+                self.assertIn('WHERE "STAGING.STG_T21"."ROW_HASH" != '
+                              '"PERS_STAGING.PER_STG_T21"."ROW_HASH"',
+                              f.read())
+        with tempfile.TemporaryDirectory() as tmp:
+            saved = c.create_multi_dialect_blueprint(
+                path=tmp,
+                table_name="T21",
+                logical_pk=['Nam'],
+                load_strategy='jinja',
+                dialects=['postgresql', 'sqlite'])
+            self.assertIn('scd2_0_PERS_STAGING.PER_STG_T21',
+                          saved['postgresql'])
+            # sqlite has no hash function and compares every column
+            self.assertNotIn('scd2_0_PERS_STAGING.PER_STG_T21',
+                             saved['sqlite'])
+            ddl_dir = os.path.join(tmp, 'sqlite', 'T21', 'DDL')
+            with open(os.path.join(ddl_dir,
+                                   "PERS_STAGING_PER_STG_T21.sql")) as f:
+                self.assertNotIn('ROW_HASH', f.read())
+
+    def test_merge_mode(self):
+        """
+        test if the merge load mode creates the fewest scd2 DMLs of the
+        dialect
+        """
+        file = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        postgresql = load_dialect("postgresql")
+        postgresql.server_version_info = (15, 2)
+        for dialect, dml in (("mssql", ["scd2_1"]),
+                             (postgresql, ["scd2_1", "scd2_2"]),
+                             ("postgresql", ["scd2_1", "scd2_2", "scd2_3"]),
+                             ("mysql", ["scd2_1", "scd2_2", "scd2_3"])):
+            c = FileInspector(cfg_path=get_inipath(), file=file,
+                              seperator="|", type="csv", dialect=dialect,
+                              load_mode="merge")
+            with tempfile.TemporaryDirectory() as tmp:
+                c.create_file_elt_blueprint(path=tmp,
+                                            table_name="T22",
+                                            logical_pk=['Nam'],
+                                            load_strategy='jinja')
+                files = sorted(os.listdir(os.path.join(tmp, 'T22', 'DML')))
+                self.assertEqual([f[:6] for f in files], dml)
+                with open(os.path.join(tmp, 'T22', 'DML', files[0])) as f:
+                    self.assertEqual(f.read().startswith("MERGE INTO"),
+                                     len(dml) < 3)
+        with self.assertRaises(ValueError):
+            FileInspector(cfg_path=get_inipath(), type="csv",
+                          load_mode="XXYUI")
+
+    def test_join_updates(self):
+        """
+        test if the blueprint updates join the staging table
+        """
+        file = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        c = FileInspector(cfg_path=get_inipath(), file=file, seperator="|",
+                          type="csv", dialect="mysql", join_updates=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            c.create_file_elt_blueprint(path=tmp,
+                                        table_name="T23",
+                                        logical_pk=['Nam'],
+                                        load_strategy='jinja')
+            dml_dir = os.path.join(tmp, 'T23', 'DML')
+            with open(os.path.join(
+                    dml_dir, "scd2_3_PERS_STAGING_PER_STG_T23.sql")) as f:
+                self.assertTrue(f.read().startswith(
+                    "UPDATE `PERS_STAGING.PER_STG_T23`, `STAGING.STG_T23`"))
+            with open(os.path.join(
+                    dml_dir, "scd2_4_PERS_STAGING_PER_STG_T23.sql")) as f:
+                self.assertIn("LEFT OUTER JOIN `STAGING.STG_T23`", f.read())
+
+    def test_tableload_row(self):
+        """
+        test if the blueprint DMLs read the table load dates once
+        """
+        file = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        c = FileInspector(cfg_path=get_inipath(), file=file, seperator="|",
+                          type="csv", dialect="postgresql",
+                          tableload_row=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            c.create_file_elt_blueprint(path=tmp,
+                                        table_name="T24",
+                                        logical_pk=['Nam'],
+                                        load_strategy='database_table')
+            dml_dir = os.path.join(tmp, 'T24', 'DML')
+            for name in os.listdir(dml_dir):
+                if not name.startswith("scd2_"):
+                    continue
+                with open(os.path.join(dml_dir, name)) as f:
+                    self.assertEqual(f.read().count("FROM tableloads"), 1)
+
+    def test_bind_statements(self):
+        """
+        test if the load DMLs are returned with bind parameters in load
+        order
+        """
+        file = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorCsvTest.testfile['name']}."
+             f"{FileInspectorCsvTest.testfile['type']}"))
+        c = FileInspector(cfg_path=get_inipath(), file=file, seperator="|",
+                          type="csv", dialect="postgresql")
+        statements = c.get_bind_statements(table_name="T25",
+                                           logical_pk=['Nam'])
+        self.assertEqual(list(statements),
+                         [f"scd2_{n}_PERS_STAGING.PER_STG_T25"
+                          for n in range(1, 5)])
+        sql, names = statements["scd2_1_PERS_STAGING.PER_STG_T25"]
+        self.assertEqual(names, ['batch_date', 'validfrom_date',
+                                 'validto_date'])
+        self.assertIn("%(batch_date)s", sql)
+        self.assertNotIn("{{", sql)
+
+    def test_invalid_read_mode(self):
+        """
+        test if an unknown read mode raises an error
+        """
+        with self.assertRaises(ValueError):
+            FileInspector(
+                cfg_path=get_inipath(),
+                type="csv",
+                read_mode="XXYUI"
+            )
+        with self.assertRaises(ValueError):
+            FileInspector(
+                cfg_path=get_inipath(),
+                type="csv",
+                budget_read_mode="full"
+            )
+
 
 class FileInspectorJsonTest(unittest.TestCase):
 
@@ -815,6 +1848,214 @@ class FileInspectorJsonTest(unittest.TestCase):
 
         self.assertEqual(sorted(exp_col), sorted(dtype_key_list))
 
+    def test_memory_budget(self):
+        """
+        test if a json document larger than the memory budget raises
+        """
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=os.path.join(
+                FILEPATH,
+                (f"{FileInspectorJsonTest.testfile['name']}."
+                 f"{FileInspectorJsonTest.testfile['type']}")),
+            type="json",
+            orient="split",
+            max_memory=1024
+        )
+        with self.assertRaises(MemoryBudgetError):
+            c.get_dtypes()
+
+
+class FileInspectorJsonLinesTest(unittest.TestCase):
+
+    testfile = {
+            'name': "data4",
+            'type': "json"
+        }
+
+    @classmethod
+    def setUpClass(cls):
+        faker = Faker()
+        rows = []
+        for n in range(100):
+            row = {'Nam': faker.name(),
+                   'Job': faker.job(),
+                   'Age': n}
+            if n >= 60:
+                row['Score'] = n * 0.5
+            if n % 10 == 0:
+                del row['Age']
+            rows.append(row)
+        cls.path = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorJsonLinesTest.testfile['name']}."
+             f"{FileInspectorJsonLinesTest.testfile['type']}"))
+        with open(cls.path, "w") as f:
+            f.write("\n".join(json.dumps(row) for row in rows))
+        create_ini_file()
+
+    @classmethod
+    def tearDownClass(cls):
+        rm_file(cls.path)
+        rm_file(get_inipath())
+
+    def _inspector(self, **kwargs):
+        return FileInspector(
+            cfg_path=get_inipath(),
+            file=self.path,
+            type="json",
+            lines=True,
+            **kwargs
+        )
+
+    def test_chunked_matches_full_read(self):
+        """
+        test if chunked json lines give the same dtypes as a full read
+        """
+        full = self._inspector()
+        chunked = self._inspector(read_mode="chunked", chunksize=25)
+
+        self.assertEqual(chunked.get_dtypes(), full.get_dtypes())
+        self.assertEqual(len(chunked._data), 0)
+
+    def test_chunked_json_document(self):
+        """
+        test if a chunked read of a json document raises an error instead
+        of reading it at once
+        """
+        with self.assertRaises(ValueError):
+            FileInspector(cfg_path=get_inipath(), file=self.path,
+                          type="json", read_mode="chunked")
+
+    def test_usecols(self):
+        """
+        test if json lines are projected on usecols chunk by chunk
+        """
+        full = self._inspector()
+        c = self._inspector(usecols=['Job'], chunksize=25)
+
+        self.assertEqual(c.show_columns(), ['Job'])
+        self.assertEqual(c.get_dtypes(), {'Job': full.get_dtypes()['Job']})
+        self.assertEqual(len(c._data), len(full._data))
+
+    def test_iter_dtypes(self):
+        """
+        test if the schema grows incrementally with every chunk
+        """
+        c = self._inspector(chunksize=25)
+        schemas = list(c.iter_dtypes())
+
+        self.assertEqual(len(schemas), 4)
+        self.assertEqual(list(schemas[0].keys()), ['Nam', 'Job', 'Age'])
+        self.assertEqual(list(schemas[-1].keys()),
+                         ['Nam', 'Job', 'Age', 'Score'])
+
+    def test_iter_staging_ddl(self):
+        """
+        test if a first ddl is available after the first chunk
+        """
+        c = self._inspector(chunksize=25)
+        first = next(c.iter_staging_ddl(table_name="TABLE10"))
+
+        self.assertIn("CREATE TABLE", first)
+        self.assertNotIn("Score", first)
+
+    def test_probe_and_sample(self):
+        """
+        test if json lines can be probed and sampled
+        """
+        c = self._inspector(read_mode="stratified", sample_size=20)
+
+        self.assertEqual(c.probe_columns(), ['Nam', 'Job'])
+        self.assertIn('Nam', c.get_dtypes())
+        self.assertLessEqual(c.get_sample_report()['sample_rows'], 20)
+
+
+@unittest.skipIf(not HAS_PYARROW, "pyarrow is not installed")
+class FileInspectorParquetTest(unittest.TestCase):
+
+    testfile = {
+            'name': "data3",
+            'type': "parquet"
+        }
+
+    @classmethod
+    def setUpClass(cls):
+        faker = Faker()
+        rows = []
+        for n in range(100):
+            rows.append(
+                {'Nam': faker.name(),
+                 'Job': faker.job(),
+                 'Age': faker.pyint(),
+                 'CreatedAt': faker.date_time()})
+        cls.path = os.path.join(
+            FILEPATH,
+            (f"{FileInspectorParquetTest.testfile['name']}."
+             f"{FileInspectorParquetTest.testfile['type']}"))
+        cls.df = pd.DataFrame(rows)
+        cls.df.to_parquet(cls.path, index=False)
+        create_ini_file()
+
+    @classmethod
+    def tearDownClass(cls):
+        rm_file(cls.path)
+        rm_file(get_inipath())
+
+    def test_get_dtypes_from_metadata(self):
+        """
+        test if dtypes are taken from the parquet footer without rows
+        """
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=self.path,
+            type="parquet"
+        )
+
+        self.assertEqual(c.probe_columns(), list(self.df.columns))
+        self.assertEqual(c.get_dtypes(), self.df.dtypes.to_dict())
+        self.assertEqual(len(c._data), 0)
+        self.assertEqual(c.get_sample_report()['total_rows'], 100)
+
+    def test_read_rows(self):
+        """
+        test if rows are read with column projection
+        """
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=self.path,
+            type="parquet"
+        )
+        frame = c.read_rows(columns=['Nam'], nrows=5)
+
+        self.assertEqual(list(frame.columns), ['Nam'])
+        self.assertEqual(len(frame), 5)
+
+    def test_elt_tracking(self):
+        """
+        test if a complete blueprint can be build from the metadata
+        """
+        c = FileInspector(
+            cfg_path=get_inipath(),
+            file=self.path,
+            type="parquet",
+            con=get_engine()
+        )
+        c.create_file_elt_blueprint(
+            path=FILEPATH,
+            table_name="TABLE9",
+            logical_pk=['Nam'],
+            load_strategy='jinja'
+        )
+        full_path = os.path.join(FILEPATH, "TABLE9")
+        for dir in ['DDL', 'DML']:
+            files = os.listdir(os.path.join(full_path, dir))
+            self.assertNotEqual(len(files), 0)
+            for f in files:
+                os.remove(os.path.join(full_path, dir, f))
+            os.rmdir(os.path.join(full_path, dir))
+        os.rmdir(full_path)
+
 
 if __name__ == "__main__":
     unittest.main()